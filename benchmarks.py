@@ -0,0 +1,242 @@
+"""Benchmark suite for the geometry and restaurant hot paths
+
+    python benchmarks.py                              # every benchmark at the default scales
+    python benchmarks.py -k "triangle.*" -s 1000      # a subset at one scale
+    python benchmarks.py -o new.json --compare old.json
+"""
+import argparse
+import contextlib
+import fnmatch
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+from time import perf_counter
+
+from exercise_2 import Point, Line, Rectangle, Triangle
+import restaurant_revisted as restaurant
+
+BENCHMARKS = {}
+DEFAULT_SCALES = (1_000, 10_000, 100_000)
+
+
+def benchmark(name: str):
+    """Register a setup function: setup(scale) returns the callable that gets timed"""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def _random_rectangles(count: int) -> list:
+    rng = random.Random(count)
+    rectangles = []
+    for _ in range(count):
+        x_coord, y_coord = rng.uniform(-100, 100), rng.uniform(-100, 100)
+        width, height = rng.uniform(1, 10), rng.uniform(1, 10)
+        rectangle = Rectangle()
+        rectangle.set_vertices([Point(x_coord, y_coord + height), Point(x_coord + width, y_coord + height),
+                                Point(x_coord + width, y_coord), Point(x_coord, y_coord)])
+        rectangles.append(rectangle)
+    return rectangles
+
+
+def _random_triangles(count: int) -> list:
+    rng = random.Random(count)
+    triangles = []
+    for _ in range(count):
+        triangle = Triangle()
+        triangle.set_vertices([Point(rng.uniform(-100, 100), rng.uniform(-100, 100)) for _ in range(3)])
+        triangles.append(triangle)
+    return triangles
+
+
+def _random_order(line_count: int):
+    rng = random.Random(line_count)
+    items = list(restaurant.menu)
+    order = restaurant.Order()
+    for _ in range(line_count):
+        order.add(rng.choice(items), rng.randint(1, 4))
+    return order
+
+
+@benchmark("line.construction")
+def _line_construction(scale: int):
+    rng = random.Random(scale)
+    points = [Point(rng.uniform(-100, 100), rng.uniform(-100, 100)) for _ in range(scale + 1)]
+
+    def run():
+        for index in range(scale):
+            Line(points[index], points[index + 1])
+    return run
+
+
+@benchmark("line.discretize")
+def _line_discretize(scale: int):
+    line = Line(Point(0, 0), Point(3, 4))
+    return lambda: line.discretize_line(scale)
+
+
+def _metric_setup(make_shapes, method: str, cached: bool):
+    """Setup timing one compute_* method alone, from a cold cache unless cached"""
+    def setup(scale: int):
+        shapes = make_shapes(scale)
+        compute = getattr(type(shapes[0]), method)
+
+        def run():
+            for shape in shapes:
+                if not cached:
+                    shape.invalidate_cache()
+                compute(shape)
+        return run
+    return setup
+
+
+# One benchmark per metric method so a regression points at the method that caused it
+for _shape_name, _make_shapes in (("rectangle", _random_rectangles), ("triangle", _random_triangles)):
+    for _method in ("compute_area", "compute_perimeter", "compute_inner_angles"):
+        benchmark(f"{_shape_name}.{_method}")(_metric_setup(_make_shapes, _method, cached=False))
+        benchmark(f"{_shape_name}.{_method}_cached")(_metric_setup(_make_shapes, _method, cached=True))
+
+
+@benchmark("order.total")
+def _order_total(scale: int):
+    order = _random_order(scale)
+    return order.total
+
+
+@benchmark("order.apply_discount")
+def _order_apply_discount(scale: int):
+    order = _random_order(scale)
+    return order.apply_discount
+
+
+@benchmark("order.build")
+def _order_build(scale: int):
+    rng = random.Random(scale)
+    items = list(restaurant.menu)
+    lines = [(rng.choice(items), rng.randint(1, 4)) for _ in range(scale)]
+
+    def run():
+        order = restaurant.Order()
+        for item, quantity in lines:
+            order.add(item, quantity)
+    return run
+
+
+@benchmark("order.summary")
+def _order_summary(scale: int):
+    order = _random_order(scale)
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            order.summary()
+    return run
+
+
+def time_callable(function, repeat: int, min_time: float = 0.001) -> list:
+    """Seconds per call for each of repeat runs, looping fast callables until a run lasts min_time"""
+    calls = 1
+    while True:
+        start = perf_counter()
+        for _ in range(calls):
+            function()
+        if perf_counter() - start >= min_time or calls >= 1_000_000:
+            break
+        calls *= 10
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        for _ in range(calls):
+            function()
+        timings.append((perf_counter() - start) / calls)
+    return timings
+
+
+def run_benchmarks(patterns: list, scales: list, repeat: int) -> list:
+    results = []
+    for name, setup in BENCHMARKS.items():
+        if patterns and not any(fnmatch.fnmatch(name, pattern) for pattern in patterns):
+            continue
+        for scale in scales:
+            timings = time_callable(setup(scale), repeat)
+            best = min(timings)
+            results.append({
+                "name": name,
+                "scale": scale,
+                "best_s": best,
+                "median_s": statistics.median(timings),
+                "per_item_ns": best / scale * 1e9,
+                "repeat": repeat
+            })
+            print(f"{name:<37} {scale:>9,}  best {best * 1e6:12.2f} us  {best / scale * 1e9:10.1f} ns/item")
+    return results
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results: list, baseline: dict, tolerance: float) -> int:
+    """Print the change against a previous JSON report, return how many benchmarks regressed"""
+    previous = {(entry["name"], entry["scale"]): entry["best_s"] for entry in baseline["results"]}
+    regressions = 0
+    print(f"\nCompared with {baseline.get('commit', 'unknown')}:")
+    for entry in results:
+        before = previous.get((entry["name"], entry["scale"]))
+        if before is None:
+            continue
+        ratio = entry["best_s"] / before
+        flag = ""
+        if ratio > 1 + tolerance:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(f"{entry['name']:<37} {entry['scale']:>9,}  {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", "--filter", action="append", default=[],
+                        help="glob of benchmark names to run, may be repeated")
+    parser.add_argument("-s", "--scale", type=int, action="append", help="problem size, may be repeated")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="timed runs per benchmark")
+    parser.add_argument("-o", "--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON report of a previous run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="slowdown ratio above which a benchmark counts as a regression")
+    parser.add_argument("--list", action="store_true", help="list the benchmark names and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return 0
+
+    results = run_benchmarks(args.filter, args.scale or list(DEFAULT_SCALES), args.repeat)
+    report = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results
+    }
+    if args.output:
+        with open(args.output, "w") as report_file:
+            json.dump(report, report_file, indent=2)
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            return 1 if compare(results, json.load(baseline_file), args.tolerance) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
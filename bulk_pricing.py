@@ -0,0 +1,142 @@
+import numpy as np
+
+from restaurant_revisted import Beverage, MainCourse, Menu, Order
+
+
+def apply_discount_tiers(subtotals: np.ndarray) -> np.ndarray:
+    discounts = np.zeros(subtotals.shape[0])
+    for threshold, tier_discount in reversed(Order.DISCOUNT_TIERS):
+        discounts[subtotals > threshold] = tier_discount
+    return subtotals * (1 - discounts)
+
+
+def price_orders(orders: list):
+    """Subtotals and discounted totals for many orders, equal to Order.total and Order.apply_discount
+
+    Order keeps a running subtotal from the prices captured when each line was added, so the
+    subtotals are one O(1) read per order and only the discount tiers are applied vectorially.
+    """
+    subtotals = np.fromiter(map(Order.total, orders), dtype=np.float64, count=len(orders))
+    return subtotals, apply_discount_tiers(subtotals)
+
+
+def flatten_items(orders: list, menu: Menu = None):
+    """Flatten orders into parallel item-id / quantity / order-id arrays for re-pricing
+
+    Returns (item_ids, quantities, order_ids, items) where items[item_id] is the MenuItem.
+    With a menu, item ids are the catalog ids so menu_table(menu) can price them directly.
+    """
+    item_index = {}
+    items = list(menu) if menu is not None else []
+    item_ids = []
+    quantities = []
+    order_ids = []
+    for order_id, order in enumerate(orders):
+        for item, quantity in order.items:
+            if menu is not None:
+                index = item.get_menu_id()
+                if index is None or menu.get(index) is not item:
+                    raise KeyError(f"{item.get_name()} is not registered in this menu")
+            else:
+                index = item_index.get(id(item))
+                if index is None:
+                    index = item_index[id(item)] = len(items)
+                    items.append(item)
+            item_ids.append(index)
+            quantities.append(quantity)
+            order_ids.append(order_id)
+    return (np.array(item_ids, dtype=np.intp), np.array(quantities, dtype=np.float64),
+            np.array(order_ids, dtype=np.intp), items)
+
+
+def item_table(items: list):
+    """Price, beverage flag and main-course flag of each item, indexed by item id"""
+    prices = np.array([item.get_price() for item in items], dtype=np.float64)
+    is_beverage = np.array([isinstance(item, Beverage) for item in items], dtype=bool)
+    is_main = np.array([isinstance(item, MainCourse) for item in items], dtype=bool)
+    return prices, is_beverage, is_main
+
+
+def menu_table(menu: Menu):
+    """Same as item_table, reading the compiled price table of a Menu without copying prices
+
+    The prices view shares memory with the menu, so set_price changes show up in it. Release
+    it before registering new items, the menu cannot grow while the view is alive.
+    """
+    prices = np.frombuffer(menu.prices, dtype=np.float64)
+    categories = np.frombuffer(menu.categories, dtype=np.int8)
+    return prices, categories == Menu.BEVERAGE, categories == Menu.MAIN_COURSE
+
+
+def price_lines(item_ids, quantities, order_ids, prices, is_beverage, is_main, order_count: int):
+    """Vectorized pricing of flattened order lines at the given item prices
+
+    Returns (subtotals, totals), one entry per order id in [0, order_count).
+    """
+    has_main = np.bincount(order_ids, weights=is_main[item_ids], minlength=order_count) > 0
+    line_totals = prices[item_ids] * quantities
+    beverage_lines = is_beverage[item_ids]
+    # Same operation order as Beverage.total_price: price * quantity * (1 + tax) * (1 - discount)
+    beverage_discount = np.where(has_main[order_ids[beverage_lines]], 1 - Beverage.MAIN_COURSE_DISCOUNT, 1)
+    line_totals[beverage_lines] = line_totals[beverage_lines] * (1 + Beverage.TAX) * beverage_discount
+    subtotals = np.bincount(order_ids, weights=line_totals, minlength=order_count)
+    return subtotals, apply_discount_tiers(subtotals)
+
+
+def reprice_orders(orders: list, menu: Menu = None):
+    """Subtotals and discounted totals at today's prices, e.g. to quote repeating past orders"""
+    item_ids, quantities, order_ids, items = flatten_items(orders, menu)
+    if not items:
+        return np.zeros(len(orders)), np.zeros(len(orders))
+    prices, is_beverage, is_main = item_table(items) if menu is None else menu_table(menu)
+    return price_lines(item_ids, quantities, order_ids, prices, is_beverage, is_main, len(orders))
+
+
+# Throughput benchmark
+if __name__ == "__main__":
+    import random
+    import sys
+    from time import perf_counter
+
+    import restaurant_revisted as restaurant
+
+    order_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    menu = list(restaurant.menu)
+
+    random.seed(1)
+    orders = []
+    for _ in range(order_count):
+        order = Order()
+        for item in random.sample(menu, random.randint(1, 6)):
+            order.add(item, random.randint(1, 4))
+        orders.append(order)
+    line_count = sum(len(order.items) for order in orders)
+
+    # Prices change between ordering and settlement, settled orders keep their captured prices
+    water = restaurant.water
+    original_price = water.get_price()
+    water.set_price(original_price + 500)
+
+    start = perf_counter()
+    expected_subtotals = [order.total() for order in orders]
+    expected_totals = [order.apply_discount() for order in orders]
+    loop_time = perf_counter() - start
+
+    start = perf_counter()
+    subtotals, totals = price_orders(orders)
+    pricing_time = perf_counter() - start
+
+    print(f"{order_count:,} orders, {line_count:,} lines, water price changed after ordering")
+    print("Subtotals match Order.total exactly:", np.array_equal(subtotals, expected_subtotals))
+    print("Discounted totals match Order.apply_discount exactly:", np.array_equal(totals, expected_totals))
+    print(f"Per-order loop: {loop_time:.3f}s ({order_count / loop_time:,.0f} orders/s), "
+          f"price_orders: {pricing_time:.3f}s ({order_count / pricing_time:,.0f} orders/s, "
+          f"{loop_time / pricing_time:.1f}x)")
+
+    quoted_subtotals, _ = reprice_orders(orders[:1000], restaurant.menu)
+    changed = int(np.count_nonzero(quoted_subtotals != subtotals[:1000]))
+    print(f"Re-pricing the first 1,000 orders at today's menu prices changes {changed} subtotals")
+    water.set_price(original_price)
+    _, menu_totals = reprice_orders(orders[:1000], restaurant.menu)
+    print("With the original price restored, re-pricing gives the same totals:",
+          np.array_equal(menu_totals, expected_totals[:1000]))
@@ -0,0 +1,248 @@
+import numpy as np
+
+from exercise_2 import Point, Polygon, Rectangle, Triangle, signed_area
+from segment_intersection import sweep_candidates
+from spatial_index import bounding_box
+
+
+def _counter_clockwise(coords: list) -> list:
+    return coords[::-1] if signed_area(coords) < 0 else coords
+
+
+def clip_convex(subject: list, clip: list) -> list:
+    """Sutherland–Hodgman: the part of subject inside the convex clip polygon, both as (x, y) lists
+
+    subject may be any simple polygon when clip is convex, the result is empty when they don't overlap.
+    """
+    clip = _counter_clockwise(clip)
+    output = list(subject)
+    start_x, start_y = clip[-1]
+    for end_x, end_y in clip:
+        if len(output) < 3:
+            return []
+        edge_x, edge_y = end_x - start_x, end_y - start_y
+        candidates, output = output, []
+        previous_x, previous_y = candidates[-1]
+        previous_side = edge_x * (previous_y - start_y) - edge_y * (previous_x - start_x)
+        for x_coord, y_coord in candidates:
+            side = edge_x * (y_coord - start_y) - edge_y * (x_coord - start_x)
+            if (side < 0 < previous_side) or (previous_side < 0 <= side):
+                # The edge from the previous vertex crosses the clip line
+                fraction = previous_side / (previous_side - side)
+                output.append((previous_x + fraction * (x_coord - previous_x),
+                               previous_y + fraction * (y_coord - previous_y)))
+            if side >= 0:
+                output.append((x_coord, y_coord))
+            previous_x, previous_y, previous_side = x_coord, y_coord, side
+        start_x, start_y = end_x, end_y
+    if len(output) < 3 or signed_area(output) == 0:
+        return []
+    return output
+
+
+def _is_convex(shape) -> bool:
+    if isinstance(shape, Polygon):
+        return shape.is_convex()
+    return isinstance(shape, (Rectangle, Triangle))
+
+
+def _convex_pieces(shape) -> list:
+    """Convex vertex lists whose union is the shape, non-convex Polygons are triangulated"""
+    if _is_convex(shape):
+        return [shape.get_vertices()]
+    return [triangle.get_vertices() for triangle in shape.triangulate()]
+
+
+def _boxes_overlap(first: tuple, second: tuple) -> bool:
+    return first[0] < second[2] and second[0] < first[2] and first[1] < second[3] and second[1] < first[3]
+
+
+def intersection(first, second) -> list:
+    """Overlap of two shapes as a list of convex Polygons with disjoint interiors
+
+    Convex shapes (Rectangle, Triangle, convex Polygon) give at most one piece through
+    Sutherland–Hodgman. A non-convex Polygon is first split into its ear-clipping triangles and
+    every pair of pieces whose bounding boxes overlap is clipped.
+    """
+    pieces = []
+    second_pieces = [(coords, bounding_box(coords)) for coords in _convex_pieces(second)]
+    for first_coords in _convex_pieces(first):
+        first_box = bounding_box(first_coords)
+        for second_coords, second_box in second_pieces:
+            if not _boxes_overlap(first_box, second_box):
+                continue
+            clipped = clip_convex(first_coords, second_coords)
+            if clipped:
+                piece = Polygon()
+                piece.set_vertices([Point(x_coord, y_coord) for x_coord, y_coord in clipped])
+                pieces.append(piece)
+    return pieces
+
+
+def intersection_area(first, second) -> float:
+    return sum(piece.compute_area() for piece in intersection(first, second))
+
+
+def union_area(first, second) -> float:
+    return first.compute_area() + second.compute_area() - intersection_area(first, second)
+
+
+def difference_area(first, second) -> float:
+    """Area of first that second does not cover"""
+    return first.compute_area() - intersection_area(first, second)
+
+
+def _boxes(rectangles) -> np.ndarray:
+    """(N, 4) min_x, min_y, max_x, max_y of an (N, 4, 2) array or ShapeBatch of axis-aligned rectangles"""
+    coords = np.asarray(getattr(rectangles, "coords", rectangles), dtype=np.float64)
+    # Vertices 0 and 2 are opposite corners, enough to bound an axis-aligned rectangle
+    return np.concatenate([np.minimum(coords[:, 0], coords[:, 2]), np.maximum(coords[:, 0], coords[:, 2])], axis=1)
+
+
+def _box_overlap_areas(first_boxes: np.ndarray, second_boxes: np.ndarray) -> np.ndarray:
+    width = np.minimum(first_boxes[:, 2], second_boxes[:, 2]) - np.maximum(first_boxes[:, 0], second_boxes[:, 0])
+    height = np.minimum(first_boxes[:, 3], second_boxes[:, 3]) - np.maximum(first_boxes[:, 1], second_boxes[:, 1])
+    return np.maximum(width, 0) * np.maximum(height, 0)
+
+
+def rectangle_overlap_areas(first, second) -> np.ndarray:
+    """Overlap area of each pair (first[i], second[i]) of axis-aligned rectangles"""
+    return _box_overlap_areas(_boxes(first), _boxes(second))
+
+
+def find_rectangle_overlaps(rectangles, chunk_size: int = 1_000_000):
+    """Every pair of axis-aligned rectangles in a set that overlaps with positive area
+
+    Candidates come from segment_intersection.sweep_candidates: rectangles sorted by min x are
+    only tested against those starting before they end, in vectorized chunks of at most
+    chunk_size candidate pairs. Rectangles that mostly overlap in x make that O(n^2) pairs.
+    Returns (pairs, areas) with i < j sorted lexicographically.
+    """
+    boxes = _boxes(rectangles)
+    found_pairs = []
+    found_areas = []
+    # Touching edges don't overlap, so only starts strictly before the end count
+    for first, second in sweep_candidates(boxes[:, 0], boxes[:, 2], chunk_size, touching=False):
+        areas = _box_overlap_areas(boxes[first], boxes[second])
+        hit = areas > 0
+        found_pairs.append(np.stack([first[hit], second[hit]], axis=1))
+        found_areas.append(areas[hit])
+
+    if not found_pairs:
+        return np.empty((0, 2), dtype=np.intp), np.empty(0)
+    pairs = np.concatenate(found_pairs)
+    areas = np.concatenate(found_areas)
+    pairs.sort(axis=1)
+    ranking = np.lexsort((pairs[:, 1], pairs[:, 0]))
+    return pairs[ranking], areas[ranking]
+
+
+def _inside_mask(coords: list, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Even-odd test of grid sample points against one polygon"""
+    inside = np.zeros(xs.shape, dtype=bool)
+    previous_x, previous_y = coords[-1]
+    for x_coord, y_coord in coords:
+        if y_coord != previous_y:
+            crosses = (y_coord > ys) != (previous_y > ys)
+            crossing_x = x_coord + (ys - y_coord) * (previous_x - x_coord) / (previous_y - y_coord)
+            inside ^= crosses & (xs < crossing_x)
+        previous_x, previous_y = x_coord, y_coord
+    return inside
+
+
+def raster_intersection_area(first, second, resolution: int = 1024) -> float:
+    """Reference overlap area from sampling a resolution x resolution grid over the shared bounding box"""
+    first_coords, second_coords = first.get_vertices(), second.get_vertices()
+    first_box, second_box = bounding_box(first_coords), bounding_box(second_coords)
+    min_x, min_y = max(first_box[0], second_box[0]), max(first_box[1], second_box[1])
+    max_x, max_y = min(first_box[2], second_box[2]), min(first_box[3], second_box[3])
+    if min_x >= max_x or min_y >= max_y:
+        return 0.0
+    step_x, step_y = (max_x - min_x) / resolution, (max_y - min_y) / resolution
+    xs, ys = np.meshgrid(min_x + step_x * (np.arange(resolution) + 0.5), min_y + step_y * (np.arange(resolution) + 0.5))
+    covered = _inside_mask(first_coords, xs, ys) & _inside_mask(second_coords, xs, ys)
+    return float(np.count_nonzero(covered)) * step_x * step_y
+
+
+# Testing and benchmark against the rasterized reference
+if __name__ == "__main__":
+    import random
+    import sys
+    from time import perf_counter
+
+    square = Rectangle()
+    square.set_vertices([Point(0, 4), Point(4, 4), Point(4, 0), Point(0, 0)])
+    shifted = Rectangle()
+    shifted.set_vertices([Point(2, 6), Point(7, 6), Point(7, 1), Point(2, 1)])
+    triangle = Triangle()
+    triangle.set_vertices([Point(-1, -1), Point(5, 1), Point(1, 5)])
+    arrow = Polygon()
+    arrow.set_vertices([Point(0, 0), Point(6, 0), Point(6, 6), Point(3, 2), Point(0, 6)])
+
+    for name, first, second in (("square & shifted", square, shifted), ("square & triangle", square, triangle),
+                                ("arrow & shifted", arrow, shifted), ("arrow & triangle", arrow, triangle)):
+        pieces = intersection(first, second)
+        exact = sum(piece.compute_area() for piece in pieces)
+        raster = raster_intersection_area(first, second)
+        print(f"{name}: {len(pieces)} piece(s), area {exact:.6f}, raster {raster:.6f}, "
+              f"union {union_area(first, second):.6f}, difference {difference_area(first, second):.6f}")
+    print("Square & shifted overlap:", intersection(square, shifted)[0].get_vertices())
+
+    random.seed(11)
+    pair_count = 200
+    differences = []
+    exact_time = raster_time = 0.0
+    for _ in range(pair_count):
+        first, second = Triangle(), Triangle()
+        first.set_vertices([Point(random.uniform(0, 10), random.uniform(0, 10)) for _ in range(3)])
+        second.set_vertices([Point(random.uniform(0, 10), random.uniform(0, 10)) for _ in range(3)])
+        start = perf_counter()
+        exact = intersection_area(first, second)
+        exact_time += perf_counter() - start
+        start = perf_counter()
+        raster = raster_intersection_area(first, second, resolution=512)
+        raster_time += perf_counter() - start
+        differences.append(abs(exact - raster))
+    print(f"{pair_count} random triangle pairs: clipping {exact_time * 1e3:.1f} ms, raster {raster_time * 1e3:.1f} ms "
+          f"({raster_time / exact_time:.0f}x slower), mean difference {np.mean(differences):.1e}, "
+          f"worst {max(differences):.1e}")
+
+    rectangle_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(11)
+    unit_square = np.array([[0.0, 1.0], [1.0, 1.0], [1.0, 0.0], [0.0, 0.0]])
+
+    def random_rectangles(count: int, extent: float) -> np.ndarray:
+        return rng.uniform(0, extent, size=(count, 1, 2)) + rng.uniform(0.5, 3, size=(count, 1, 2)) * unit_square
+
+    first_batch = random_rectangles(rectangle_count, 20)
+    second_batch = random_rectangles(rectangle_count, 20)
+    start = perf_counter()
+    areas = rectangle_overlap_areas(first_batch, second_batch)
+    batch_time = perf_counter() - start
+    loop_count = min(rectangle_count, 20_000)
+    start = perf_counter()
+    loop_areas = [abs(signed_area(clipped)) if clipped else 0.0
+                  for clipped in (clip_convex(first.tolist(), second.tolist())
+                                  for first, second in zip(first_batch[:loop_count], second_batch[:loop_count]))]
+    loop_time = (perf_counter() - start) * rectangle_count / loop_count
+    print(f"{rectangle_count:,} rectangle pairs: batched {batch_time:.3f}s, Sutherland–Hodgman loop "
+          f"{loop_time:.1f}s (extrapolated), match: {np.allclose(areas[:loop_count], loop_areas)}")
+
+    small_layout = random_rectangles(2_000, 90)
+    start = perf_counter()
+    pairs, overlaps = find_rectangle_overlaps(small_layout)
+    sweep_time = perf_counter() - start
+    start = perf_counter()
+    small_boxes = _boxes(small_layout).tolist()
+    naive = [(i, j) for i, first in enumerate(small_boxes) for j in range(i + 1, len(small_boxes))
+             if _boxes_overlap(first, small_boxes[j])]
+    naive_time = perf_counter() - start
+    print(f"Layout of {len(small_layout):,} rectangles: sweep {sweep_time:.3f}s, naive {naive_time:.2f}s, "
+          f"{len(pairs):,} overlapping pairs, results match: {pairs.tolist() == [list(pair) for pair in naive]}")
+
+    layout_count = min(rectangle_count, 300_000)
+    layout = random_rectangles(layout_count, 4 * np.sqrt(layout_count))
+    start = perf_counter()
+    pairs, overlaps = find_rectangle_overlaps(layout)
+    print(f"Layout of {layout_count:,} rectangles: {len(pairs):,} overlapping pairs found in "
+          f"{perf_counter() - start:.2f}s, total overlap {overlaps.sum():.1f}")
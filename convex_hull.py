@@ -0,0 +1,207 @@
+from math import pi
+
+import numpy as np
+
+from exercise_2 import Point, Rectangle
+from shape_batch import PointArray
+
+# Point counts at or below this go straight to the monotone chain
+CHAIN_SIZE = 4096
+
+
+def _monotone_chain(xs: list, ys: list) -> list:
+    """Andrew's monotone chain over points already sorted by (x, y), returns hull indices counter-clockwise"""
+    def build(indices) -> list:
+        chain = []
+        for index in indices:
+            x_coord, y_coord = xs[index], ys[index]
+            while len(chain) >= 2:
+                first, second = chain[-2], chain[-1]
+                if (xs[second] - xs[first]) * (y_coord - ys[first]) - (ys[second] - ys[first]) * (x_coord - xs[first]) > 0:
+                    break
+                chain.pop()
+            chain.append(index)
+        return chain
+
+    count = len(xs)
+    if count < 3:
+        return list(range(count)) if count < 2 or (xs[0], ys[0]) != (xs[1], ys[1]) else [0]
+    lower = build(range(count))
+    upper = build(range(count - 1, -1, -1))
+    hull = lower[:-1] + upper[:-1]
+    # Every point identical leaves the same index twice
+    return hull if len(hull) > 1 and (xs[hull[0]], ys[hull[0]]) != (xs[hull[1]], ys[hull[1]]) else hull[:1]
+
+
+def convex_hull(points: list) -> list:
+    """Convex hull of a list of Points in O(n log n), counter-clockwise without collinear points"""
+    ordered = sorted(points, key=lambda point: (point.x, point.y))
+    hull = _monotone_chain([point.x for point in ordered], [point.y for point in ordered])
+    return [ordered[index] for index in hull]
+
+
+def _strictly_inside(coords: np.ndarray, hull: np.ndarray) -> np.ndarray:
+    """Mask of coords strictly inside a counter-clockwise convex polygon with at least 3 vertices
+
+    Each point is placed in one triangle of the fan from hull[0] by a binary search on angles,
+    then tested against all three sides so a point next to a ray is never wrongly dropped.
+    """
+    rays = hull[1:] - hull[0]
+    relative = coords - hull[0]
+    reference = rays[0]
+    ray_angles = np.arctan2(reference[0] * rays[:, 1] - reference[1] * rays[:, 0], rays @ reference)
+    angles = np.arctan2(reference[0] * relative[:, 1] - reference[1] * relative[:, 0], relative @ reference)
+    sector = np.clip(np.searchsorted(ray_angles, angles, side="right") - 1, 0, len(rays) - 2)
+    start, end = rays[sector], rays[sector + 1]
+    side = end - start
+    offset = relative - start
+    return ((start[:, 0] * relative[:, 1] - start[:, 1] * relative[:, 0] > 0)
+            & (end[:, 0] * relative[:, 1] - end[:, 1] * relative[:, 0] < 0)
+            & (side[:, 0] * offset[:, 1] - side[:, 1] * offset[:, 0] > 0))
+
+
+def _inside_half_planes(coords: np.ndarray, hull: np.ndarray) -> np.ndarray:
+    """Same mask as _strictly_inside with one test per hull edge, cheaper for a handful of edges"""
+    inside = np.ones(coords.shape[0], dtype=bool)
+    for start, end in zip(hull, np.roll(hull, -1, axis=0)):
+        side = end - start
+        inside &= side[0] * (coords[:, 1] - start[1]) - side[1] * (coords[:, 0] - start[0]) > 0
+    return inside
+
+
+def convex_hull_array(points) -> np.ndarray:
+    """Vectorized convex hull of an (N, 2) array, PointArray or list of Points as an (H, 2) array
+
+    Points strictly inside the hull of a sample, seeded with the extremes along x, y and the
+    diagonals, are discarded with numpy until few enough remain for the monotone chain.
+    """
+    coords = PointArray.from_any(points).coords
+    candidates = np.arange(coords.shape[0])
+    first_pass = True
+    while candidates.shape[0] > CHAIN_SIZE:
+        subset = coords if first_pass else coords[candidates]
+        directions = (subset[:, 0], subset[:, 1], subset[:, 0] + subset[:, 1], subset[:, 0] - subset[:, 1])
+        extremes = [function(values) for values in directions for function in (np.argmin, np.argmax)]
+        if first_pass:
+            # The octagon of extremes takes only eight half-plane tests and removes most points
+            sample = np.unique(extremes)
+        else:
+            sample = np.unique(np.concatenate([np.arange(0, subset.shape[0], subset.shape[0] // CHAIN_SIZE),
+                                               extremes]))
+        sample_hull = subset[sample][_sorted_hull(subset[sample])]
+        if sample_hull.shape[0] < 3:
+            break
+        inside = _inside_half_planes(subset, sample_hull) if first_pass else _strictly_inside(subset, sample_hull)
+        first_pass = False
+        if not inside.any():
+            break
+        candidates = candidates[~inside]
+    return coords[candidates][_sorted_hull(coords[candidates])]
+
+
+def _sorted_hull(coords: np.ndarray) -> np.ndarray:
+    order = np.lexsort((coords[:, 1], coords[:, 0]))
+    ordered = coords[order]
+    return order[_monotone_chain(ordered[:, 0].tolist(), ordered[:, 1].tolist())]
+
+
+def _caliper_rectangles(hull: np.ndarray) -> tuple:
+    """Area, perimeter and corners of the bounding rectangle flush with each hull edge
+
+    Rotating calipers done with binary searches: hull edge angles increase around a convex
+    polygon, so the vertex extreme in any direction is found with searchsorted on them.
+    """
+    edges = np.roll(hull, -1, axis=0) - hull
+    lengths = np.hypot(edges[:, 0], edges[:, 1])
+    along = edges / lengths[:, None]
+    inward = np.stack([-along[:, 1], along[:, 0]], axis=1)
+    angles = np.arctan2(edges[:, 1], edges[:, 0])
+    angles = angles[0] + np.mod(angles - angles[0], 2 * pi)
+
+    def extreme(offset: float) -> np.ndarray:
+        query = angles[0] + np.mod(angles + offset - angles[0], 2 * pi)
+        return np.searchsorted(angles, query, side="left") % hull.shape[0]
+
+    forward = hull[extreme(pi / 2)] - hull
+    backward = hull[extreme(3 * pi / 2)] - hull
+    far = hull[extreme(pi)] - hull
+    low = np.einsum("ij,ij->i", backward, along)
+    high = np.einsum("ij,ij->i", forward, along)
+    depth = np.einsum("ij,ij->i", far, inward)
+    width = high - low
+    start = hull + along * low[:, None]
+    end = hull + along * high[:, None]
+    lift = inward * depth[:, None]
+    # Clockwise like Rectangle's [top_left, top_right, bottom_right, bottom_left] when the edge runs along +x
+    corners = np.stack([start + lift, end + lift, end, start], axis=1)
+    return width * depth, 2 * (width + depth), corners
+
+
+def _bounding_rectangle(points, metric: int) -> Rectangle:
+    hull = convex_hull_array(points)
+    if hull.shape[0] == 0:
+        raise ValueError("Cannot bound an empty point set")
+    if hull.shape[0] < 3:
+        # A point or a segment, the rectangle collapses onto it
+        start, end = hull[0], hull[-1]
+        corners = np.array([start, end, end, start])
+    else:
+        metrics = _caliper_rectangles(hull)
+        corners = metrics[2][np.argmin(metrics[metric])]
+    rectangle = Rectangle()
+    rectangle.set_vertices([Point(x_coord, y_coord) for x_coord, y_coord in corners.tolist()])
+    return rectangle
+
+
+def minimum_area_rectangle(points) -> Rectangle:
+    """Smallest-area bounding Rectangle, possibly rotated, of Points, a PointArray or an (N, 2) array"""
+    return _bounding_rectangle(points, 0)
+
+
+def minimum_perimeter_rectangle(points) -> Rectangle:
+    """Smallest-perimeter bounding Rectangle, possibly rotated, of Points, a PointArray or an (N, 2) array"""
+    return _bounding_rectangle(points, 1)
+
+
+# Testing and benchmark
+if __name__ == "__main__":
+    import random
+    import sys
+    from time import perf_counter
+
+    square_points = [Point(0, 0), Point(2, 0), Point(2, 2), Point(0, 2), Point(1, 1), Point(1, 0), Point(2, 2)]
+    print("Hull:", [(point.x, point.y) for point in convex_hull(square_points)])
+    diamond = np.array([[0, 0], [3, 3], [0, 6], [-3, 3], [0, 3]], dtype=np.float64)
+    rectangle = minimum_area_rectangle(diamond)
+    print("Minimum-area rectangle of a diamond:", rectangle.get_vertices(), "area", rectangle.compute_area())
+
+    random.seed(3)
+    cloud = [Point(random.gauss(0, 1), random.gauss(0, 1)) for _ in range(2000)]
+    reference = convex_hull(cloud)
+    vectorized = convex_hull_array(cloud)
+    print("List and array hulls match:",
+          sorted((point.x, point.y) for point in reference) == sorted(map(tuple, vectorized.tolist())))
+
+    rng = np.random.default_rng(4)
+    sizes = [int(sys.argv[1])] if len(sys.argv) > 1 else [1_000_000, 10_000_000]
+    for size in sizes:
+        radius, angle = np.sqrt(rng.random(size)), rng.uniform(0, 2 * pi, size)
+        clouds = {"square": rng.uniform(-1, 1, size=(size, 2)),
+                  "disk": np.stack([radius * np.cos(angle), radius * np.sin(angle)], axis=1),
+                  "gaussian": rng.normal(size=(size, 2))}
+        for name, coords in clouds.items():
+            start = perf_counter()
+            hull = convex_hull_array(coords)
+            hull_time = perf_counter() - start
+            start = perf_counter()
+            area_box = minimum_area_rectangle(hull)
+            perimeter_box = minimum_perimeter_rectangle(hull)
+            box_time = perf_counter() - start
+            print(f"{size:>11,} {name:<9} hull {hull.shape[0]:>5} vertices in {hull_time:.3f}s, "
+                  f"bounding rectangles in {box_time * 1e3:.1f} ms "
+                  f"(area {area_box.compute_area():.4f}, perimeter {perimeter_box.compute_perimeter():.4f})")
+        if size <= 1_000_000:
+            points = PointArray(clouds["disk"]).to_points()
+            start = perf_counter()
+            convex_hull(points)
+            print(f"{size:>11,} disk      list of Points through the monotone chain in {perf_counter() - start:.3f}s")
@@ -1,42 +1,5 @@
-import math 
-from math import degrees, acos
+from primitives import Point, Line
 
-class Point:
-    def __init__(self, x: float, y: float):
-        self.x = x
-        self.y = y
-        
-class Line:
-    def __init__(self, start: Point, end: Point):
-        self.start = start
-        self.end = end
-        self.length = self.compute_length()
-        self.slope = self.compute_slope()
-        self.points = []
-    
-    def compute_length(self):
-        return ((self.end.x - self.start.x)**2 + (self.end.y - self.start.y)**2)**0.5
-    
-    def compute_slope(self):
-        dx = self.end.x - self.start.x
-        if dx == 0:
-            return float('inf') 
-        return (self.end.y - self.start.y) / dx
-    
-    def compute_horizontal_cross(self):
-        return self.start.y * self.end.y < 0
-    
-    def compute_vertical_cross(self):
-        return self.start.x * self.end.x < 0
-    
-    def discretize_line(self, n: int):
-        self.points = [
-            Point(
-                self.start.x + i * (self.end.x - self.start.x) / (n - 1),
-                self.start.y + i * (self.end.y - self.start.y) / (n - 1)
-            ) for i in range(n)
-        ]
-    
 class Shape:
     def __init__(self, is_regular: bool, edge: list["Line"], vertice: list["Point"], inner_angles: list[float]):
         self.is_regular = is_regular
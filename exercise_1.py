@@ -32,11 +32,12 @@ class Square(Shape):
         return 4 * self.side
 
 # Ejemplo de uso
-figura1 = Rectangle(4, 5)
-figura2 = Square(3)
+if __name__ == "__main__":
+    figura1 = Rectangle(4, 5)
+    figura2 = Square(3)
 
-print("Área del rectángulo:", figura1.compute_area())
-print("Perímetro del rectángulo:", figura1.compute_perimeter())
+    print("Área del rectángulo:", figura1.compute_area())
+    print("Perímetro del rectángulo:", figura1.compute_perimeter())
 
-print("Área del cuadrado:", figura2.compute_area())
-print("Perímetro del cuadrado:", figura2.compute_perimeter())
+    print("Área del cuadrado:", figura2.compute_area())
+    print("Perímetro del cuadrado:", figura2.compute_perimeter())
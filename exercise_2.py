@@ -1,39 +1,27 @@
-from math import degrees, acos, sin, radians, atan2, sqrt
+from math import degrees, atan2, floor, pi, sqrt
 
+from primitives import Point, Line
 
-class Point:
-    def __init__(self, x_coord, y_coord):
-        self.x = x_coord
-        self.y = y_coord
-    
-    def compute_distance(self, other_point):
-        """Calculate distance to another point"""
-        return sqrt((self.x - other_point.x)**2 + (self.y - other_point.y)**2)
-
-
-class Line:
-    def __init__(self, start_point: Point, end_point: Point):
-        self.start_point = start_point
-        self.end_point = end_point
-        self.length = self._calculate_length()
-        self.slope_radians = atan2((end_point.y - start_point.y), (end_point.x - start_point.x))
-        self.slope_degrees = degrees(self.slope_radians)
-
-    def _calculate_length(self) -> float:
-        dx = self.end_point.x - self.start_point.x
-        dy = self.end_point.y - self.start_point.y
-        return sqrt(dx**2 + dy**2)
-    
-    def compute_length(self) -> float:
-        return self.length
+
+def _angle_between(x_first, y_first, x_second, y_second) -> float:
+    """Angle in degrees between two vectors"""
+    return degrees(atan2(abs(x_first * y_second - y_first * x_second), x_first * x_second + y_first * y_second))
 
 
 class Shape:
+    # True when compute_area only uses the shoelace formula, so any affine map scales it by |determinant|
+    AFFINE_AREA = False
+
     def __init__(self):
         self._regular_flag = False
         self._vertex_list = []
         self._edge_collection = []
         self._angle_values = []
+        self._edges_ready = False
+        self._metric_cache = {}
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._vertex_listeners = []
 
     def set_is_regular(self, regular_status: bool):
         self._regular_flag = regular_status
@@ -42,19 +30,98 @@ class Shape:
         return self._regular_flag
 
     def set_vertices(self, vertex_points: list):
-        self._vertex_list = vertex_points
+        # Keep a copy, later changes to the caller's list would leave the cached metrics stale
+        self._vertex_list = list(vertex_points)
         self._build_edges()
+        self._notify_vertex_listeners()
+
+    def set_vertex(self, index: int, vertex_point: Point):
+        """Replace a single vertex, dropping everything cached for the old one"""
+        self._vertex_list[index] = vertex_point
+        self.invalidate_cache()
+        self._notify_vertex_listeners()
+
+    def apply_transform(self, transform):
+        """Move every vertex with an affine transform in place, rescaling the cached metrics it can"""
+        self._vertex_list = transform.apply_points(self._vertex_list)
+        self._edges_ready = False
+        cache = self._metric_cache
+        determinant = transform.determinant
+        length_scale = transform.length_scale
+        kept = {}
+        if "area" in cache and (self.AFFINE_AREA or length_scale is not None):
+            # Side-length formulas such as Rectangle's only stay valid under similarities
+            kept["area"] = cache["area"] * abs(determinant)
+        if "signed_area" in cache:
+            kept["signed_area"] = cache["signed_area"] * determinant
+        if determinant != 0:
+            # Invertible maps can't make edges cross or fold a convex polygon
+            for name in ("is_convex", "is_simple"):
+                if name in cache:
+                    kept[name] = cache[name]
+        if length_scale is not None:
+            # Rotations, reflections, translations and uniform scaling keep angles and scale lengths
+            if "perimeter" in cache:
+                kept["perimeter"] = cache["perimeter"] * length_scale
+            if "inner_angles" in cache:
+                kept["inner_angles"] = cache["inner_angles"]
+        self._metric_cache = kept
+        self._notify_vertex_listeners()
+
+    def add_vertex_listener(self, listener):
+        """Register a callable that receives the shape every time its vertices change"""
+        self._vertex_listeners.append(listener)
+
+    def remove_vertex_listener(self, listener):
+        self._vertex_listeners.remove(listener)
+
+    def _notify_vertex_listeners(self):
+        for listener in self._vertex_listeners:
+            listener(self)
 
     def get_vertices(self) -> list:
         return [(vertex.x, vertex.y) for vertex in self._vertex_list]
     
     def _build_edges(self):
         """Internal method to construct edges from vertices"""
+        # Edges are built lazily by compute_edges, a new vertex set only drops the old ones
+        self.invalidate_cache()
+
+    def _make_edges(self):
+        """Internal method that builds the edge Lines of the shape"""
         pass
 
+    def _cached_metric(self, name: str, compute):
+        """Return a metric computed once per vertex set"""
+        if name in self._metric_cache:
+            self._cache_hits += 1
+            return self._metric_cache[name]
+        self._cache_misses += 1
+        value = compute()
+        self._metric_cache[name] = value
+        return value
+
+    def invalidate_cache(self):
+        """Forget cached edges and metrics"""
+        self._edges_ready = False
+        self._metric_cache = {}
+
+    def get_cache_stats(self) -> dict:
+        lookups = self._cache_hits + self._cache_misses
+        return {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "hit_rate": self._cache_hits / lookups if lookups else 0.0
+        }
+
     def compute_edges(self):
         """Calculate edges of the shape"""
-        pass
+        if self._edges_ready:
+            self._cache_hits += 1
+            return
+        self._cache_misses += 1
+        self._make_edges()
+        self._edges_ready = True
 
     def get_edges(self):
         """Retrieve edge information"""
@@ -81,7 +148,7 @@ class Rectangle(Shape):
         self._left_side = None
         self._right_side = None
     
-    def compute_edges(self):   
+    def _make_edges(self):
         # Vertex structure: [top_left, top_right, bottom_right, bottom_left]
         vertices = self._vertex_list
         self._top_side = Line(vertices[0], vertices[1])
@@ -120,12 +187,18 @@ class Rectangle(Shape):
         return edge_info
 
     def compute_area(self) -> float:
+        return self._cached_metric("area", self._calculate_area)
+
+    def _calculate_area(self) -> float:
         self.compute_edges()
         width = self._top_side.compute_length()
         height = self._right_side.compute_length()
         return width * height
        
     def compute_perimeter(self) -> float:
+        return self._cached_metric("perimeter", self._calculate_perimeter)
+
+    def _calculate_perimeter(self) -> float:
         self.compute_edges()
         horizontal_length = self._top_side.compute_length()
         vertical_length = self._right_side.compute_length()
@@ -142,6 +215,8 @@ class Square(Rectangle):
 
 
 class Triangle(Shape):
+    AFFINE_AREA = True
+
     def __init__(self):
         super().__init__()
         self._side_a = None
@@ -151,7 +226,7 @@ class Triangle(Shape):
         self._length_b = 0
         self._length_c = 0
 
-    def compute_edges(self): 
+    def _make_edges(self):
         vertices = self._vertex_list
         self._side_a = Line(vertices[0], vertices[1])
         self._side_b = Line(vertices[1], vertices[2])
@@ -186,32 +261,40 @@ class Triangle(Shape):
         return triangle_edges
 
     def compute_inner_angles(self):
-        self.compute_edges()
-        
-        # Angle opposite to side_a
-        cos_alpha = (self._length_c**2 + self._length_b**2 - self._length_a**2) / (2 * self._length_c * self._length_b)
-        self.alpha_angle = degrees(acos(cos_alpha))
-        
-        # Angle opposite to side_b
-        cos_beta = (self._length_c**2 + self._length_a**2 - self._length_b**2) / (2 * self._length_c * self._length_a)
-        self.beta_angle = degrees(acos(cos_beta))
-        
-        # Angle opposite to side_c
-        cos_gamma = (self._length_b**2 + self._length_a**2 - self._length_c**2) / (2 * self._length_b * self._length_a)
-        self.gamma_angle = degrees(acos(cos_gamma))
-       
+        return list(self._cached_metric("inner_angles", self._calculate_inner_angles))
+
+    def _calculate_inner_angles(self):
+        first, second, third = self._vertex_list
+        x_a, y_a, x_b, y_b, x_c, y_c = first.x, first.y, second.x, second.y, third.x, third.y
+        # atan2(|cross|, dot) stays accurate for near-degenerate triangles, where acos of the
+        # law of cosines fails once rounding pushes the cosine past +-1
+
+        # Angle opposite to side_a, at the third vertex
+        self.alpha_angle = _angle_between(x_a - x_c, y_a - y_c, x_b - x_c, y_b - y_c)
+
+        # Angle opposite to side_b, at the first vertex
+        self.beta_angle = _angle_between(x_b - x_a, y_b - y_a, x_c - x_a, y_c - y_a)
+
+        # Angle opposite to side_c, at the second vertex
+        self.gamma_angle = _angle_between(x_a - x_b, y_a - y_b, x_c - x_b, y_c - y_b)
+
         return [self.alpha_angle, self.beta_angle, self.gamma_angle]
         
     def compute_area(self) -> float:
-        self.compute_edges()
-        self.compute_inner_angles()
-        # Using formula: Area = (1/2) * a * b * sin(C)
-        area_value = 0.5 * self._length_a * self._length_b * sin(radians(self.gamma_angle))
-        return area_value
+        return self._cached_metric("area", self._calculate_area)
+
+    def _calculate_area(self) -> float:
+        first, second, third = self._vertex_list
+        x_a, y_a, x_b, y_b, x_c, y_c = first.x, first.y, second.x, second.y, third.x, third.y
+        # Shoelace formula: half the absolute cross product of two sides
+        return abs((x_b - x_a) * (y_c - y_a) - (x_c - x_a) * (y_b - y_a)) / 2
        
     def compute_perimeter(self) -> float:
-        self.compute_edges()
-        total_perimeter = self._length_a + self._length_b + self._length_c
+        return self._cached_metric("perimeter", self._calculate_perimeter)
+
+    def _calculate_perimeter(self) -> float:
+        first, second, third = self._vertex_list
+        total_perimeter = first.compute_distance(second) + second.compute_distance(third) + third.compute_distance(first)
         return total_perimeter
 
 
@@ -236,6 +319,423 @@ class TriRectangle(Triangle):
         super().__init__()
 
 
+# Labels used by classify_triangle and shape_batch.classify_triangles, 0 means collinear vertices
+TRIANGLE_CLASSES = (None, Equilateral, TriRectangle, Isosceles, Scalene)
+TRIANGLE_TOLERANCE = 1e-9
+
+
+def _triangle_label(x_first, y_first, x_second, y_second, x_third, y_third, tolerance: float) -> int:
+    side_x, side_y = x_second - x_first, y_second - y_first
+    next_x, next_y = x_third - x_second, y_third - y_second
+    last_x, last_y = x_first - x_third, y_first - y_third
+    square_a = side_x * side_x + side_y * side_y
+    square_b = next_x * next_x + next_y * next_y
+    square_c = last_x * last_x + last_y * last_y
+    longest = max(square_a, square_b, square_c)
+    shortest = min(square_a, square_b, square_c)
+    middle = max(min(square_a, square_b), min(max(square_a, square_b), square_c))
+    slack = tolerance * longest
+    if abs(side_x * (y_third - y_first) - side_y * (x_third - x_first)) <= slack:
+        return 0
+    if longest - shortest <= slack:
+        return 1
+    if abs(shortest + middle - longest) <= slack:
+        return 2
+    if middle - shortest <= slack or longest - middle <= slack:
+        return 3
+    return 4
+
+
+def classify_triangle(vertices: list, tolerance: float = TRIANGLE_TOLERANCE):
+    """Most specific Triangle subclass for three Points, None when they are collinear
+
+    Only squared side lengths are compared, relative to the longest one. Equilateral wins over
+    TriRectangle, which wins over Isosceles, so a right isosceles triangle is a TriRectangle.
+    """
+    first, second, third = vertices
+    return TRIANGLE_CLASSES[_triangle_label(first.x, first.y, second.x, second.y, third.x, third.y, tolerance)]
+
+
+def build_triangle(vertices: list, tolerance: float = TRIANGLE_TOLERANCE) -> Triangle:
+    """Triangle of the subclass picked by classify_triangle"""
+    triangle_class = classify_triangle(vertices, tolerance)
+    if triangle_class is None:
+        raise ValueError("Collinear vertices do not form a triangle")
+    triangle = triangle_class()
+    triangle.set_vertices(list(vertices))
+    return triangle
+
+
+class Polygon(Shape):
+    """Simple polygon with any number of vertices, in either winding order"""
+
+    AFFINE_AREA = True
+
+    def __init__(self):
+        super().__init__()
+
+    def _make_edges(self):
+        vertices = self._vertex_list
+        self._edge_collection = [Line(vertices[index], vertices[(index + 1) % len(vertices)])
+                                 for index in range(len(vertices))]
+
+    def get_edges(self) -> list:
+        self.compute_edges()
+        return [
+            {
+                "edge_name": f"edge_{index}",
+                "start_coord": (edge.start_point.x, edge.start_point.y),
+                "end_coord": (edge.end_point.x, edge.end_point.y),
+                "edge_length": edge.compute_length()
+            } for index, edge in enumerate(self._edge_collection)
+        ]
+
+    def compute_perimeter(self) -> float:
+        return self._cached_metric("perimeter", self._calculate_perimeter)
+
+    def _calculate_perimeter(self) -> float:
+        vertices = self._vertex_list
+        total_perimeter = 0.0
+        previous = vertices[-1]
+        for vertex in vertices:
+            total_perimeter += previous.compute_distance(vertex)
+            previous = vertex
+        return total_perimeter
+
+    def compute_signed_area(self) -> float:
+        """Shoelace area, positive for counter-clockwise vertices"""
+        return self._cached_metric("signed_area", self._calculate_signed_area)
+
+    def _calculate_signed_area(self) -> float:
+        return signed_area(self.get_vertices())
+
+    def compute_area(self) -> float:
+        return abs(self.compute_signed_area())
+
+    def compute_inner_angles(self) -> list:
+        return list(self._cached_metric("inner_angles", self._calculate_inner_angles))
+
+    def _calculate_inner_angles(self) -> list:
+        coords = self.get_vertices()
+        orientation = 1 if self.compute_signed_area() >= 0 else -1
+        angles = []
+        for index, (x_coord, y_coord) in enumerate(coords):
+            previous_x, previous_y = coords[index - 1]
+            next_x, next_y = coords[(index + 1) % len(coords)]
+            incoming_x, incoming_y = x_coord - previous_x, y_coord - previous_y
+            outgoing_x, outgoing_y = next_x - x_coord, next_y - y_coord
+            turn = degrees(atan2(incoming_x * outgoing_y - incoming_y * outgoing_x,
+                                 incoming_x * outgoing_x + incoming_y * outgoing_y))
+            angles.append(180.0 - orientation * turn)
+        return angles
+
+    def is_convex(self) -> bool:
+        return self._cached_metric("is_convex", self._calculate_is_convex)
+
+    def _calculate_is_convex(self) -> bool:
+        coords = self.get_vertices()
+        if len(coords) < 3:
+            return False
+        sign = 0
+        total_turn = 0.0
+        for index, (x_coord, y_coord) in enumerate(coords):
+            previous_x, previous_y = coords[index - 1]
+            next_x, next_y = coords[(index + 1) % len(coords)]
+            incoming_x, incoming_y = x_coord - previous_x, y_coord - previous_y
+            outgoing_x, outgoing_y = next_x - x_coord, next_y - y_coord
+            cross = incoming_x * outgoing_y - incoming_y * outgoing_x
+            if cross:
+                if sign and (cross > 0) != (sign > 0):
+                    return False
+                sign = 1 if cross > 0 else -1
+            total_turn += atan2(cross, incoming_x * outgoing_x + incoming_y * outgoing_y)
+        # Turning exactly once around rules out self-intersecting stars whose turns share a sign
+        return sign != 0 and abs(abs(total_turn) - 2 * pi) < 1e-6
+
+    def is_simple(self) -> bool:
+        """True when edges only meet their two neighbours, at the shared vertex"""
+        return self._cached_metric("is_simple", self._calculate_is_simple)
+
+    def _calculate_is_simple(self) -> bool:
+        coords = self.get_vertices()
+        count = len(coords)
+        if count < 3 or len(set(coords)) < count:
+            return False
+        for index, (x_coord, y_coord) in enumerate(coords):
+            previous_x, previous_y = coords[index - 1]
+            next_x, next_y = coords[(index + 1) % count]
+            incoming_x, incoming_y = x_coord - previous_x, y_coord - previous_y
+            outgoing_x, outgoing_y = next_x - x_coord, next_y - y_coord
+            # Neighbours also overlap when the boundary doubles back along the same line
+            if incoming_x * outgoing_y == incoming_y * outgoing_x \
+                    and incoming_x * outgoing_x + incoming_y * outgoing_y < 0:
+                return False
+        return not _ring_touches(coords)
+
+    def contains_point(self, point: Point) -> bool:
+        """Even-odd test, points on the border count as inside"""
+        coords = self.get_vertices()
+        inside = False
+        previous_x, previous_y = coords[-1]
+        for x_coord, y_coord in coords:
+            cross = (x_coord - previous_x) * (point.y - previous_y) - (y_coord - previous_y) * (point.x - previous_x)
+            if cross == 0 and min(previous_x, x_coord) <= point.x <= max(previous_x, x_coord) \
+                    and min(previous_y, y_coord) <= point.y <= max(previous_y, y_coord):
+                return True
+            if (y_coord > point.y) != (previous_y > point.y):
+                if point.x < x_coord + (point.y - y_coord) * (previous_x - x_coord) / (previous_y - y_coord):
+                    inside = not inside
+            previous_x, previous_y = x_coord, y_coord
+        return inside
+
+    def triangulate(self) -> list:
+        """Split the polygon into Triangle instances
+
+        Convex polygons use a fan in O(n). Other simple polygons use ear clipping where only
+        reflex vertices, bucketed in a grid, are tested against each candidate ear. Raises
+        ValueError when is_simple() is False.
+        """
+        vertices = self._vertex_list
+        if len(vertices) < 3:
+            return []
+        if self.is_convex():
+            return [_make_triangle(vertices[0], vertices[index], vertices[index + 1])
+                    for index in range(1, len(vertices) - 1)]
+        if not self.is_simple():
+            raise ValueError("Polygon is not simple, it cannot be triangulated")
+        return [_make_triangle(vertices[first], vertices[second], vertices[third])
+                for first, second, third in _ear_clip(self.get_vertices(), self.compute_signed_area() < 0)]
+
+
+def signed_area(coords: list) -> float:
+    """Shoelace area of (x, y) vertices, positive for counter-clockwise order"""
+    twice_area = 0.0
+    previous_x, previous_y = coords[-1]
+    for x_coord, y_coord in coords:
+        twice_area += previous_x * y_coord - x_coord * previous_y
+        previous_x, previous_y = x_coord, y_coord
+    return twice_area / 2
+
+
+def _make_triangle(first: Point, second: Point, third: Point) -> Triangle:
+    triangle = Triangle()
+    triangle.set_vertices([first, second, third])
+    return triangle
+
+
+def _ear_clip(coords: list, clockwise: bool) -> list:
+    """Ear clipping over a simple polygon, returns index triples in the original winding"""
+    count = len(coords)
+    order = list(range(count - 1, -1, -1)) if clockwise else list(range(count))
+    xs = [coords[index][0] for index in order]
+    ys = [coords[index][1] for index in order]
+    previous = [index - 1 for index in range(count)]
+    previous[0] = count - 1
+    following = [index + 1 for index in range(count)]
+    following[-1] = 0
+
+    def cross_at(index: int) -> float:
+        before, after = previous[index], following[index]
+        return (xs[index] - xs[before]) * (ys[after] - ys[index]) - (ys[index] - ys[before]) * (xs[after] - xs[index])
+
+    # Reflex vertices bucketed in a grid, only they can lie inside a candidate ear
+    cell_size = max(max(xs) - min(xs), max(ys) - min(ys), 1e-12) / max(1.0, sqrt(count))
+    grid = {}
+    reflex = set()
+    for index in range(count):
+        if cross_at(index) < 0:
+            reflex.add(index)
+            grid.setdefault((floor(xs[index] / cell_size), floor(ys[index] / cell_size)), set()).add(index)
+
+    def blocks_ear(before: int, index: int, after: int) -> bool:
+        ax, ay, bx, by, cx, cy = xs[before], ys[before], xs[index], ys[index], xs[after], ys[after]
+        min_x, max_x, min_y, max_y = min(ax, bx, cx), max(ax, bx, cx), min(ay, by, cy), max(ay, by, cy)
+        columns = range(floor(min_x / cell_size), floor(max_x / cell_size) + 1)
+        rows = range(floor(min_y / cell_size), floor(max_y / cell_size) + 1)
+        if len(columns) * len(rows) > len(reflex):
+            # Large ears cover more cells than there are reflex vertices left, scan those instead
+            nearby = reflex
+        else:
+            nearby = [other for cell_x in columns for cell_y in rows for other in grid.get((cell_x, cell_y), ())]
+        for other in nearby:
+            px, py = xs[other], ys[other]
+            if px < min_x or px > max_x or py < min_y or py > max_y or other in (before, index, after):
+                continue
+            if (px, py) in ((ax, ay), (bx, by), (cx, cy)):
+                continue
+            if (bx - ax) * (py - ay) - (by - ay) * (px - ax) >= 0 \
+                    and (cx - bx) * (py - by) - (cy - by) * (px - bx) >= 0 \
+                    and (ax - cx) * (py - cy) - (ay - cy) * (px - cx) >= 0:
+                return True
+        return False
+
+    def drop_reflex(index: int):
+        if index in reflex and cross_at(index) >= 0:
+            reflex.discard(index)
+            grid[(floor(xs[index] / cell_size), floor(ys[index] / cell_size))].discard(index)
+
+    # Walk around the ring clipping ears as they come, skipping past each clipped ear keeps
+    # the triangles from fanning out of one vertex and growing across the whole polygon
+    triangles = []
+    remaining = count
+    index = stop = 0
+    while remaining > 3:
+        before, after = previous[index], following[index]
+        cross = cross_at(index)
+        if cross == 0 or cross > 0 and not blocks_ear(before, index, after):
+            if cross > 0:
+                triangles.append((before, index, after))
+            # A collinear vertex is dropped without emitting an empty triangle
+            reflex.discard(index)
+            following[before] = after
+            previous[after] = before
+            remaining -= 1
+            drop_reflex(before)
+            drop_reflex(after)
+            index = stop = following[after]
+            continue
+        index = after
+        if index == stop:
+            raise ValueError("Polygon is not simple, it cannot be triangulated")
+    last = following[index]
+    if cross_at(last):
+        triangles.append((previous[last], last, following[last]))
+
+    if clockwise:
+        # Map back to the caller's indices, keeping each triangle in the polygon's own winding
+        return [(order[third], order[second], order[first]) for first, second, third in triangles]
+    return triangles
+
+
+STATUS_BLOCK = 256
+
+
+def _ring_touches(coords: list) -> bool:
+    """Shamos–Hoey sweep, True when two edges of the ring that aren't neighbours share a point
+
+    Vertices must be distinct. The sweep visits them left to right, keeping the edges that
+    cross the sweep line ordered bottom to top in blocks of at most 2 * STATUS_BLOCK edges.
+    Until the first contact that order never changes, so only edges that become adjacent
+    are tested and the whole check is O(n log n) even when most edges overlap in x.
+    """
+    count = len(coords)
+    # Edge i runs from vertex i to vertex i + 1, stored with its lexicographically smaller end first
+    left_x, left_y, right_x, right_y = [0.0] * count, [0.0] * count, [0.0] * count, [0.0] * count
+    for index in range(count):
+        first, second = coords[index], coords[(index + 1) % count]
+        if second < first:
+            first, second = second, first
+        left_x[index], left_y[index] = first
+        right_x[index], right_y[index] = second
+    blocks = [[]]
+
+    def side(edge: int, x_coord, y_coord):
+        """Positive when the point is above the edge's line"""
+        return (right_x[edge] - left_x[edge]) * (y_coord - left_y[edge]) \
+            - (right_y[edge] - left_y[edge]) * (x_coord - left_x[edge])
+
+    def locate(x_coord, y_coord) -> tuple:
+        """(block, index) of the first edge the point is not strictly above"""
+        low, high = 0, len(blocks) - 1
+        while low < high:
+            middle = (low + high) // 2
+            edge = blocks[middle][-1]
+            if (right_x[edge] - left_x[edge]) * (y_coord - left_y[edge]) \
+                    > (right_y[edge] - left_y[edge]) * (x_coord - left_x[edge]):
+                low = middle + 1
+            else:
+                high = middle
+        block = blocks[low]
+        start, stop = 0, len(block)
+        while start < stop:
+            middle = (start + stop) // 2
+            edge = block[middle]
+            # Same test as side(edge, x_coord, y_coord) > 0, inlined for the hot loop
+            if (right_x[edge] - left_x[edge]) * (y_coord - left_y[edge]) \
+                    > (right_y[edge] - left_y[edge]) * (x_coord - left_x[edge]):
+                start = middle + 1
+            else:
+                stop = middle
+        return low, start
+
+    def at(block: int, index: int) -> int:
+        if index < len(blocks[block]):
+            return blocks[block][index]
+        return blocks[block + 1][0] if block + 1 < len(blocks) else -1
+
+    def before(block: int, index: int) -> int:
+        if index:
+            return blocks[block][index - 1]
+        return blocks[block - 1][-1] if block else -1
+
+    def remove(block: int, index: int):
+        if index == len(blocks[block]):
+            block, index = block + 1, 0
+        del blocks[block][index]
+        if not blocks[block] and len(blocks) > 1:
+            del blocks[block]
+
+    def meet(first: int, second: int) -> bool:
+        if first < 0 or second < 0 or (first - second) % count in (1, count - 1):
+            return False
+        # Bounding boxes first, they also settle collinear pairs
+        if left_x[first] > right_x[second] or left_x[second] > right_x[first] \
+                or min(left_y[first], right_y[first]) > max(left_y[second], right_y[second]) \
+                or min(left_y[second], right_y[second]) > max(left_y[first], right_y[first]):
+            return False
+        start, end = side(first, left_x[second], left_y[second]), side(first, right_x[second], right_y[second])
+        if (start > 0 and end > 0) or (start < 0 and end < 0):
+            return False
+        start, end = side(second, left_x[first], left_y[first]), side(second, right_x[first], right_y[first])
+        return not ((start > 0 and end > 0) or (start < 0 and end < 0))
+
+    for vertex in sorted(range(count), key=coords.__getitem__):
+        x_coord, y_coord = coords[vertex]
+        incoming, outgoing = vertex - 1 if vertex else count - 1, vertex
+        incoming_starts = left_x[incoming] == x_coord and left_y[incoming] == y_coord
+        outgoing_starts = left_x[outgoing] == x_coord and left_y[outgoing] == y_coord
+        block, index = locate(x_coord, y_coord)
+        if not incoming_starts and not outgoing_starts:
+            # Both edges end here, they must be the only edges through the vertex
+            if at(block, index) not in (incoming, outgoing):
+                return True
+            remove(block, index)
+            block, index = locate(x_coord, y_coord)
+            if at(block, index) not in (incoming, outgoing):
+                return True
+            remove(block, index)
+            block, index = locate(x_coord, y_coord)
+            if meet(before(block, index), at(block, index)):
+                return True
+        elif incoming_starts != outgoing_starts:
+            # One edge ends and the other takes its place in the status
+            starting, ending = (incoming, outgoing) if incoming_starts else (outgoing, incoming)
+            if at(block, index) != ending:
+                return True
+            if index == len(blocks[block]):
+                block, index = block + 1, 0
+            blocks[block][index] = starting
+            following = at(block, index + 1)
+            if following >= 0 and side(following, x_coord, y_coord) == 0:
+                return True
+            if meet(before(block, index), starting) or meet(starting, following):
+                return True
+        else:
+            following = at(block, index)
+            if following >= 0 and side(following, x_coord, y_coord) == 0:
+                return True
+            # Both edges start here, the one turning clockwise from the other goes below it
+            lower, upper = incoming, outgoing
+            if side(incoming, right_x[outgoing], right_y[outgoing]) < 0:
+                lower, upper = outgoing, incoming
+            if meet(before(block, index), lower) or meet(upper, following):
+                return True
+            blocks[block][index:index] = [lower, upper]
+            if len(blocks[block]) > 2 * STATUS_BLOCK:
+                blocks[block:block + 1] = [blocks[block][:STATUS_BLOCK], blocks[block][STATUS_BLOCK:]]
+    return False
+
+
 # Testing and demonstration
 if __name__ == "__main__":
     
@@ -299,4 +799,121 @@ if __name__ == "__main__":
     for edge in edges:
         print(f"  {edge['edge_name']}: {round(edge['edge_length'], 2)}")
     print("All sides different (Scalene confirmed):", 
-          len(set(round(edge['edge_length'], 2) for edge in edges)) == 3)
\ No newline at end of file
+          len(set(round(edge['edge_length'], 2) for edge in edges)) == 3)
+    print()
+
+    # Edge cache demonstration
+    print("=== Edge Cache Testing ===")
+    for _ in range(1000):
+        my_scalene.compute_area()
+        my_scalene.compute_perimeter()
+        my_scalene.get_edges()
+    print("Cache stats:", my_scalene.get_cache_stats())
+    caller_vertices = [Point(0, 0), Point(8, 0), Point(2, 5)]
+    my_scalene.set_vertices(caller_vertices)
+    print("Area after set_vertices:", round(my_scalene.compute_area(), 3))
+    caller_vertices[2] = Point(2, 50)
+    print("Area after changing the caller's list:", round(my_scalene.compute_area(), 3))
+    print("Cache stats:", my_scalene.get_cache_stats())
+    print()
+
+    # Fast path check against the law of cosines on random and near-degenerate triangles
+    print("=== Triangle Fast Path Testing ===")
+    import random
+    from math import acos, cos, sin, radians
+    from time import perf_counter
+
+    def law_of_cosines(triangle):
+        lengths = [edge["edge_length"] for edge in triangle.get_edges()]
+        length_a, length_b, length_c = lengths
+        cosines = [(length_c**2 + length_b**2 - length_a**2) / (2 * length_c * length_b),
+                   (length_c**2 + length_a**2 - length_b**2) / (2 * length_c * length_a),
+                   (length_b**2 + length_a**2 - length_c**2) / (2 * length_b * length_a)]
+        angles = [degrees(acos(cosine)) for cosine in cosines]
+        return 0.5 * length_a * length_b * sin(radians(angles[2])), angles
+
+    random.seed(0)
+    mismatches = 0
+    for _ in range(10_000):
+        checked = Triangle()
+        checked.set_vertices([Point(random.uniform(-50, 50), random.uniform(-50, 50)) for _ in range(3)])
+        expected_area, expected_angles = law_of_cosines(checked)
+        area_ok = abs(checked.compute_area() - expected_area) <= 1e-9 * max(1.0, expected_area)
+        angles_ok = all(abs(angle - expected) <= 1e-6 for angle, expected in
+                        zip(checked.compute_inner_angles(), expected_angles))
+        sum_ok = abs(sum(checked.compute_inner_angles()) - 180) <= 1e-9
+        mismatches += not (area_ok and angles_ok and sum_ok)
+    print("Random triangles differing from the law of cosines:", mismatches)
+    assert mismatches == 0, f"{mismatches} random triangles differ from the law of cosines"
+
+    flat = Triangle()
+    flat.set_vertices([Point(0, 0), Point(1, 1e-17), Point(3, 3e-17)])
+    flat_area, flat_angles = flat.compute_area(), flat.compute_inner_angles()
+    print("Near-degenerate area:", flat_area, "angles:", flat_angles)
+    assert 0 <= flat_area <= 1e-15, f"near-degenerate area {flat_area}"
+    assert all(0 <= angle <= 180 for angle in flat_angles) and abs(sum(flat_angles) - 180) <= 1e-9, \
+        f"near-degenerate angles {flat_angles}"
+
+    print("\n=== Triangle Classification ===")
+    for name, vertices in (("equilateral", [Point(0, 0), Point(2, 0), Point(1, 3 ** 0.5)]),
+                           ("right isosceles", [Point(0, 0), Point(3, 0), Point(0, 3)]),
+                           ("isosceles", [Point(0, 0), Point(4, 0), Point(2, 5)]),
+                           ("3-4-5", [Point(0, 0), Point(4, 0), Point(0, 3)]),
+                           ("scalene", [Point(0, 0), Point(6, 0), Point(2, 4)]),
+                           ("collinear", [Point(0, 0), Point(1, 1), Point(2, 2)])):
+        triangle_class = classify_triangle(vertices)
+        print(f"{name}: {triangle_class.__name__ if triangle_class else None}")
+
+    print("\n=== Polygon Testing ===")
+    arrow = Polygon()
+    arrow.set_vertices([Point(0, 0), Point(4, 0), Point(4, 4), Point(2, 1), Point(0, 4)])
+    print("Vertices:", arrow.get_vertices())
+    print("Area:", arrow.compute_area(), "Perimeter:", arrow.compute_perimeter())
+    print("Inner angles:", arrow.compute_inner_angles())
+    print("Convex:", arrow.is_convex(), "Simple:", arrow.is_simple())
+    print("Contains (1, 1):", arrow.contains_point(Point(1, 1)), "Contains (2, 2):", arrow.contains_point(Point(2, 2)))
+    print("Triangles:", [triangle.get_vertices() for triangle in arrow.triangulate()])
+    bowtie = Polygon()
+    bowtie.set_vertices([Point(0, 0), Point(4, 4), Point(4, 0), Point(0, 4)])
+    try:
+        bowtie.triangulate()
+    except ValueError as error:
+        print("Bowtie:", error)
+
+    vertex_count = 100_000
+    wavy = Polygon()
+    wavy_points = []
+    for index in range(vertex_count):
+        angle = 2 * pi * index / vertex_count
+        radius = 1 + 0.3 * sin(40 * angle) + 0.002 * random.random()
+        wavy_points.append(Point(radius * cos(angle), radius * sin(angle)))
+    wavy.set_vertices(wavy_points)
+    start = perf_counter()
+    area, perimeter, convex = wavy.compute_area(), wavy.compute_perimeter(), wavy.is_convex()
+    print(f"{vertex_count:,} vertices: area {area:.6f}, perimeter {perimeter:.6f}, convex {convex} "
+          f"in {(perf_counter() - start) * 1e3:.1f} ms")
+    start = perf_counter()
+    simple = wavy.is_simple()
+    print(f"Simple {simple} in {(perf_counter() - start) * 1e3:.1f} ms")
+    start = perf_counter()
+    pieces = wavy.triangulate()
+    print(f"Triangulated into {len(pieces):,} triangles in {perf_counter() - start:.2f}s, "
+          f"area {sum(piece.compute_area() for piece in pieces):.6f}")
+    # Long teeth that all overlap in x, the worst case for a sweep that only pairs x ranges
+    sawtooth = Polygon()
+    sawtooth_points = []
+    for index in range(vertex_count // 2):
+        sawtooth_points += [Point(0, index), Point(1, index + 0.5)]
+    sawtooth.set_vertices(sawtooth_points + [Point(2, vertex_count // 2), Point(2, -1), Point(0, -1)])
+    start = perf_counter()
+    simple = sawtooth.is_simple()
+    simple_time = perf_counter() - start
+    start = perf_counter()
+    pieces = sawtooth.triangulate()
+    print(f"Sawtooth of {len(sawtooth_points) + 3:,} vertices: simple {simple} in {simple_time:.2f}s, "
+          f"ear clipping {perf_counter() - start:.2f}s, area {sum(piece.compute_area() for piece in pieces):.1f}")
+    sawtooth_points[vertex_count // 2] = Point(-0.5, vertex_count // 4 + 10)
+    sawtooth.set_vertices(sawtooth_points + [Point(2, vertex_count // 2), Point(2, -1), Point(0, -1)])
+    start = perf_counter()
+    print(f"With one tooth pulled across its neighbours: simple {sawtooth.is_simple()} "
+          f"in {(perf_counter() - start) * 1e3:.1f} ms")
@@ -0,0 +1,212 @@
+"""Opt-in timing and call counting for the shape, line, order and payment hot paths
+
+Nothing is wrapped until enable() is called, and disable() puts the original methods back,
+so the disabled cost is zero.
+
+    import instrumentation
+    instrumentation.enable()
+    ...
+    print(instrumentation.to_prometheus())
+"""
+import functools
+import inspect
+import random
+import tracemalloc
+from time import perf_counter
+
+SAMPLE_SIZE = 2048
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class MethodStats:
+    """Call count, cumulative latency, a bounded latency sample and allocated bytes of one method"""
+
+    def __init__(self, sample_size: int = SAMPLE_SIZE):
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.allocated_bytes = 0
+        self.samples = []
+        self._sample_size = sample_size
+        self._random = random.Random(0)
+
+    def record(self, elapsed: float, allocated: int = 0):
+        self.calls += 1
+        self.total_seconds += elapsed
+        self.allocated_bytes += allocated
+        if len(self.samples) < self._sample_size:
+            self.samples.append(elapsed)
+        else:
+            # Reservoir sampling keeps a uniform sample of every call seen so far
+            slot = self._random.randrange(self.calls)
+            if slot < self._sample_size:
+                self.samples[slot] = elapsed
+
+    def quantile(self, fraction: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def default_targets() -> list:
+    """(class, method name) pairs instrumented by enable() when no targets are given"""
+    import exercise_2
+    import primitives
+    import restaurant_revisted
+
+    targets = []
+    shape_classes = [value for value in vars(exercise_2).values()
+                     if isinstance(value, type) and issubclass(value, exercise_2.Shape)]
+    for cls in shape_classes + [primitives.Line]:
+        targets.extend((cls, name) for name in vars(cls) if name.startswith("compute_"))
+    targets.extend([(restaurant_revisted.Order, "total"), (restaurant_revisted.Order, "apply_discount")])
+    for cls in (restaurant_revisted.MedioPago, restaurant_revisted.Tarjeta, restaurant_revisted.Efectivo):
+        targets.extend((cls, name) for name in ("pagar", "pagar_async") if name in vars(cls))
+    return targets
+
+
+class Instrumentation:
+    def __init__(self, sample_size: int = SAMPLE_SIZE):
+        self.sample_size = sample_size
+        self.stats = {}
+        self._originals = []
+        self._track_allocations = False
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._originals)
+
+    def enable(self, targets: list = None, track_allocations: bool = False):
+        """Wrap each (class, method name) target, allocation tracking uses tracemalloc and is slow"""
+        if self.enabled:
+            raise RuntimeError("Instrumentation is already enabled")
+        self._track_allocations = track_allocations
+        if track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        for cls, name in targets if targets is not None else default_targets():
+            original = vars(cls)[name]
+            self._originals.append((cls, name, original))
+            setattr(cls, name, self._wrap(f"{cls.__name__}.{name}", original))
+
+    def disable(self):
+        for cls, name, original in reversed(self._originals):
+            setattr(cls, name, original)
+        self._originals = []
+        if self._track_allocations and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._track_allocations = False
+
+    def reset(self):
+        self.stats = {}
+
+    def _stats_for(self, metric: str) -> MethodStats:
+        stats = self.stats.get(metric)
+        if stats is None:
+            stats = self.stats[metric] = MethodStats(self.sample_size)
+        return stats
+
+    def _wrap(self, metric: str, function):
+        stats = self._stats_for(metric)
+        track_allocations = self._track_allocations
+
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def timed_coroutine(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    return await function(*args, **kwargs)
+                finally:
+                    stats.record(perf_counter() - start)
+            return timed_coroutine
+
+        if track_allocations:
+            @functools.wraps(function)
+            def timed_with_allocations(*args, **kwargs):
+                before = tracemalloc.get_traced_memory()[0]
+                start = perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    elapsed = perf_counter() - start
+                    stats.record(elapsed, max(0, tracemalloc.get_traced_memory()[0] - before))
+            return timed_with_allocations
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                stats.record(perf_counter() - start)
+        return timed
+
+    def snapshot(self) -> dict:
+        snapshot = {}
+        for metric, stats in sorted(self.stats.items()):
+            if not stats.calls:
+                continue
+            entry = {
+                "calls": stats.calls,
+                "total_seconds": stats.total_seconds,
+                "mean_seconds": stats.total_seconds / stats.calls,
+                "allocated_bytes": stats.allocated_bytes
+            }
+            for fraction in QUANTILES:
+                entry[f"p{round(fraction * 100)}_seconds"] = stats.quantile(fraction)
+            snapshot[metric] = entry
+        return snapshot
+
+    def to_prometheus(self, prefix: str = "reto4") -> str:
+        """Render the current stats in the Prometheus text exposition format"""
+        calls = [f"# HELP {prefix}_calls_total Calls to an instrumented method",
+                 f"# TYPE {prefix}_calls_total counter"]
+        latency = [f"# HELP {prefix}_latency_seconds Latency of an instrumented method",
+                   f"# TYPE {prefix}_latency_seconds summary"]
+        allocated = [f"# HELP {prefix}_allocated_bytes_total Bytes still allocated when the method returned",
+                     f"# TYPE {prefix}_allocated_bytes_total counter"]
+        for metric, stats in sorted(self.stats.items()):
+            if not stats.calls:
+                continue
+            label = f'method="{metric}"'
+            calls.append(f"{prefix}_calls_total{{{label}}} {stats.calls}")
+            for fraction in QUANTILES:
+                latency.append(f'{prefix}_latency_seconds{{{label},quantile="{fraction}"}} {stats.quantile(fraction):.9f}')
+            latency.append(f"{prefix}_latency_seconds_sum{{{label}}} {stats.total_seconds:.9f}")
+            latency.append(f"{prefix}_latency_seconds_count{{{label}}} {stats.calls}")
+            allocated.append(f"{prefix}_allocated_bytes_total{{{label}}} {stats.allocated_bytes}")
+        return "\n".join(calls + latency + allocated) + "\n"
+
+
+default = Instrumentation()
+enable = default.enable
+disable = default.disable
+reset = default.reset
+snapshot = default.snapshot
+to_prometheus = default.to_prometheus
+
+
+# Testing and demonstration
+if __name__ == "__main__":
+    from exercise_2 import Point, Rectangle, Triangle
+    import restaurant_revisted as restaurant
+
+    enable(track_allocations=True)
+    rectangle = Rectangle()
+    rectangle.set_vertices([Point(1, 3), Point(5, 3), Point(5, 1), Point(1, 1)])
+    triangle = Triangle()
+    for index in range(200):
+        triangle.set_vertices([Point(0, 0), Point(6 + index, 0), Point(2, 4)])
+        rectangle.compute_area()
+        triangle.compute_area()
+        triangle.compute_perimeter()
+    order = restaurant.Order()
+    order.add(restaurant.coca_cola, 2)
+    order.add(restaurant.beef, 1)
+    restaurant.Efectivo(50000).pagar(order.apply_discount())
+    disable()
+
+    for metric, entry in snapshot().items():
+        print(f"{metric:<28} calls={entry['calls']:<5} p50={entry['p50_seconds'] * 1e6:.2f}us "
+              f"p99={entry['p99_seconds'] * 1e6:.2f}us allocated={entry['allocated_bytes']}B")
+    print()
+    print(to_prometheus())
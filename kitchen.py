@@ -0,0 +1,295 @@
+import heapq
+import random
+from collections import deque
+from math import inf
+
+from restaurant_revisted import Beverage, Appetizer, MainCourse, Order
+
+
+# Minutos de preparación de una unidad según el tipo de ítem
+PREP_MINUTES = {Beverage: 1.0, Appetizer: 5.0, MainCourse: 12.0}
+DEFAULT_PREP_MINUTES = 5.0
+# Cada unidad adicional de la misma línea suma esta fracción del tiempo base
+EXTRA_UNIT_FACTOR = 0.25
+
+
+def preparation_time(order: Order) -> float:
+    """Minutos que una estación tarda en preparar el pedido completo"""
+    minutes = 0.0
+    for item, quantity in order.items:
+        base = DEFAULT_PREP_MINUTES
+        for cls in type(item).__mro__:
+            if cls in PREP_MINUTES:
+                base = PREP_MINUTES[cls]
+                break
+        minutes += base * (1 + EXTRA_UNIT_FACTOR * (quantity - 1))
+    return minutes
+
+
+class KitchenTicket:
+    def __init__(self, ticket_id: int, order: Order, priority: int, prep_time: float, arrival: float):
+        self.ticket_id = ticket_id
+        self.order = order
+        self.priority = priority
+        self.prep_time = prep_time
+        self.arrival = arrival
+        self.start = None
+        self.finish = None
+        self.station = None
+
+    @property
+    def wait_time(self) -> float:
+        return self.start - self.arrival if self.start is not None else None
+
+    def __repr__(self):
+        return (f"KitchenTicket(ticket_id={self.ticket_id!r}, priority={self.priority!r}, "
+                f"prep_time={self.prep_time!r}, arrival={self.arrival!r}, start={self.start!r}, "
+                f"station={self.station!r})")
+
+
+class KitchenMetrics:
+    """Profundidad de la cola, espera y throughput, actualizados en cada operación"""
+
+    def __init__(self, window: float = 60.0, sample_size: int = 4096, seed: int = 0):
+        self.window = window
+        self.depth = 0
+        self.max_depth = 0
+        self.enqueued = 0
+        self.started = 0
+        self.completed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.first_arrival = None
+        self.last_finish = None
+        self._wait_sample = []
+        self._sample_size = sample_size
+        self._random = random.Random(seed)
+        self._recent_finishes = deque()
+
+    def record_enqueue(self, now: float):
+        self.enqueued += 1
+        self.depth += 1
+        self.max_depth = max(self.max_depth, self.depth)
+        if self.first_arrival is None:
+            self.first_arrival = now
+
+    def record_start(self, wait: float):
+        self.started += 1
+        self.depth -= 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        if len(self._wait_sample) < self._sample_size:
+            self._wait_sample.append(wait)
+        else:
+            # Muestreo de reservorio: la muestra sigue siendo uniforme sobre todas las esperas
+            slot = self._random.randrange(self.started)
+            if slot < self._sample_size:
+                self._wait_sample[slot] = wait
+
+    def record_finish(self, now: float):
+        self.completed += 1
+        self.last_finish = now
+        self._recent_finishes.append(now)
+        while self._recent_finishes[0] <= now - self.window:
+            self._recent_finishes.popleft()
+
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.started if self.started else 0.0
+
+    def wait_quantile(self, fraction: float) -> float:
+        if not self._wait_sample:
+            return 0.0
+        ordered = sorted(self._wait_sample)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    @property
+    def throughput(self) -> float:
+        """Pedidos terminados por minuto desde la primera llegada"""
+        if self.last_finish is None or self.last_finish <= self.first_arrival:
+            return 0.0
+        return self.completed / (self.last_finish - self.first_arrival)
+
+    @property
+    def recent_throughput(self) -> float:
+        """Pedidos terminados por minuto en la última ventana"""
+        return len(self._recent_finishes) / self.window
+
+    def snapshot(self) -> dict:
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "completed": self.completed,
+            "mean_wait": self.mean_wait,
+            "p50_wait": self.wait_quantile(0.5),
+            "p90_wait": self.wait_quantile(0.9),
+            "max_wait": self.max_wait,
+            "throughput": self.throughput,
+            "recent_throughput": self.recent_throughput
+        }
+
+
+class KitchenQueue:
+    """Cola de pedidos ordenada por fecha objetivo de salida, O(log n) al encolar y desencolar
+
+    La fecha objetivo es llegada + holgura de la prioridad + tiempo de preparación, así los
+    pedidos rápidos y urgentes pasan adelante sin que los largos esperen para siempre.
+    """
+
+    URGENT = 0
+    QUICK = 1
+    NORMAL = 2
+    # Minutos de holgura de cada prioridad
+    PRIORITY_SLACK = {URGENT: 0.0, QUICK: 5.0, NORMAL: 15.0}
+
+    def __init__(self, metrics: KitchenMetrics = None):
+        self.metrics = metrics or KitchenMetrics()
+        self._heap = []
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def priority_of(self, order: Order) -> int:
+        """Pedidos sin plato fuerte van por el carril rápido"""
+        if order.has_main_course():
+            return self.NORMAL
+        return self.QUICK
+
+    def enqueue(self, order: Order, now: float, priority: int = None) -> KitchenTicket:
+        priority = self.priority_of(order) if priority is None else priority
+        if priority not in self.PRIORITY_SLACK:
+            raise ValueError(f"Prioridad desconocida {priority}")
+        ticket = KitchenTicket(self._next_id, order, priority, preparation_time(order), now)
+        due = now + self.PRIORITY_SLACK[priority] + ticket.prep_time
+        heapq.heappush(self._heap, (due, self._next_id, ticket))
+        self._next_id += 1
+        self.metrics.record_enqueue(now)
+        return ticket
+
+    def peek(self) -> KitchenTicket:
+        if not self._heap:
+            raise IndexError("La cola de cocina está vacía")
+        return self._heap[0][2]
+
+    def dequeue(self, now: float, station: int = None) -> KitchenTicket:
+        if not self._heap:
+            raise IndexError("La cola de cocina está vacía")
+        ticket = heapq.heappop(self._heap)[2]
+        ticket.start = now
+        ticket.station = station
+        ticket.finish = now + ticket.prep_time
+        self.metrics.record_start(ticket.wait_time)
+        return ticket
+
+
+class Kitchen:
+    """Estaciones que toman pedidos de una KitchenQueue, simuladas por eventos discretos"""
+
+    def __init__(self, stations: int, queue: KitchenQueue = None):
+        if stations < 1:
+            raise ValueError("Se necesita al menos una estación")
+        self.stations = stations
+        self.queue = queue or KitchenQueue()
+        self.now = 0.0
+        self._idle = list(range(stations - 1, -1, -1))
+        self._busy = []  # (fin, estación, ticket)
+        self.finished = []
+
+    def _dispatch(self):
+        while self._idle and self.queue:
+            station = self._idle.pop()
+            ticket = self.queue.dequeue(self.now, station)
+            heapq.heappush(self._busy, (ticket.finish, station, ticket))
+
+    def advance(self, until: float):
+        """Termina los pedidos listos hasta until y asigna la cola a las estaciones que se liberan"""
+        while self._busy and self._busy[0][0] <= until:
+            finish, station, ticket = heapq.heappop(self._busy)
+            self.now = finish
+            self.queue.metrics.record_finish(finish)
+            self.finished.append(ticket)
+            self._idle.append(station)
+            self._dispatch()
+        if until != inf:
+            self.now = max(self.now, until)
+
+    def submit(self, order: Order, now: float, priority: int = None) -> KitchenTicket:
+        self.advance(now)
+        ticket = self.queue.enqueue(order, now, priority)
+        self._dispatch()
+        return ticket
+
+    def run(self, arrivals) -> KitchenMetrics:
+        """Reproduce (minuto, pedido, prioridad o None) en orden de llegada y vacía la cocina"""
+        for minute, order, priority in arrivals:
+            self.submit(order, minute, priority)
+        self.advance(inf)
+        return self.queue.metrics
+
+
+# Pedidos por hora a lo largo del día, con picos de almuerzo y cena (11:00 a 23:00)
+HOURLY_RATE = (20, 70, 90, 45, 15, 10, 15, 40, 80, 85, 45, 15)
+
+
+def simulate_day(seed: int = 0, hourly_rate: tuple = HOURLY_RATE, menu=None) -> list:
+    """Llegadas de un día como (minuto, pedido, None) con un proceso de Poisson por hora"""
+    if menu is None:
+        from restaurant_revisted import menu
+    items = list(menu)
+    beverages = [item for item in items if isinstance(item, Beverage)]
+    others = [item for item in items if not isinstance(item, Beverage)]
+    rng = random.Random(seed)
+    arrivals = []
+    for hour, rate in enumerate(hourly_rate):
+        minute = 60.0 * hour
+        while rate:
+            minute += rng.expovariate(rate / 60.0)
+            if minute >= 60.0 * (hour + 1):
+                break
+            order = Order()
+            order.add(rng.choice(beverages), rng.randint(1, 4))
+            for _ in range(rng.randint(0, 3)):
+                order.add(rng.choice(others), rng.randint(1, 2))
+            arrivals.append((minute, order, None))
+    return arrivals
+
+
+def stations_needed(arrivals: list, max_p90_wait: float = 10.0, max_stations: int = 50) -> int:
+    """Menor número de estaciones que mantiene el percentil 90 de espera bajo max_p90_wait minutos"""
+    for stations in range(1, max_stations + 1):
+        if Kitchen(stations).run(arrivals).wait_quantile(0.9) <= max_p90_wait:
+            return stations
+    raise ValueError(f"Ni {max_stations} estaciones alcanzan una espera p90 de {max_p90_wait} minutos")
+
+
+# ---------- Ejecución ----------
+if __name__ == "__main__":
+    import sys
+    from time import perf_counter
+
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    arrivals = simulate_day(seed=7)
+    print(f"Pedidos del día: {len(arrivals)}, pico de {max(HOURLY_RATE)} pedidos/hora")
+    print(f"{'estaciones':>10} {'p50 espera':>11} {'p90 espera':>11} {'máx espera':>11} "
+          f"{'máx cola':>9} {'pedidos/h':>10}")
+    needed = stations_needed(arrivals)
+    for stations in range(max(1, needed - 4), needed + 3):
+        metrics = Kitchen(stations).run(arrivals)
+        print(f"{stations:>10} {metrics.wait_quantile(0.5):>10.1f}m {metrics.wait_quantile(0.9):>10.1f}m "
+              f"{metrics.max_wait:>10.1f}m {metrics.max_depth:>9} {metrics.throughput * 60:>10.1f}")
+    print("Estaciones necesarias para una espera p90 de 10 minutos:", needed)
+
+    # Rendimiento de la cola con muchos pedidos en vuelo
+    many = [arrival for day in range(days * 200) for arrival in simulate_day(seed=day)]
+    start = perf_counter()
+    queue = KitchenQueue()
+    for minute, order, priority in many:
+        queue.enqueue(order, minute, priority)
+    last_minute = max(minute for minute, _, _ in many)
+    while queue:
+        queue.dequeue(last_minute)
+    elapsed = perf_counter() - start
+    print(f"{len(many):,} pedidos encolados y desencolados en {elapsed:.2f}s "
+          f"({len(many) / elapsed:,.0f} pedidos/s, cola máxima {queue.metrics.max_depth:,})")
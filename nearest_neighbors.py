@@ -0,0 +1,228 @@
+import heapq
+from math import sqrt
+
+import numpy as np
+
+from shape_batch import PointArray
+
+# Tiles of BLOCK_ROWS x BLOCK_COLUMNS doubles (2 MiB) stay in cache while they are filled
+BLOCK_ROWS = 128
+BLOCK_COLUMNS = 2048
+
+
+def _fill_distances(first: np.ndarray, second: np.ndarray, out: np.ndarray, scratch: np.ndarray):
+    """Write the distances between the rows of first and second into out, one cache-sized tile at a time"""
+    for column in range(0, second.shape[0], BLOCK_COLUMNS):
+        stop = min(column + BLOCK_COLUMNS, second.shape[0])
+        tile = out[:, column:stop]
+        work = scratch[:tile.shape[0], :tile.shape[1]]
+        np.subtract.outer(first[:, 0], second[column:stop, 0], out=tile)
+        np.square(tile, out=tile)
+        np.subtract.outer(first[:, 1], second[column:stop, 1], out=work)
+        np.square(work, out=work)
+        tile += work
+        np.sqrt(tile, out=tile)
+
+
+def iter_distance_blocks(first, second=None, block_rows: int = BLOCK_ROWS):
+    """Yield (row offset, block) pairs covering the first x second distance matrix
+
+    Only one block of block_rows rows is alive at a time, for matrices that don't fit in memory.
+    Accepts PointArrays, (N, 2) arrays or lists of Points, second defaults to first.
+    """
+    first = PointArray.from_any(first).coords
+    second = first if second is None else PointArray.from_any(second).coords
+    scratch = np.empty((block_rows, min(BLOCK_COLUMNS, second.shape[0])))
+    for row in range(0, first.shape[0], block_rows):
+        rows = first[row:row + block_rows]
+        block = np.empty((rows.shape[0], second.shape[0]))
+        _fill_distances(rows, second, block, scratch)
+        yield row, block
+
+
+def distance_matrix(first, second=None) -> np.ndarray:
+    """Every distance between two point sets as an (N, M) array, tiled so temporaries stay cache-sized"""
+    first = PointArray.from_any(first).coords
+    second = first if second is None else PointArray.from_any(second).coords
+    out = np.empty((first.shape[0], second.shape[0]))
+    scratch = np.empty((BLOCK_ROWS, min(BLOCK_COLUMNS, second.shape[0])))
+    for row in range(0, first.shape[0], BLOCK_ROWS):
+        _fill_distances(first[row:row + BLOCK_ROWS], second, out[row:row + BLOCK_ROWS], scratch)
+    return out
+
+
+class KDTree:
+    """Static 2-d tree over Points, a PointArray or an (N, 2) array for k-nearest and radius queries
+
+    Nodes split at the median of their wider axis and keep their bounding box, queries walk the
+    tree in plain Python and return indices into the original input.
+    """
+
+    def __init__(self, points, leaf_size: int = 16):
+        if leaf_size < 1:
+            raise ValueError("leaf_size must be positive")
+        self.coords = PointArray.from_any(points).coords
+        self.leaf_size = leaf_size
+        order = np.arange(self.coords.shape[0])
+        # Per node: [start, stop) range of order, children (-1 for leaves) and bounding box
+        self._start, self._stop, self._left, self._right = [], [], [], []
+        self._min_x, self._min_y, self._max_x, self._max_y = [], [], [], []
+        if self.coords.shape[0]:
+            self._build(order)
+        self._order = order.tolist()
+        self._xs = self.coords[order, 0].tolist()
+        self._ys = self.coords[order, 1].tolist()
+
+    def _new_node(self, order: np.ndarray, start: int, stop: int) -> int:
+        block = self.coords[order[start:stop]]
+        low, high = block.min(axis=0), block.max(axis=0)
+        self._start.append(start)
+        self._stop.append(stop)
+        self._left.append(-1)
+        self._right.append(-1)
+        self._min_x.append(float(low[0]))
+        self._min_y.append(float(low[1]))
+        self._max_x.append(float(high[0]))
+        self._max_y.append(float(high[1]))
+        return len(self._start) - 1
+
+    def _build(self, order: np.ndarray):
+        pending = [self._new_node(order, 0, order.shape[0])]
+        while pending:
+            node = pending.pop()
+            start, stop = self._start[node], self._stop[node]
+            if stop - start <= self.leaf_size:
+                continue
+            axis = 0 if self._max_x[node] - self._min_x[node] >= self._max_y[node] - self._min_y[node] else 1
+            middle = (start + stop) // 2
+            segment = order[start:stop]
+            segment[:] = segment[np.argpartition(self.coords[segment, axis], middle - start)]
+            self._left[node] = self._new_node(order, start, middle)
+            self._right[node] = self._new_node(order, middle, stop)
+            pending.extend((self._left[node], self._right[node]))
+
+    def __len__(self):
+        return self.coords.shape[0]
+
+    def _box_distance_sq(self, node: int, x_coord: float, y_coord: float) -> float:
+        delta_x = max(self._min_x[node] - x_coord, 0.0, x_coord - self._max_x[node])
+        delta_y = max(self._min_y[node] - y_coord, 0.0, y_coord - self._max_y[node])
+        return delta_x * delta_x + delta_y * delta_y
+
+    def query(self, x_coord: float, y_coord: float, k: int = 1) -> list:
+        """The k nearest points as (distance, index) pairs, closest first"""
+        if k < 1 or not self._start:
+            return []
+        xs, ys, left = self._xs, self._ys, self._left
+        best = []  # max-heap of (-squared distance, -position)
+        nodes = [(0.0, 0)]
+        while nodes:
+            box_distance, node = heapq.heappop(nodes)
+            if len(best) == k and box_distance > -best[0][0]:
+                break
+            if left[node] < 0:
+                for position in range(self._start[node], self._stop[node]):
+                    delta_x, delta_y = xs[position] - x_coord, ys[position] - y_coord
+                    distance = delta_x * delta_x + delta_y * delta_y
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance, -position))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, -position))
+                continue
+            for child in (left[node], self._right[node]):
+                child_distance = self._box_distance_sq(child, x_coord, y_coord)
+                if len(best) < k or child_distance <= -best[0][0]:
+                    heapq.heappush(nodes, (child_distance, child))
+        order = self._order
+        return [(sqrt(-distance), order[-position]) for distance, position in sorted(best, reverse=True)]
+
+    def query_radius(self, x_coord: float, y_coord: float, radius: float) -> list:
+        """Indices of every point within radius, inclusive, in no particular order"""
+        if not self._start:
+            return []
+        xs, ys, order, left = self._xs, self._ys, self._order, self._left
+        limit = radius * radius
+        found = []
+        nodes = [0]
+        while nodes:
+            node = nodes.pop()
+            if self._box_distance_sq(node, x_coord, y_coord) > limit:
+                continue
+            far_x = max(x_coord - self._min_x[node], self._max_x[node] - x_coord)
+            far_y = max(y_coord - self._min_y[node], self._max_y[node] - y_coord)
+            if far_x * far_x + far_y * far_y <= limit:
+                # The whole box is inside the circle
+                found.extend(order[self._start[node]:self._stop[node]])
+            elif left[node] < 0:
+                for position in range(self._start[node], self._stop[node]):
+                    delta_x, delta_y = xs[position] - x_coord, ys[position] - y_coord
+                    if delta_x * delta_x + delta_y * delta_y <= limit:
+                        found.append(order[position])
+            else:
+                nodes.extend((left[node], self._right[node]))
+        return found
+
+    def query_many(self, points, k: int = 1) -> tuple:
+        """k nearest neighbors of many points as (distances, indices) arrays of shape (Q, k)"""
+        queries = PointArray.from_any(points).coords
+        k = min(k, len(self))
+        distances = np.empty((queries.shape[0], k))
+        indices = np.empty((queries.shape[0], k), dtype=np.int64)
+        for row, (x_coord, y_coord) in enumerate(queries.tolist()):
+            neighbors = self.query(x_coord, y_coord, k)
+            distances[row] = [distance for distance, _ in neighbors]
+            indices[row] = [index for _, index in neighbors]
+        return distances, indices
+
+
+# Benchmark against the pure-Python compute_distance loop
+if __name__ == "__main__":
+    import random
+    import sys
+    from time import perf_counter
+
+    from exercise_2 import Point
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    random.seed(5)
+    points = [Point(random.uniform(-100, 100), random.uniform(-100, 100)) for _ in range(count)]
+
+    start = perf_counter()
+    loop_matrix = [[first.compute_distance(second) for second in points] for first in points]
+    loop_time = perf_counter() - start
+    start = perf_counter()
+    matrix = distance_matrix(points)
+    matrix_time = perf_counter() - start
+    print(f"{count:,} x {count:,} distances: loop {loop_time:.3f}s, blocked {matrix_time:.3f}s "
+          f"({loop_time / matrix_time:.0f}x), max relative difference "
+          f"{np.max(np.abs(matrix - loop_matrix) / np.maximum(matrix, 1e-300)):.1e}")
+
+    tree_size = count * 100
+    coords = np.random.default_rng(5).uniform(-100, 100, size=(tree_size, 2))
+    start = perf_counter()
+    tree = KDTree(coords)
+    print(f"KDTree over {tree_size:,} points built in {perf_counter() - start:.2f}s")
+    cloud = PointArray(coords).to_points()
+    queries = points[:50]
+    k = 5
+
+    start = perf_counter()
+    loop_neighbors = [sorted(range(tree_size), key=lambda index: query.compute_distance(cloud[index]))[:k]
+                      for query in queries]
+    loop_time = perf_counter() - start
+    start = perf_counter()
+    tree_neighbors = [[index for _, index in tree.query(query.x, query.y, k)] for query in queries]
+    tree_time = perf_counter() - start
+    print(f"{k}-nearest for {len(queries)} queries: loop {loop_time:.3f}s, KDTree {tree_time * 1e3:.2f} ms "
+          f"({loop_time / tree_time:.0f}x), same neighbors: {loop_neighbors == tree_neighbors}")
+
+    radius = 2.0
+    start = perf_counter()
+    loop_within = [sorted(index for index in range(tree_size) if query.compute_distance(cloud[index]) <= radius)
+                   for query in queries]
+    loop_time = perf_counter() - start
+    start = perf_counter()
+    tree_within = [sorted(tree.query_radius(query.x, query.y, radius)) for query in queries]
+    tree_time = perf_counter() - start
+    print(f"Radius {radius} for {len(queries)} queries: loop {loop_time:.3f}s, KDTree {tree_time * 1e3:.2f} ms "
+          f"({loop_time / tree_time:.0f}x), same points: {loop_within == tree_within}")
@@ -0,0 +1,243 @@
+import csv
+import json
+import os
+from time import perf_counter
+
+from restaurant_revisted import Menu, Order
+
+FIELDS = ("order_id", "item", "quantity")
+
+
+class RowError(ValueError):
+    pass
+
+
+class PricedOrder:
+    def __init__(self, order_id, order: Order):
+        self.order_id = order_id
+        self.order = order
+        self.subtotal = order.total()
+        self.total = order.apply_discount()
+
+    def __repr__(self):
+        return f"PricedOrder(order_id={self.order_id!r}, subtotal={self.subtotal!r}, total={self.total!r})"
+
+
+def _detect_format(source) -> str:
+    name = source if isinstance(source, str) else getattr(source, "name", "")
+    return "csv" if str(name).lower().endswith(".csv") else "jsonl"
+
+
+def _undecodable(text: str) -> bool:
+    """True when text read with errors="surrogateescape" held bytes that aren't valid UTF-8"""
+    if text.isascii():
+        return False
+    try:
+        text.encode("utf-8")
+    except UnicodeEncodeError:
+        return True
+    return False
+
+
+def _printable(text: str) -> str:
+    return text.encode("utf-8", "surrogateescape").decode("utf-8", "replace")
+
+
+def _jsonl_rows(lines):
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        if _undecodable(line):
+            yield line_number, _printable(line.rstrip("\n")), RowError("invalid UTF-8")
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as error:
+            yield line_number, line.rstrip("\n"), RowError(f"invalid JSON: {error.msg}")
+            continue
+        if not isinstance(row, dict):
+            yield line_number, line.rstrip("\n"), RowError("row is not a JSON object")
+            continue
+        yield line_number, line.rstrip("\n"), row
+
+
+def _csv_rows(lines):
+    reader = csv.DictReader(lines)
+    for row in reader:
+        # Header is line 1, so data rows start at 2
+        if any(_undecodable(str(value)) for value in row.values()):
+            yield reader.line_num, row, RowError("invalid UTF-8")
+            continue
+        yield reader.line_num, row, row
+
+
+def read_rows(source, fmt: str = None):
+    """Yield (line number, raw row, parsed dict or RowError) one row at a time from a path or open file
+
+    Paths are read with errors="surrogateescape" so a line with bytes that aren't UTF-8 comes out
+    as a RowError instead of ending the stream. Open files should be opened the same way.
+    """
+    fmt = fmt or _detect_format(source)
+    if fmt not in ("csv", "jsonl"):
+        raise ValueError(f"Unknown format {fmt!r}, expected 'csv' or 'jsonl'")
+    parse = _csv_rows if fmt == "csv" else _jsonl_rows
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, newline="", encoding="utf-8", errors="surrogateescape") as lines:
+            yield from parse(lines)
+    else:
+        yield from parse(source)
+
+
+class OrderIngest:
+    """Stream order rows from JSONL or CSV into priced Order objects with bounded memory
+
+    Consecutive rows with the same order_id make up one order. Rows that can't be parsed or
+    that name an item missing from the menu are written as JSON lines to reject_stream and
+    skipped. run() yields lists of at most batch_size PricedOrder results.
+
+    elapsed and rows_per_second only count time spent inside run() reading and pricing rows,
+    not the time the caller spends on each batch before asking for the next one.
+    """
+
+    def __init__(self, menu: Menu, batch_size: int = 1000, reject_stream=None):
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        self.menu = menu
+        self.batch_size = batch_size
+        self.reject_stream = reject_stream
+        self.rows = 0
+        self.rejected = 0
+        self.orders = 0
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def _parse(self, row: dict):
+        missing = [field for field in FIELDS if row.get(field) in (None, "")]
+        if missing:
+            raise RowError(f"missing {', '.join(missing)}")
+        try:
+            item = self.menu.get_by_name(str(row["item"]))
+        except KeyError:
+            raise RowError(f"unknown item {row['item']!r}") from None
+        quantity = row["quantity"]
+        try:
+            if isinstance(quantity, (float, bool)):
+                raise ValueError
+            quantity = int(quantity)
+            # Quantities too large for a float would overflow later in MenuItem.total_price
+            float(quantity)
+        except (TypeError, ValueError, OverflowError):
+            raise RowError(f"invalid quantity {row['quantity']!r}") from None
+        if quantity < 1:
+            raise RowError(f"invalid quantity {quantity}")
+        return str(row["order_id"]), item, quantity
+
+    def _reject(self, line_number: int, raw, reason: str):
+        self.rejected += 1
+        if self.reject_stream is not None:
+            # Undecodable bytes in raw are written as U+FFFD so the reject stream stays valid UTF-8
+            self.reject_stream.write(_printable(json.dumps({"line": line_number, "row": raw, "reason": reason},
+                                                           ensure_ascii=False)) + "\n")
+
+    def run(self, source, fmt: str = None):
+        start = perf_counter()
+        batch = []
+        order_id = None
+        order = None
+        try:
+            for line_number, raw, row in read_rows(source, fmt):
+                self.rows += 1
+                try:
+                    if isinstance(row, RowError):
+                        raise row
+                    row_order_id, item, quantity = self._parse(row)
+                except RowError as error:
+                    self._reject(line_number, raw, str(error))
+                    continue
+                if row_order_id != order_id:
+                    if order is not None:
+                        batch.append(PricedOrder(order_id, order))
+                        self.orders += 1
+                        if len(batch) >= self.batch_size:
+                            self.elapsed += perf_counter() - start
+                            start = None
+                            yield batch
+                            start = perf_counter()
+                            batch = []
+                    order_id = row_order_id
+                    order = Order()
+                    order.order_number = order_id
+                order.add(item, quantity)
+            if order is not None:
+                batch.append(PricedOrder(order_id, order))
+                self.orders += 1
+            if batch:
+                self.elapsed += perf_counter() - start
+                start = None
+                yield batch
+        finally:
+            if start is not None:
+                self.elapsed += perf_counter() - start
+
+
+# ---------- Ejecución ----------
+if __name__ == "__main__":
+    import io
+    import random
+    import sys
+    import tempfile
+    from time import sleep
+
+    import restaurant_revisted as restaurant
+
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    names = [item.get_name() for item in restaurant.menu]
+    random.seed(2)
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "orders.jsonl")
+        # surrogateescape lets the demo write a Latin-1 byte that isn't valid UTF-8
+        with open(path, "w", encoding="utf-8", errors="surrogateescape") as output:
+            written = 0
+            order_number = 0
+            while written < row_count:
+                order_number += 1
+                for _ in range(random.randint(1, 6)):
+                    roll = random.random()
+                    if roll < 0.001:
+                        output.write("{not json\n")
+                    elif roll < 0.00125:
+                        output.write(json.dumps({"order_id": order_number, "item": random.choice(names),
+                                                 "quantity": [2]}, ensure_ascii=False) + "\n")
+                    elif roll < 0.0014:
+                        output.write(json.dumps({"order_id": order_number, "item": random.choice(names),
+                                                 "quantity": 10 ** 400}, ensure_ascii=False) + "\n")
+                    elif roll < 0.0015:
+                        output.write(f'{{"order_id": {order_number}, "item": "Caf\udce9", "quantity": 1}}\n')
+                    elif roll < 0.002:
+                        output.write(json.dumps({"order_id": order_number, "item": "Pizza", "quantity": 1}) + "\n")
+                    else:
+                        output.write(json.dumps({"order_id": order_number, "item": random.choice(names),
+                                                 "quantity": random.randint(1, 4)}, ensure_ascii=False) + "\n")
+                    written += 1
+
+        rejects = io.StringIO()
+        ingest = OrderIngest(restaurant.menu, batch_size=5000, reject_stream=rejects)
+        revenue = 0.0
+        start = perf_counter()
+        for priced_batch in ingest.run(path):
+            revenue += sum(priced.total for priced in priced_batch)
+            sleep(0.001)  # A slow consumer, not counted in rows_per_second
+        wall_time = perf_counter() - start
+
+    print(f"Rows: {ingest.rows:,}, orders: {ingest.orders:,}, rejected: {ingest.rejected:,}")
+    print(f"Throughput: {ingest.rows_per_second:,.0f} rows/s ({ingest.elapsed:.2f}s ingesting, "
+          f"{wall_time:.2f}s with the consumer), revenue: ${revenue:,.2f}")
+    reasons = {}
+    for line in rejects.getvalue().splitlines():
+        reason = " ".join(json.loads(line)["reason"].split()[:2]).rstrip(":")
+        reasons[reason] = reasons.get(reason, 0) + 1
+    print("First reject:", rejects.getvalue().splitlines()[0])
+    print("Rejects by reason:", dict(sorted(reasons.items())))
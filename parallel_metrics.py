@@ -0,0 +1,104 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from shape_batch import ShapeBatch
+
+
+def _attach(name: str, shape: tuple):
+    try:
+        block = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13 attaching registers the block with the resource tracker on POSIX, which
+        # would then unlink it when the worker exits. The parent owns the block, so unregister it.
+        block = shared_memory.SharedMemory(name=name)
+        if os.name == "posix":
+            resource_tracker.unregister(block._name, "shared_memory")
+    return block, np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+
+
+def _compute_shard(coords_name: str, coords_shape: tuple, output_name: str, output_shape: tuple,
+                   start: int, stop: int):
+    """Worker: read one shard of vertices from shared memory and write its metrics back in place"""
+    coords_block, coords = _attach(coords_name, coords_shape)
+    output_block, output = _attach(output_name, output_shape)
+    try:
+        batch = ShapeBatch(coords[start:stop])
+        output[start:stop, 0] = batch.compute_area()
+        output[start:stop, 1] = batch.compute_perimeter()
+        output[start:stop, 2:] = batch.compute_inner_angles()
+        del batch
+    finally:
+        del coords, output
+        coords_block.close()
+        output_block.close()
+    return stop - start
+
+
+def compute_metrics(coords, workers: int = None, shard_size: int = 1_000_000, executor=None) -> dict:
+    """Area, perimeter and inner angles of an (N, k, 2) vertex array or ShapeBatch using a process pool
+
+    Vertices go to the workers through shared memory and each worker writes its shard of the
+    result into a shared output array, so results come back in input order without pickling
+    any Point. Pass an executor to reuse a pool across calls.
+    """
+    coords = coords.coords if isinstance(coords, ShapeBatch) else np.ascontiguousarray(coords, dtype=np.float64)
+    shape_count, vertex_count = coords.shape[0], coords.shape[1]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 and executor is None or shape_count == 0:
+        batch = ShapeBatch(coords)
+        return {"area": batch.compute_area(), "perimeter": batch.compute_perimeter(),
+                "inner_angles": batch.compute_inner_angles()}
+
+    output_shape = (shape_count, 2 + vertex_count)
+    coords_block = shared_memory.SharedMemory(create=True, size=coords.nbytes)
+    output_block = shared_memory.SharedMemory(create=True, size=8 * output_shape[0] * output_shape[1])
+    own_executor = executor is None
+    try:
+        np.ndarray(coords.shape, dtype=np.float64, buffer=coords_block.buf)[:] = coords
+        # At least one shard per worker so every process gets work
+        shard_size = max(1, min(shard_size, -(-shape_count // workers)))
+        executor = executor or ProcessPoolExecutor(max_workers=workers)
+        futures = [executor.submit(_compute_shard, coords_block.name, coords.shape, output_block.name,
+                                   output_shape, start, min(start + shard_size, shape_count))
+                   for start in range(0, shape_count, shard_size)]
+        for future in futures:
+            future.result()
+        output = np.ndarray(output_shape, dtype=np.float64, buffer=output_block.buf).copy()
+    finally:
+        if own_executor and executor is not None:
+            executor.shutdown()
+        coords_block.close()
+        coords_block.unlink()
+        output_block.close()
+        output_block.unlink()
+    return {"area": output[:, 0], "perimeter": output[:, 1], "inner_angles": output[:, 2:]}
+
+
+# Scaling benchmark across worker counts
+if __name__ == "__main__":
+    import sys
+    from time import perf_counter
+
+    shape_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    rng = np.random.default_rng(9)
+    triangles = rng.uniform(-100, 100, size=(shape_count, 3, 2))
+
+    reference = None
+    baseline_time = None
+    print(f"=== {shape_count:,} triangles ===")
+    for workers in range(1, max_workers + 1):
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Warm the pool up so process start-up isn't timed
+            list(pool.map(abs, range(workers)))
+            start = perf_counter()
+            metrics = compute_metrics(triangles, workers=workers, executor=pool if workers > 1 else None)
+            elapsed = perf_counter() - start
+        if reference is None:
+            reference, baseline_time = metrics, elapsed
+        same = all(np.array_equal(metrics[key], reference[key], equal_nan=True) for key in reference)
+        print(f"{workers} worker(s): {elapsed:.2f}s, speedup {baseline_time / elapsed:.2f}x, "
+              f"results identical: {same}")
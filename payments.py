@@ -0,0 +1,140 @@
+import asyncio
+import random
+import uuid
+from time import perf_counter
+
+from restaurant_revisted import MedioPago, ResultadoPago, Tarjeta, Efectivo
+
+
+class ProcesadorTarjeta:
+    """Backend que autoriza cobros con tarjeta
+
+    Un cobro repetido con la misma clave_idempotencia devuelve el resultado original sin volver a cobrar.
+    """
+
+    async def autorizar(self, numero, monto, clave_idempotencia=None) -> ResultadoPago:
+        raise NotImplementedError("Subclases deben implementar autorizar()")
+
+
+class PasarelaFalsa(ProcesadorTarjeta):
+    """Pasarela local para pruebas con latencia, rechazos y fallos de red configurables
+
+    tasa_error falla antes de cobrar; tasa_respuesta_perdida cobra y pierde la respuesta, como un
+    timeout de red después de que el banco ya aprobó. cobros cuenta los cobros aprobados de verdad.
+    """
+
+    def __init__(self, latencia: float = 0.05, variacion: float = 0.0, tasa_rechazo: float = 0.0,
+                 tasa_error: float = 0.0, tasa_respuesta_perdida: float = 0.0, semilla=None):
+        self.latencia = latencia
+        self.variacion = variacion
+        self.tasa_rechazo = tasa_rechazo
+        self.tasa_error = tasa_error
+        self.tasa_respuesta_perdida = tasa_respuesta_perdida
+        self.cobros = 0
+        self._resultados = {}
+        self._azar = random.Random(semilla)
+
+    async def autorizar(self, numero, monto, clave_idempotencia=None) -> ResultadoPago:
+        await asyncio.sleep(max(0.0, self.latencia + self._azar.uniform(-self.variacion, self.variacion)))
+        if self._azar.random() < self.tasa_error:
+            raise ConnectionError("La pasarela no respondió")
+        resultado = self._resultados.get(clave_idempotencia)
+        if resultado is None:
+            if self._azar.random() < self.tasa_rechazo:
+                resultado = ResultadoPago(ResultadoPago.RECHAZADO, monto, mensaje=f"Tarjeta {numero[-4:]} rechazada")
+            else:
+                resultado = ResultadoPago(ResultadoPago.APROBADO, monto, mensaje=f"Pago con tarjeta {numero[-4:]}")
+                self.cobros += 1
+            if clave_idempotencia is not None:
+                self._resultados[clave_idempotencia] = resultado
+        if self._azar.random() < self.tasa_respuesta_perdida:
+            raise ConnectionError("Se perdió la respuesta de la pasarela")
+        return ResultadoPago(resultado.estado, resultado.monto, mensaje=resultado.mensaje)
+
+
+class DespachadorPagos:
+    """Procesa pagos concurrentes con límite de concurrencia, timeout por medio de pago y reintentos
+
+    timeouts asocia una clase de MedioPago con su timeout en segundos. Los rechazos no se
+    reintentan; los timeouts y errores de conexión sí, con espera exponencial entre intentos.
+    Todos los intentos de un pago llevan la misma clave de idempotencia, así un intento que
+    cobró pero no alcanzó a responder no se cobra otra vez al reintentar.
+    """
+
+    def __init__(self, max_concurrencia: int = 100, timeouts: dict = None, timeout_por_defecto: float = 5.0,
+                 reintentos: int = 2, espera_inicial: float = 0.05, factor_espera: float = 2.0):
+        self.max_concurrencia = max_concurrencia
+        self.timeouts = timeouts or {}
+        self.timeout_por_defecto = timeout_por_defecto
+        self.reintentos = reintentos
+        self.espera_inicial = espera_inicial
+        self.factor_espera = factor_espera
+        self._semaforo = asyncio.Semaphore(max_concurrencia)
+        self.estadisticas = {"aprobados": 0, "rechazados": 0, "errores": 0, "reintentos": 0, "latencia_total": 0.0}
+
+    def _timeout_de(self, medio: MedioPago) -> float:
+        for clase in type(medio).__mro__:
+            if clase in self.timeouts:
+                return self.timeouts[clase]
+        return self.timeout_por_defecto
+
+    async def pagar(self, medio: MedioPago, monto) -> ResultadoPago:
+        timeout = self._timeout_de(medio)
+        inicio = perf_counter()
+        clave = uuid.uuid4().hex
+        intento = 0
+        while True:
+            intento += 1
+            try:
+                async with self._semaforo:
+                    resultado = await asyncio.wait_for(medio.pagar_async(monto, clave_idempotencia=clave), timeout)
+                break
+            except (asyncio.TimeoutError, ConnectionError) as error:
+                if intento > self.reintentos:
+                    mensaje = "Tiempo de espera agotado" if isinstance(error, asyncio.TimeoutError) else str(error)
+                    resultado = ResultadoPago(ResultadoPago.ERROR, monto, mensaje=mensaje)
+                    break
+                self.estadisticas["reintentos"] += 1
+                await asyncio.sleep(self.espera_inicial * self.factor_espera ** (intento - 1))
+        resultado.intentos = intento
+        self._registrar(resultado, perf_counter() - inicio)
+        return resultado
+
+    def _registrar(self, resultado: ResultadoPago, latencia: float):
+        clave = {ResultadoPago.APROBADO: "aprobados", ResultadoPago.RECHAZADO: "rechazados"}.get(resultado.estado, "errores")
+        self.estadisticas[clave] += 1
+        self.estadisticas["latencia_total"] += latencia
+
+    async def procesar(self, pagos: list) -> list:
+        """Procesa una lista de (medio, monto) y devuelve los resultados en el mismo orden"""
+        return await asyncio.gather(*(self.pagar(medio, monto) for medio, monto in pagos))
+
+
+# ---------- Ejecución ----------
+if __name__ == "__main__":
+    async def main():
+        pasarela = PasarelaFalsa(latencia=0.02, variacion=0.01, tasa_rechazo=0.02, tasa_error=0.05,
+                                 tasa_respuesta_perdida=0.05, semilla=4)
+        despachador = DespachadorPagos(max_concurrencia=500, timeouts={Tarjeta: 0.5, Efectivo: 0.1},
+                                       reintentos=3, espera_inicial=0.01)
+        pagos = []
+        for numero in range(5000):
+            monto = 10000 + numero
+            if numero % 3:
+                pagos.append((Tarjeta(f"4000000000{numero:06d}", 123, pasarela), monto))
+            else:
+                pagos.append((Efectivo(monto + 500 if numero % 2 else monto - 1), monto))
+
+        inicio = perf_counter()
+        resultados = await despachador.procesar(pagos)
+        duracion = perf_counter() - inicio
+
+        print(resultados[0])
+        print(resultados[1])
+        print(f"{len(resultados)} pagos en {duracion:.2f}s ({len(resultados) / duracion:,.0f} pagos/s)")
+        print("Estadísticas:", despachador.estadisticas)
+        aprobados_tarjeta = sum(resultado.estado == ResultadoPago.APROBADO
+                                for (medio, _), resultado in zip(pagos, resultados) if isinstance(medio, Tarjeta))
+        print(f"Cobros en la pasarela: {pasarela.cobros}, pagos con tarjeta aprobados: {aprobados_tarjeta}")
+
+    asyncio.run(main())
@@ -0,0 +1,247 @@
+from math import atan2, degrees, sqrt
+
+
+class Point:
+    """Immutable 2D point shared by every geometry module"""
+
+    __slots__ = ("x", "y")
+
+    def __init__(self, x: float, y: float):
+        _set_x(self, x)
+        _set_y(self, y)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Point is immutable, create a new Point instead")
+
+    def __delattr__(self, name):
+        raise AttributeError("Point is immutable")
+
+    def __eq__(self, other):
+        if not isinstance(other, Point):
+            return NotImplemented
+        return self.x == other.x and self.y == other.y
+
+    def __hash__(self):
+        return hash((self.x, self.y))
+
+    def __repr__(self):
+        return f"Point({self.x!r}, {self.y!r})"
+
+    def __reduce__(self):
+        return (Point, (self.x, self.y))
+
+    def compute_distance(self, other_point):
+        """Calculate distance to another point"""
+        return sqrt((self.x - other_point.x)**2 + (self.y - other_point.y)**2)
+
+
+_set_x = Point.x.__set__
+_set_y = Point.y.__set__
+
+
+class Line:
+    """Immutable segment between two points, derived values are computed on first access"""
+
+    __slots__ = ("start_point", "end_point", "_length", "_slope", "_slope_radians", "_points")
+
+    def __init__(self, start_point: Point, end_point: Point):
+        _set_start(self, start_point)
+        _set_end(self, end_point)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Line is immutable, create a new Line instead")
+
+    def __delattr__(self, name):
+        raise AttributeError("Line is immutable")
+
+    def __eq__(self, other):
+        if not isinstance(other, Line):
+            return NotImplemented
+        return self.start_point == other.start_point and self.end_point == other.end_point
+
+    def __hash__(self):
+        return hash((self.start_point, self.end_point))
+
+    def __repr__(self):
+        return f"Line({self.start_point!r}, {self.end_point!r})"
+
+    def __reduce__(self):
+        return (Line, (self.start_point, self.end_point))
+
+    @property
+    def start(self) -> Point:
+        return self.start_point
+
+    @property
+    def end(self) -> Point:
+        return self.end_point
+
+    @property
+    def length(self) -> float:
+        # Unset slots raise AttributeError, which marks a value that was never computed
+        try:
+            return self._length
+        except AttributeError:
+            dx = self.end_point.x - self.start_point.x
+            dy = self.end_point.y - self.start_point.y
+            _set_length(self, sqrt(dx**2 + dy**2))
+            return self._length
+
+    @property
+    def slope(self) -> float:
+        try:
+            return self._slope
+        except AttributeError:
+            dx = self.end_point.x - self.start_point.x
+            _set_slope(self, float('inf') if dx == 0 else (self.end_point.y - self.start_point.y) / dx)
+            return self._slope
+
+    @property
+    def slope_radians(self) -> float:
+        try:
+            return self._slope_radians
+        except AttributeError:
+            _set_slope_radians(self, atan2((self.end_point.y - self.start_point.y),
+                                           (self.end_point.x - self.start_point.x)))
+            return self._slope_radians
+
+    @property
+    def slope_degrees(self) -> float:
+        return degrees(self.slope_radians)
+
+    @property
+    def points(self) -> list:
+        """Points produced by the last call to discretize_line"""
+        try:
+            return self._points
+        except AttributeError:
+            return []
+
+    def compute_length(self) -> float:
+        return self.length
+
+    def compute_slope(self) -> float:
+        return self.slope
+
+    def compute_horizontal_cross(self):
+        return self.start_point.y * self.end_point.y < 0
+
+    def compute_vertical_cross(self):
+        return self.start_point.x * self.end_point.x < 0
+
+    def compute_intersection(self, other: "Line"):
+        """Return the Point where both segments meet, or None if they don't
+
+        Collinear overlapping segments return the first endpoint that lies on the other segment.
+        """
+        x1, y1 = self.start_point.x, self.start_point.y
+        x2, y2 = self.end_point.x, self.end_point.y
+        x3, y3 = other.start_point.x, other.start_point.y
+        x4, y4 = other.end_point.x, other.end_point.y
+        d1 = (x4 - x3) * (y1 - y3) - (y4 - y3) * (x1 - x3)
+        d2 = (x4 - x3) * (y2 - y3) - (y4 - y3) * (x2 - x3)
+        d3 = (x2 - x1) * (y3 - y1) - (y2 - y1) * (x3 - x1)
+        d4 = (x2 - x1) * (y4 - y1) - (y2 - y1) * (x4 - x1)
+        if ((d1 > 0 and d2 < 0) or (d1 < 0 and d2 > 0)) and ((d3 > 0 and d4 < 0) or (d3 < 0 and d4 > 0)):
+            t = d1 / (d1 - d2)
+            return Point(x1 + t * (x2 - x1), y1 + t * (y2 - y1))
+        for distance, (px, py), (ax, ay, bx, by) in ((d1, (x1, y1), (x3, y3, x4, y4)),
+                                                      (d2, (x2, y2), (x3, y3, x4, y4)),
+                                                      (d3, (x3, y3), (x1, y1, x2, y2)),
+                                                      (d4, (x4, y4), (x1, y1, x2, y2))):
+            if distance == 0 and min(ax, bx) <= px <= max(ax, bx) and min(ay, by) <= py <= max(ay, by):
+                return Point(px, py)
+        return None
+
+    def discretize_line(self, n: int):
+        points = [
+            Point(
+                self.start_point.x + i * (self.end_point.x - self.start_point.x) / (n - 1),
+                self.start_point.y + i * (self.end_point.y - self.start_point.y) / (n - 1)
+            ) for i in range(n)
+        ]
+        _set_points(self, points)
+        return points
+
+    def discretize_array(self, n: int):
+        """Sample n points into an (n, 2) NumPy array without creating Point objects"""
+        from line_sampling import discretize_array
+        return discretize_array(self, n)
+
+    def iter_discretize(self, n: int, chunk_size: int = 65536):
+        """Yield the n samples as (chunk_size, 2) NumPy blocks so huge n stays in bounded memory"""
+        from line_sampling import iter_discretize
+        return iter_discretize(self, n, chunk_size)
+
+
+_set_start = Line.start_point.__set__
+_set_end = Line.end_point.__set__
+_set_length = Line._length.__set__
+_set_slope = Line._slope.__set__
+_set_slope_radians = Line._slope_radians.__set__
+_set_points = Line._points.__set__
+
+
+# Memory and construction benchmark against the previous dict-backed classes
+if __name__ == "__main__":
+    import gc
+    import sys
+    import tracemalloc
+    from time import perf_counter
+
+    class DictPoint:
+        def __init__(self, x_coord, y_coord):
+            self.x = x_coord
+            self.y = y_coord
+
+    class DictLine:
+        def __init__(self, start_point, end_point):
+            self.start_point = start_point
+            self.end_point = end_point
+            dx = end_point.x - start_point.x
+            dy = end_point.y - start_point.y
+            self.length = sqrt(dx**2 + dy**2)
+            self.slope_radians = atan2(dy, dx)
+            self.slope_degrees = degrees(self.slope_radians)
+
+    point_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    sample_size = min(point_count, 200_000)
+    origin = Point(0.0, 0.0)
+    dict_origin = DictPoint(0.0, 0.0)
+
+    def bytes_per_object(factory):
+        coords = [float(i) for i in range(sample_size)]
+        gc.collect()
+        tracemalloc.start()
+        objects = [factory(value) for value in coords]
+        allocated, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del objects
+        return allocated / sample_size
+
+    def construction_time(factory):
+        coords = [float(i) for i in range(point_count)]
+        gc.collect()
+        gc.disable()
+        start = perf_counter()
+        objects = [factory(value) for value in coords]
+        elapsed = perf_counter() - start
+        gc.enable()
+        del objects
+        return elapsed
+
+    cases = [
+        ("Point", lambda value: DictPoint(value, value), lambda value: Point(value, value)),
+        ("Line", lambda value: DictLine(dict_origin, DictPoint(value, 1.0)),
+         lambda value: Line(origin, Point(value, 1.0))),
+    ]
+    print(f"=== {point_count:,} objects per run ===")
+    for name, legacy_factory, slotted_factory in cases:
+        legacy_bytes = bytes_per_object(legacy_factory)
+        slotted_bytes = bytes_per_object(slotted_factory)
+        legacy_time = construction_time(legacy_factory)
+        slotted_time = construction_time(slotted_factory)
+        print(f"{name}: dict-backed {legacy_bytes:.0f} B/object, slotted {slotted_bytes:.0f} B/object, "
+              f"saves {(legacy_bytes - slotted_bytes) * point_count / 2**20:,.0f} MiB")
+        print(f"{name}: dict-backed {legacy_time:.2f}s, slotted {slotted_time:.2f}s to construct "
+              f"({slotted_time / legacy_time:.2f}x the dict-backed time)")
@@ -0,0 +1,249 @@
+from math import ceil
+
+import numpy as np
+
+from exercise_2 import signed_area
+
+# Output tiles of TILE_SIZE x TILE_SIZE pixels bound the working memory of a pass
+TILE_SIZE = 1024
+
+
+class Canvas:
+    """Pixel grid over the box [min_x, max_x] x [min_y, max_y], row 0 along min_y
+
+    Pixel (row, column) samples its center, min_x + (column + 0.5) * pixel_width along x.
+    """
+
+    def __init__(self, min_x: float, min_y: float, max_x: float, max_y: float, width: int, height: int):
+        if width < 1 or height < 1 or max_x <= min_x or max_y <= min_y:
+            raise ValueError("Canvas needs a positive size in pixels and in coordinates")
+        self.min_x, self.min_y, self.max_x, self.max_y = min_x, min_y, max_x, max_y
+        self.width, self.height = width, height
+
+    @property
+    def pixel_width(self) -> float:
+        return (self.max_x - self.min_x) / self.width
+
+    @property
+    def pixel_height(self) -> float:
+        return (self.max_y - self.min_y) / self.height
+
+    def scaled(self, factor: int) -> "Canvas":
+        """Same box with factor x factor pixels in place of each pixel"""
+        return Canvas(self.min_x, self.min_y, self.max_x, self.max_y, self.width * factor, self.height * factor)
+
+    def __repr__(self):
+        return (f"Canvas({self.min_x!r}, {self.min_y!r}, {self.max_x!r}, {self.max_y!r}, "
+                f"width={self.width!r}, height={self.height!r})")
+
+
+def _pack_edges(shapes) -> tuple:
+    """Edges as (E, 4) x0, y0, x1, y1 plus the orientation sign of the shape each one belongs to
+
+    Accepts Shapes of any vertex count, a ShapeBatch or an (N, k, 2) array.
+    """
+    coords = getattr(shapes, "coords", shapes)
+    if isinstance(coords, np.ndarray):
+        starts = np.asarray(coords, dtype=np.float64)
+        ends = np.roll(starts, -1, axis=1)
+        twice_area = np.sum(starts[:, :, 0] * ends[:, :, 1] - ends[:, :, 0] * starts[:, :, 1], axis=1)
+        edges = np.concatenate([starts, ends], axis=2).reshape(-1, 4)
+        signs = np.repeat(np.sign(twice_area), starts.shape[1])
+        return edges, signs
+    rows = []
+    signs = []
+    for shape in shapes:
+        vertices = shape.get_vertices()
+        area = signed_area(vertices)
+        rows.extend((x0, y0, x1, y1) for (x0, y0), (x1, y1) in zip(vertices, vertices[1:] + vertices[:1]))
+        signs.extend([(area > 0) - (area < 0)] * len(vertices))
+    return np.array(rows, dtype=np.float64).reshape(-1, 4), np.array(signs, dtype=np.float64)
+
+
+def _scanline_crossings(shapes, canvas: Canvas) -> tuple:
+    """Edges in pixel units that cross at least one row center: (u0, v0, slope, first row, last row + 1, weight)
+
+    Pixel centers sit on integer (u, v). An edge covers the rows whose center lies in
+    [low v, high v), so shared vertices are counted once. Its weight is the winding step,
+    signed by the shape orientation so the inside of every shape counts +1.
+    """
+    edges, signs = _pack_edges(shapes)
+    u = (edges[:, 0::2] - canvas.min_x) / canvas.pixel_width - 0.5
+    v = (edges[:, 1::2] - canvas.min_y) / canvas.pixel_height - 0.5
+    first_row = np.clip(np.ceil(v.min(axis=1)), 0, canvas.height).astype(np.int64)
+    stop_row = np.clip(np.ceil(v.max(axis=1)), 0, canvas.height).astype(np.int64)
+    keep = (stop_row > first_row) & (signs != 0)
+    u, v, first_row, stop_row = u[keep], v[keep], first_row[keep], stop_row[keep]
+    weights = (np.where(v[:, 1] < v[:, 0], 1, -1) * signs[keep]).astype(np.int32)
+    slopes = (u[:, 1] - u[:, 0]) / (v[:, 1] - v[:, 0])
+    return u[:, 0], v[:, 0], slopes, first_row, stop_row, weights
+
+
+def _iter_count_tiles(shapes, canvas: Canvas, tile_size: int):
+    """Yield (row, column, counts) tiles holding how many shapes cover each pixel center
+
+    A band of tile_size rows expands its edges into one crossing per row, the crossing
+    steps the winding count from the first pixel center at or right of it. Column tiles are
+    summed left to right, carrying each row's count in from the tiles before.
+    """
+    start_u, start_v, slopes, first_row, stop_row, weights = _scanline_crossings(shapes, canvas)
+    first_band = first_row // tile_size
+    band_counts = (stop_row - 1) // tile_size - first_band + 1
+    band_edges = np.repeat(np.arange(first_row.shape[0]), band_counts)
+    bands = np.repeat(first_band, band_counts) + (np.arange(band_edges.shape[0])
+                                                   - np.repeat(np.cumsum(band_counts) - band_counts, band_counts))
+    ranking = np.argsort(bands, kind="stable")
+    bands, band_edges = bands[ranking], band_edges[ranking]
+    band_starts = np.searchsorted(bands, np.arange(ceil(canvas.height / tile_size) + 1))
+
+    for band in range(band_starts.shape[0] - 1):
+        row = band * tile_size
+        rows_here = min(tile_size, canvas.height - row)
+        edges = band_edges[band_starts[band]:band_starts[band + 1]]
+        low = np.maximum(first_row[edges], row)
+        counts = np.minimum(stop_row[edges], row + rows_here) - low
+        total = int(counts.sum())
+        crossing_edges = np.repeat(edges, counts)
+        crossing_rows = np.repeat(low, counts) + (np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts))
+        crossing_u = start_u[crossing_edges] + (crossing_rows - start_v[crossing_edges]) * slopes[crossing_edges]
+        crossing_columns = np.clip(np.ceil(crossing_u), 0, canvas.width).astype(np.int64)
+        # Crossings right of every pixel center change nothing, the rest are grouped by column tile
+        inside = crossing_columns < canvas.width
+        crossing_columns, crossing_rows, crossing_edges = \
+            crossing_columns[inside], crossing_rows[inside], crossing_edges[inside]
+        column_tiles = (crossing_columns // tile_size).astype(np.int16 if canvas.width // tile_size < 2 ** 15 - 1
+                                                              else np.int64)
+        ranking = np.argsort(column_tiles, kind="stable")
+        tile_starts = np.searchsorted(column_tiles[ranking], np.arange(ceil(canvas.width / tile_size) + 1))
+        crossing_columns = crossing_columns[ranking]
+        crossing_rows = crossing_rows[ranking] - row
+        crossing_weights = weights[crossing_edges[ranking]]
+
+        carried = np.zeros(rows_here, dtype=np.int32)
+        for tile, column in enumerate(range(0, canvas.width, tile_size)):
+            columns_here = min(tile_size, canvas.width - column)
+            chosen = slice(tile_starts[tile], tile_starts[tile + 1])
+            steps = np.zeros((rows_here, columns_here), dtype=np.int32)
+            np.add.at(steps, (crossing_rows[chosen], crossing_columns[chosen] - column), crossing_weights[chosen])
+            tile_counts = np.cumsum(steps, axis=1, dtype=np.int32)
+            tile_counts += carried[:, None]
+            carried = tile_counts[:, -1].copy()
+            yield row, column, tile_counts
+
+
+def iter_raster_tiles(shapes, canvas: Canvas, mode: str = "occupancy", samples: int = 4,
+                      tile_size: int = TILE_SIZE):
+    """Rasterize shapes one tile at a time, yielding (row, column, tile) so huge canvases stream
+
+    Shapes may be Rectangles, Triangles, Polygons, a ShapeBatch or an (N, k, 2) array.
+    mode "occupancy" gives a bool mask of covered pixel centers, "count" the number of shapes
+    covering each one and "coverage" the float32 fraction of samples x samples subpixels covered.
+    """
+    if mode == "coverage":
+        # Subpixel tiles stay tile_size wide, so each output tile covers tile_size // samples pixels
+        fine_tiles = _iter_count_tiles(shapes, canvas.scaled(samples), max(1, tile_size // samples) * samples)
+        for row, column, counts in fine_tiles:
+            rows_here, columns_here = counts.shape[0] // samples, counts.shape[1] // samples
+            covered = (counts > 0).reshape(rows_here, samples, columns_here, samples)
+            tile = covered.sum(axis=(1, 3), dtype=np.int32).astype(np.float32) / (samples * samples)
+            yield row // samples, column // samples, tile
+    elif mode == "count":
+        for row, column, counts in _iter_count_tiles(shapes, canvas, tile_size):
+            yield row, column, counts
+    elif mode == "occupancy":
+        for row, column, counts in _iter_count_tiles(shapes, canvas, tile_size):
+            yield row, column, counts > 0
+    else:
+        raise ValueError(f"Unknown raster mode {mode!r}")
+
+
+def rasterize(shapes, canvas: Canvas, mode: str = "occupancy", samples: int = 4,
+              tile_size: int = TILE_SIZE) -> np.ndarray:
+    """Whole (height, width) grid from iter_raster_tiles"""
+    dtype = {"occupancy": bool, "count": np.int32, "coverage": np.float32}.get(mode)
+    if dtype is None:
+        raise ValueError(f"Unknown raster mode {mode!r}")
+    grid = np.empty((canvas.height, canvas.width), dtype=dtype)
+    for row, column, tile in iter_raster_tiles(shapes, canvas, mode, samples, tile_size):
+        grid[row:row + tile.shape[0], column:column + tile.shape[1]] = tile
+    return grid
+
+
+# Testing and benchmark against sampling every row with Line.discretize_line
+if __name__ == "__main__":
+    import sys
+    from time import perf_counter
+
+    from exercise_2 import Point, Polygon, Rectangle, Triangle
+    from primitives import Line
+    from spatial_index import contains_point
+
+    def loop_rasterize(shapes: list, canvas: Canvas) -> np.ndarray:
+        grid = np.zeros((canvas.height, canvas.width), dtype=bool)
+        for shape in shapes:
+            vertices = shape.get_vertices()
+            xs, ys = [x_coord for x_coord, _ in vertices], [y_coord for _, y_coord in vertices]
+            first_column = max(0, ceil((min(xs) - canvas.min_x) / canvas.pixel_width - 0.5))
+            stop_column = min(canvas.width, ceil((max(xs) - canvas.min_x) / canvas.pixel_width - 0.5) + 1)
+            for row in range(max(0, ceil((min(ys) - canvas.min_y) / canvas.pixel_height - 0.5)),
+                             min(canvas.height, ceil((max(ys) - canvas.min_y) / canvas.pixel_height - 0.5) + 1)):
+                y_coord = canvas.min_y + (row + 0.5) * canvas.pixel_height
+                scanline = Line(Point(canvas.min_x + (first_column + 0.5) * canvas.pixel_width, y_coord),
+                                Point(canvas.min_x + (stop_column - 0.5) * canvas.pixel_width, y_coord))
+                samples = scanline.discretize_line(stop_column - first_column) if stop_column - first_column > 1 \
+                    else [scanline.start_point][:stop_column - first_column]
+                for column, point in enumerate(samples, first_column):
+                    if contains_point(vertices, point.x, point.y):
+                        grid[row, column] = True
+        return grid
+
+    canvas = Canvas(0, 0, 10, 10, 20, 10)
+    square = Rectangle()
+    square.set_vertices([Point(1, 8), Point(6, 8), Point(6, 2), Point(1, 2)])
+    triangle = Triangle()
+    triangle.set_vertices([Point(4, 1), Point(9.5, 5), Point(4, 9)])
+    notch = Polygon()
+    notch.set_vertices([Point(0, 0), Point(3, 0), Point(3, 3), Point(1.5, 1), Point(0, 3)])
+    shapes = [square, triangle, notch]
+    counts = rasterize(shapes, canvas, mode="count")
+    print("Shapes covering each pixel, row 0 printed last:")
+    for line in counts[::-1]:
+        print("  " + "".join(".123456789"[count] for count in line))
+    coverage = rasterize(shapes, canvas, mode="coverage", samples=16)
+    print(f"Covered area: occupancy {(counts > 0).sum() * 0.5:.2f}, anti-aliased "
+          f"{coverage.sum() * 0.5:.2f}")
+    print("Matches the discretize_line loop:", np.array_equal(counts > 0, loop_rasterize(shapes, canvas)))
+
+    shape_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(25)
+    side = 4096
+    unit_square = np.array([[0.0, 1.0], [1.0, 1.0], [1.0, 0.0], [0.0, 0.0]])
+    rectangles = rng.uniform(0, side, size=(shape_count, 1, 2)) + rng.uniform(1, 8, size=(shape_count, 1, 2)) * unit_square
+    triangles = rng.uniform(0, side, size=(shape_count, 1, 2)) + rng.uniform(-6, 6, size=(shape_count, 3, 2))
+    canvas = Canvas(0, 0, side, side, side, side)
+
+    loop_count = min(shape_count, 2_000)
+    loop_shapes = [Triangle() for _ in range(loop_count)]
+    for shape, vertex_coords in zip(loop_shapes, triangles[:loop_count].tolist()):
+        shape.set_vertices([Point(x_coord, y_coord) for x_coord, y_coord in vertex_coords])
+    start = perf_counter()
+    expected = loop_rasterize(loop_shapes, canvas)
+    loop_time = perf_counter() - start
+    start = perf_counter()
+    mask = rasterize(triangles[:loop_count], canvas)
+    vector_time = perf_counter() - start
+    print(f"{loop_count:,} triangles: discretize_line loop {loop_time:.2f}s "
+          f"({loop_count / loop_time:,.0f} shapes/s), rasterize {vector_time:.3f}s, "
+          f"same pixels: {np.array_equal(mask, expected)}")
+
+    pixels = canvas.width * canvas.height
+    for name, coords in (("rectangles", rectangles), ("triangles", triangles)):
+        for mode, samples in (("occupancy", 1), ("count", 1), ("coverage", 4)):
+            start = perf_counter()
+            peak = 0
+            for _, _, tile in iter_raster_tiles(coords, canvas, mode, samples):
+                peak = max(peak, tile.nbytes)
+            elapsed = perf_counter() - start
+            print(f"{shape_count:,} {name} on {canvas.width}x{canvas.height} {mode:<9}: {elapsed:.2f}s, "
+                  f"{shape_count / elapsed / 1e6:.2f} M shapes/s, {pixels * samples * samples / elapsed / 1e6:,.0f} "
+                  f"M pixels/s, largest tile {peak / 2 ** 20:.1f} MiB")
@@ -1,14 +1,18 @@
-import random
+from array import array
 
 class MenuItem:
     def __init__(self, name: str, price: float):
         self._name = name
         self._price = price
+        self._menu = None
+        self._menu_id = None
 
     def get_name(self):
         return self._name
 
     def set_name(self, name):
+        if self._menu is not None:
+            self._menu._rename(self._menu_id, self._name, name)
         self._name = name
 
     def get_price(self):
@@ -16,12 +20,20 @@ class MenuItem:
 
     def set_price(self, price):
         self._price = price
+        if self._menu is not None:
+            self._menu.prices[self._menu_id] = price
+
+    def get_menu_id(self):
+        return self._menu_id
 
     def total_price(self, quantity: int) -> float:
         return self._price * quantity
 
 
 class Beverage(MenuItem):
+    TAX = 0.1  # 10% impuesto
+    MAIN_COURSE_DISCOUNT = 0.1
+
     def __init__(self, name: str, price: float, size_ml: int):
         super().__init__(name, price)
         self._size_ml = size_ml
@@ -33,8 +45,8 @@ class Beverage(MenuItem):
         self._size_ml = size_ml
 
     def total_price(self, quantity: int, has_main_course: bool = False) -> float:
-        tax = 0.1  # 10% impuesto
-        discount = 0.1 if has_main_course else 0
+        tax = self.TAX
+        discount = self.MAIN_COURSE_DISCOUNT if has_main_course else 0
         return super().total_price(quantity) * (1 + tax) * (1 - discount)
 
 
@@ -62,69 +74,213 @@ class MainCourse(MenuItem):
         self._origin = origin
 
 
+_randint = None
+
+
+def _new_order_number() -> int:
+    # random se importa con el primer pedido y no al importar el módulo
+    global _randint
+    if _randint is None:
+        from random import randint
+        _randint = randint
+    return _randint(1000, 9999)
+
+
 class Order:
+    # (subtotal mínimo, descuento), de mayor a menor
+    DISCOUNT_TIERS = ((80000, 0.15), (50000, 0.10), (30000, 0.05))
+
     def __init__(self):
-        self.order_number = random.randint(1000, 9999)
-        self.items = []
+        self.order_number = _new_order_number()
+        # Líneas en orden de llegada: número de línea -> (ítem, cantidad, aporte sin y con plato fuerte),
+        # el aporte usa el precio del momento en que se agregó la línea
+        self._lines = {}
+        # Números de línea de cada ítem, el último es el que quita remove
+        self._lines_by_item = {}
+        self._next_line = 0
+        # Totales acumulados: los precios se toman al momento de agregar cada ítem
+        self._main_course_count = 0
+        self._subtotal_without_main = 0
+        self._subtotal_with_main = 0
 
     def add(self, item: MenuItem, quantity: int):
-        self.items.append((item, quantity))
+        if isinstance(item, Beverage):
+            line_price = (item.total_price(quantity, False), item.total_price(quantity, True))
+        else:
+            price = item.total_price(quantity)
+            line_price = (price, price)
+        line = self._next_line
+        self._next_line += 1
+        self._lines[line] = (item, quantity, line_price)
+        self._lines_by_item.setdefault(item, []).append(line)
+        self._track(item, line_price, 1)
+
+    def remove(self, item: MenuItem) -> int:
+        """Quita la última línea del pedido con ese ítem en O(1) y devuelve su cantidad"""
+        lines = self._lines_by_item.get(item)
+        if not lines:
+            raise ValueError(f"{item.get_name()} no está en el pedido")
+        _, quantity, line_price = self._lines.pop(lines.pop())
+        if not lines:
+            del self._lines_by_item[item]
+        # Resta lo mismo que sumó add aunque el precio haya cambiado desde entonces
+        self._track(item, line_price, -1)
+        return quantity
+
+    @property
+    def items(self) -> list:
+        """Líneas (ítem, cantidad) en el orden en que se agregaron"""
+        return [(item, quantity) for item, quantity, _ in self._lines.values()]
+
+    def _track(self, item: MenuItem, line_price: tuple, sign: int):
+        if isinstance(item, MainCourse):
+            self._main_course_count += sign
+        self._subtotal_without_main += sign * line_price[0]
+        self._subtotal_with_main += sign * line_price[1]
+        if not self._lines:
+            # Evita arrastrar residuos de redondeo cuando el pedido queda vacío
+            self._subtotal_without_main = 0
+            self._subtotal_with_main = 0
 
     def has_main_course(self):
-        return any(isinstance(item, MainCourse) for item, _ in self.items)
+        return self._main_course_count > 0
 
     def total(self) -> float:
-        has_main = self.has_main_course()
-        total = 0
-        for item, qty in self.items:
-            if isinstance(item, Beverage):
-                total += item.total_price(qty, has_main)
-            else:
-                total += item.total_price(qty)
-        return total
+        if self._main_course_count > 0:
+            return self._subtotal_with_main
+        return self._subtotal_without_main
 
     def apply_discount(self) -> float:
         subtotal = self.total()
         discount = 0.0
-        if subtotal > 80000:
-            discount = 0.15
-        elif subtotal > 50000:
-            discount = 0.10
-        elif subtotal > 30000:
-            discount = 0.05
+        for threshold, tier_discount in self.DISCOUNT_TIERS:
+            if subtotal > threshold:
+                discount = tier_discount
+                break
         return subtotal * (1 - discount)
 
     def summary(self):
         print(f"\nPedido #{self.order_number}")
         print("Resumen del pedido:")
         has_main = self.has_main_course()
-        for item, qty in self.items:
-            if isinstance(item, Beverage):
-                price = item.total_price(qty, has_main)
-            else:
-                price = item.total_price(qty)
+        for item, qty, line_price in self._lines.values():
+            price = line_price[1] if has_main else line_price[0]
             print(f" - {item.get_name()} x{qty} = ${price:,.2f}")
         print(f"\nSubtotal: ${self.total():,.2f}")
         print(f"Total con descuento: ${self.apply_discount():,.2f}")
 
 
+# Catálogo del menú
+class Menu:
+    # Códigos de categoría en la tabla compilada
+    BEVERAGE = 0
+    APPETIZER = 1
+    MAIN_COURSE = 2
+    OTHER = 3
+
+    def __init__(self):
+        self._items = []
+        self._ids_by_name = {}
+        # Tabla compacta indexada por id: precio y categoría de cada ítem
+        self.prices = array("d")
+        self.categories = array("b")
+
+    def register(self, item: MenuItem) -> int:
+        if item._menu is not None:
+            raise ValueError(f"{item.get_name()} ya está registrado en un menú")
+        if item.get_name() in self._ids_by_name:
+            raise ValueError(f"Ya existe un ítem llamado {item.get_name()}")
+        item_id = len(self._items)
+        self._items.append(item)
+        self._ids_by_name[item.get_name()] = item_id
+        self.prices.append(item.get_price())
+        self.categories.append(self._category_of(item))
+        item._menu = self
+        item._menu_id = item_id
+        return item_id
+
+    def _category_of(self, item: MenuItem) -> int:
+        if isinstance(item, Beverage):
+            return self.BEVERAGE
+        if isinstance(item, Appetizer):
+            return self.APPETIZER
+        if isinstance(item, MainCourse):
+            return self.MAIN_COURSE
+        return self.OTHER
+
+    def _rename(self, item_id: int, old_name: str, new_name: str):
+        if new_name != old_name and new_name in self._ids_by_name:
+            raise ValueError(f"Ya existe un ítem llamado {new_name}")
+        del self._ids_by_name[old_name]
+        self._ids_by_name[new_name] = item_id
+
+    def get(self, item_id: int) -> MenuItem:
+        return self._items[item_id]
+
+    def get_by_name(self, name: str) -> MenuItem:
+        try:
+            return self._items[self._ids_by_name[name]]
+        except KeyError:
+            raise KeyError(f"{name} no está en el menú") from None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._ids_by_name
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+
 # Sistema de pagos
+class ResultadoPago:
+    APROBADO = "aprobado"
+    RECHAZADO = "rechazado"
+    ERROR = "error"
+
+    def __init__(self, estado: str, monto: float, cambio: float = 0, mensaje: str = "", intentos: int = 1):
+        self.estado = estado
+        self.monto = monto
+        self.cambio = cambio
+        self.mensaje = mensaje
+        self.intentos = intentos
+
+    def aprobado(self) -> bool:
+        return self.estado == self.APROBADO
+
+    def __repr__(self):
+        return (f"ResultadoPago(estado={self.estado!r}, monto={self.monto!r}, cambio={self.cambio!r}, "
+                f"mensaje={self.mensaje!r}, intentos={self.intentos!r})")
+
+
 class MedioPago:
     def __init__(self):
         pass
 
-    def pagar(self, monto):
+    def pagar(self, monto) -> ResultadoPago:
         raise NotImplementedError("Subclases deben implementar pagar()")
 
+    async def pagar_async(self, monto, clave_idempotencia=None) -> ResultadoPago:
+        return self.pagar(monto)
+
 
 class Tarjeta(MedioPago):
-    def __init__(self, numero, cvv):
+    def __init__(self, numero, cvv, procesador=None):
         super().__init__()
         self.numero = numero
         self.cvv = cvv
+        # Backend asíncrono que autoriza el cobro, ver payments.ProcesadorTarjeta
+        self.procesador = procesador
+
+    def pagar(self, monto) -> ResultadoPago:
+        return ResultadoPago(ResultadoPago.APROBADO, monto, mensaje=f"Pago con tarjeta {self.numero[-4:]}")
 
-    def pagar(self, monto):
-        print(f"Pagando {monto} con tarjeta {self.numero[-4:]}")
+    async def pagar_async(self, monto, clave_idempotencia=None) -> ResultadoPago:
+        if self.procesador is None:
+            return self.pagar(monto)
+        # Con la misma clave el procesador no vuelve a cobrar, así un reintento es seguro
+        return await self.procesador.autorizar(self.numero, monto, clave_idempotencia)
 
 
 class Efectivo(MedioPago):
@@ -132,32 +288,60 @@ class Efectivo(MedioPago):
         super().__init__()
         self.monto_entregado = monto_entregado
 
-    def pagar(self, monto):
+    def pagar(self, monto) -> ResultadoPago:
         if self.monto_entregado >= monto:
-            print(f"Pago realizado en efectivo. Cambio: {self.monto_entregado - monto}")
-        else:
-            print(f"Fondos insuficientes. Faltan {monto - self.monto_entregado} para completar el pago.")
+            return ResultadoPago(ResultadoPago.APROBADO, monto, cambio=self.monto_entregado - monto,
+                                 mensaje="Pago realizado en efectivo")
+        return ResultadoPago(ResultadoPago.RECHAZADO, monto,
+                             mensaje=f"Fondos insuficientes. Faltan {monto - self.monto_entregado} para completar el pago.")
 
 
 # ---------- Elementos del Menú ----------
-coca_cola = Beverage("CocaCola", 5000, 350)
-lemonade = Beverage("Limonada", 4000, 300)
-beer = Beverage("Cerveza", 7000, 330)
-water = Beverage("Agua", 2000, 500)
-
-arepa_rellena = Appetizer("Arepa Rellena", 6000, True)
-empanada = Appetizer("Empanada", 2500, True)
-patacon = Appetizer("Patacón", 3000, True)
-nachos = Appetizer("Nachos", 5500, False)
-
-spaguetti = MainCourse("Spaguetti", 18000, "Italiana")
-beef = MainCourse("Carne Asada", 25000, "Colombiana")
-pork_loin = MainCourse("Lomo de Cerdo", 23000, "Internacional")
-hamburger = MainCourse("Hamburguesa", 20000, "Americana")
-bandeja_paisa = MainCourse("Bandeja Paisa", 30000, "Colombiana")
+# Se construyen en el primer acceso (restaurant_revisted.menu, restaurant_revisted.beef, ...)
+MENU_ITEM_NAMES = ("coca_cola", "lemonade", "beer", "water", "arepa_rellena", "empanada", "patacon", "nachos",
+                   "spaguetti", "beef", "pork_loin", "hamburger", "bandeja_paisa")
+
+
+def get_menu() -> Menu:
+    """Menú de la casa, creado una sola vez y publicado como atributos del módulo"""
+    built = globals().get("menu")
+    if built is not None:
+        return built
+    items = {
+        "coca_cola": Beverage("CocaCola", 5000, 350),
+        "lemonade": Beverage("Limonada", 4000, 300),
+        "beer": Beverage("Cerveza", 7000, 330),
+        "water": Beverage("Agua", 2000, 500),
+
+        "arepa_rellena": Appetizer("Arepa Rellena", 6000, True),
+        "empanada": Appetizer("Empanada", 2500, True),
+        "patacon": Appetizer("Patacón", 3000, True),
+        "nachos": Appetizer("Nachos", 5500, False),
+
+        "spaguetti": MainCourse("Spaguetti", 18000, "Italiana"),
+        "beef": MainCourse("Carne Asada", 25000, "Colombiana"),
+        "pork_loin": MainCourse("Lomo de Cerdo", 23000, "Internacional"),
+        "hamburger": MainCourse("Hamburguesa", 20000, "Americana"),
+        "bandeja_paisa": MainCourse("Bandeja Paisa", 30000, "Colombiana")
+    }
+    built = Menu()
+    for name in MENU_ITEM_NAMES:
+        built.register(items[name])
+    globals().update(items)
+    globals()["menu"] = built
+    return built
+
+
+def __getattr__(name):
+    if name == "menu" or name in MENU_ITEM_NAMES:
+        get_menu()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # ---------- Ejecución ----------
 if __name__ == "__main__":
+    get_menu()
     order = Order()
     order.add(coca_cola, 2)
     order.add(nachos, 1)
@@ -169,4 +353,29 @@ if __name__ == "__main__":
     print("\n--- Pago ---")
     total = order.apply_discount()
     pago = Tarjeta("1234567890123456", 123)
-    pago.pagar(total)
+    print(pago.pagar(total))
+
+    # El subtotal acumulado usa los precios del momento en que se agregó cada línea
+    pedido = Order()
+    pedido.add(coca_cola, 2)
+    pedido.add(bandeja_paisa, 1)
+    precio_original = bandeja_paisa.get_price()
+    bandeja_paisa.set_price(precio_original * 2)
+    pedido.remove(bandeja_paisa)
+    bandeja_paisa.set_price(precio_original)
+    esperado = coca_cola.total_price(2, False)
+    print(f"\nSubtotal tras cambiar un precio y quitar la línea: ${pedido.total():,.2f} "
+          f"(esperado ${esperado:,.2f}, coincide: {pedido.total() == esperado})")
+
+    # Quitar líneas de un banquete grande no recorre el pedido
+    from time import perf_counter
+    banquete = Order()
+    for _ in range(100_000):
+        banquete.add(empanada, 1)
+        banquete.add(coca_cola, 1)
+    inicio = perf_counter()
+    for _ in range(100_000):
+        banquete.remove(empanada)
+    duracion = perf_counter() - inicio
+    print(f"100.000 remove en un pedido de 200.000 líneas: {duracion * 1e3:.1f} ms, "
+          f"quedan {len(banquete.items):,} líneas, subtotal ${banquete.total():,.2f}")
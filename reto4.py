@@ -0,0 +1,46 @@
+"""Lightweight entry point, importing reto4 loads nothing else
+
+Submodules are imported on first attribute access:
+
+    import reto4
+    triangle = reto4.geometry.Triangle()    # imports exercise_2 now
+    menu = reto4.restaurant.get_menu()      # imports restaurant_revisted, builds the menu
+"""
+# Public name -> module that backs it
+SUBMODULES = {
+    "geometry": "exercise_2",
+    "primitives": "primitives",
+    "restaurant": "restaurant_revisted",
+    "payments": "payments",
+    "kitchen": "kitchen",
+    "line_sampling": "line_sampling",
+    "shape_batch": "shape_batch",
+    "shape_file": "shape_file",
+    "spatial_index": "spatial_index",
+    "segment_intersection": "segment_intersection",
+    "convex_hull": "convex_hull",
+    "clipping": "clipping",
+    "rasterization": "rasterization",
+    "nearest_neighbors": "nearest_neighbors",
+    "parallel_metrics": "parallel_metrics",
+    "bulk_pricing": "bulk_pricing",
+    "order_ingest": "order_ingest",
+    "instrumentation": "instrumentation"
+}
+
+__all__ = sorted(SUBMODULES)
+
+
+def __getattr__(name):
+    module_name = SUBMODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Plain __import__ keeps the work visible to python -X importtime, the modules are top-level
+    module = __import__(module_name)
+    # Cache it so later lookups skip __getattr__
+    globals()[name] = module
+    return module
+
+
+def __dir__():
+    return sorted(set(globals()) | set(SUBMODULES))
@@ -0,0 +1,258 @@
+import numpy as np
+
+from line_sampling import pack_endpoints
+
+
+def _orientation(ax, ay, bx, by, px, py):
+    return (bx - ax) * (py - ay) - (by - ay) * (px - ax)
+
+
+def _within(px, py, ax, ay, bx, by):
+    return (np.minimum(ax, bx) <= px) & (px <= np.maximum(ax, bx)) \
+        & (np.minimum(ay, by) <= py) & (py <= np.maximum(ay, by))
+
+
+def _test_pairs(endpoints: np.ndarray, first: np.ndarray, second: np.ndarray):
+    """Vectorized Line.compute_intersection over candidate pairs, returns (hit mask, points)"""
+    x1, y1, x2, y2 = endpoints[first].T
+    x3, y3, x4, y4 = endpoints[second].T
+    d1 = _orientation(x3, y3, x4, y4, x1, y1)
+    d2 = _orientation(x3, y3, x4, y4, x2, y2)
+    d3 = _orientation(x1, y1, x2, y2, x3, y3)
+    d4 = _orientation(x1, y1, x2, y2, x4, y4)
+    proper = (((d1 > 0) & (d2 < 0)) | ((d1 < 0) & (d2 > 0))) & (((d3 > 0) & (d4 < 0)) | ((d3 < 0) & (d4 > 0)))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(proper, d1 / (d1 - d2), 0.0)
+    points = np.stack([x1 + t * (x2 - x1), y1 + t * (y2 - y1)], axis=1)
+    hit = proper.copy()
+
+    # Touching and collinear cases, checked in the same order as Line.compute_intersection
+    for distance, px, py, ax, ay, bx, by in ((d4, x4, y4, x1, y1, x2, y2), (d3, x3, y3, x1, y1, x2, y2),
+                                             (d2, x2, y2, x3, y3, x4, y4), (d1, x1, y1, x3, y3, x4, y4)):
+        touch = ~proper & (distance == 0) & _within(px, py, ax, ay, bx, by)
+        points[touch, 0] = px[touch]
+        points[touch, 1] = py[touch]
+        hit |= touch
+    return hit, points
+
+
+def _pairs_after(order: np.ndarray, active_end: np.ndarray, chunk_size: int):
+    """Yield (first, second) chunks pairing order[i] with order[i + 1:active_end[i]], chunk_size pairs at most"""
+    count = order.shape[0]
+    active_counts = np.maximum(active_end - np.arange(1, count + 1), 0)
+    cumulative = np.cumsum(active_counts)
+
+    row = 0
+    while row < count:
+        done = cumulative[row - 1] if row else 0
+        stop = max(int(np.searchsorted(cumulative, done + chunk_size, side="right")), row + 1)
+        stop = min(stop, count)
+        counts = active_counts[row:stop]
+        total = int(counts.sum())
+        if total:
+            rows = np.repeat(np.arange(row, stop), counts)
+            offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            yield order[rows], order[rows + 1 + offsets]
+        row = stop
+
+
+def sweep_candidates(min_x: np.ndarray, max_x: np.ndarray, chunk_size: int = 1_000_000, touching: bool = True):
+    """Yield (first, second) index arrays of the pairs whose x ranges overlap, chunk_size pairs at most
+
+    Items are swept left to right by min_x and each one is paired with the items that start
+    before it ends, or exactly where it ends when touching is True. Callers filter the
+    candidates further, every unordered pair is produced once. This prunes on x only: the
+    number of candidates is the number of x-overlapping pairs, O(n^2) when most items span
+    a large share of the x range, however few of them actually meet.
+    """
+    order = np.argsort(min_x, kind="stable")
+    # Items after position i in sweep order whose start lies before item i ends
+    active_end = np.searchsorted(min_x[order], max_x[order], side="right" if touching else "left")
+    yield from _pairs_after(order, active_end, chunk_size)
+
+
+def grid_cells(endpoints: np.ndarray, cell_size: float):
+    """(segment ids, cell ids) of the uniform grid cells each segment passes through
+
+    Cells are walked column by column along the segment rather than over its bounding box,
+    so a long diagonal segment visits O(length / cell_size) cells. Ranges are padded by a
+    tiny fraction of a cell so rounding can't drop the cell where two segments meet.
+    """
+    count = endpoints.shape[0]
+    pad = 1e-9
+    swap = endpoints[:, 2] < endpoints[:, 0]
+    start_x = np.where(swap, endpoints[:, 2], endpoints[:, 0])
+    start_y = np.where(swap, endpoints[:, 3], endpoints[:, 1])
+    end_x = np.where(swap, endpoints[:, 0], endpoints[:, 2])
+    end_y = np.where(swap, endpoints[:, 1], endpoints[:, 3])
+    origin_x, origin_y = start_x.min(), min(start_y.min(), end_y.min())
+
+    first_column = np.floor((start_x - origin_x) / cell_size - pad).astype(np.int64)
+    last_column = np.floor((end_x - origin_x) / cell_size + pad).astype(np.int64)
+    column_counts = last_column - first_column + 1
+    segments = np.repeat(np.arange(count), column_counts)
+    columns = np.repeat(first_column, column_counts) \
+        + np.arange(segments.shape[0]) - np.repeat(np.cumsum(column_counts) - column_counts, column_counts)
+
+    # y range of each segment inside each of its columns, vertical segments keep their whole range
+    width = end_x - start_x
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where(width > 0, (end_y - start_y) / width, 0.0)
+    low_x = np.maximum(start_x[segments], origin_x + (columns - pad) * cell_size)
+    high_x = np.minimum(end_x[segments], origin_x + (columns + 1 + pad) * cell_size)
+    low_y = start_y[segments] + (low_x - start_x[segments]) * slope[segments]
+    high_y = start_y[segments] + (high_x - start_x[segments]) * slope[segments]
+    vertical = width[segments] == 0
+    low_y, high_y = np.minimum(low_y, high_y), np.maximum(low_y, high_y)
+    low_y[vertical] = np.minimum(start_y, end_y)[segments[vertical]]
+    high_y[vertical] = np.maximum(start_y, end_y)[segments[vertical]]
+
+    first_row = np.floor((low_y - origin_y) / cell_size - pad).astype(np.int64)
+    last_row = np.floor((high_y - origin_y) / cell_size + pad).astype(np.int64)
+    row_counts = last_row - first_row + 1
+    visits = np.repeat(np.arange(segments.shape[0]), row_counts)
+    rows = np.repeat(first_row, row_counts) \
+        + np.arange(visits.shape[0]) - np.repeat(np.cumsum(row_counts) - row_counts, row_counts)
+    # Padding can reach one cell before the origin, shift so every id is non-negative
+    row_span = int(last_row.max()) + 2
+    return segments[visits], (columns[visits] + 1) * row_span + rows + 1
+
+
+def grid_candidates(endpoints: np.ndarray, cell_size: float = None, chunk_size: int = 1_000_000):
+    """Yield (first, second) index arrays of segments sharing a grid cell, chunk_size pairs at most
+
+    The default cell_size gives about one cell per segment over the bounding box of the
+    input. A pair that shares several cells is produced once per shared cell, so callers
+    deduplicate what they keep. The cost is O(n + cell visits + candidates). For segments
+    spread over the plane that is about O(n + k) for k intersections, including long or
+    x-overlapping segments that sweep_candidates pairs up wholesale. The worst case is
+    still O(n^2): many long segments running closer together than a cell, such as a dense
+    bundle of near-parallel lines, share every cell without meeting.
+    """
+    count = endpoints.shape[0]
+    if count < 2:
+        return
+    if cell_size is None:
+        width = np.ptp(endpoints[:, [0, 2]])
+        height = np.ptp(endpoints[:, [1, 3]])
+        cell_size = np.sqrt(width * height / count) or max(width, height) / count or 1.0
+    segments, cells = grid_cells(endpoints, cell_size)
+    order = np.argsort(cells, kind="stable")
+    sorted_cells = cells[order]
+    # Each visit pairs with the later visits of the same cell
+    active_end = np.searchsorted(sorted_cells, sorted_cells, side="right")
+    yield from _pairs_after(segments[order], active_end, chunk_size)
+
+
+def find_intersections(segments, chunk_size: int = 1_000_000):
+    """Report every intersecting pair among Line objects or an (N, 4) array of x0, y0, x1, y1
+
+    Candidates are the segments that pass through a common cell of a uniform grid, see
+    grid_candidates for the cost and its worst case. They are filtered by bounding-box
+    overlap and tested in vectorized chunks of at most chunk_size pairs. Returns (pairs,
+    points): an (K, 2) int array of indices i < j sorted lexicographically and the (K, 2)
+    intersection points.
+    """
+    endpoints = pack_endpoints(segments)
+    count = endpoints.shape[0]
+    min_x = np.minimum(endpoints[:, 0], endpoints[:, 2])
+    max_x = np.maximum(endpoints[:, 0], endpoints[:, 2])
+    min_y = np.minimum(endpoints[:, 1], endpoints[:, 3])
+    max_y = np.maximum(endpoints[:, 1], endpoints[:, 3])
+
+    found = []
+    for first, second in grid_candidates(endpoints, chunk_size=chunk_size):
+        overlap = (min_x[first] <= max_x[second]) & (min_x[second] <= max_x[first]) \
+            & (min_y[first] <= max_y[second]) & (min_y[second] <= max_y[first])
+        first, second = first[overlap], second[overlap]
+        hit, _ = _test_pairs(endpoints, first, second)
+        if hit.any():
+            found.append(np.minimum(first[hit], second[hit]) * count + np.maximum(first[hit], second[hit]))
+
+    if not found:
+        return np.empty((0, 2), dtype=np.intp), np.empty((0, 2))
+    # Pairs met in several cells collapse here, unique also sorts them lexicographically
+    keys = np.unique(np.concatenate(found))
+    pairs = np.stack([keys // count, keys % count], axis=1).astype(np.intp)
+    # Recompute each point in (i, j) orientation so it matches Line.compute_intersection
+    _, points = _test_pairs(endpoints, pairs[:, 0], pairs[:, 1])
+    return pairs, points
+
+
+def naive_intersections(lines: list):
+    """Reference O(n^2) scan with Line.compute_intersection"""
+    pairs = []
+    points = []
+    for i in range(len(lines)):
+        for j in range(i + 1, len(lines)):
+            point = lines[i].compute_intersection(lines[j])
+            if point is not None:
+                pairs.append((i, j))
+                points.append((point.x, point.y))
+    return np.array(pairs, dtype=np.intp).reshape(-1, 2), np.array(points, dtype=np.float64).reshape(-1, 2)
+
+
+# Benchmark against the naive reference
+if __name__ == "__main__":
+    from time import perf_counter
+
+    from primitives import Point, Line
+
+    rng = np.random.default_rng(11)
+
+    def random_segments(count: int, length: float) -> np.ndarray:
+        starts = rng.uniform(0, 1, size=(count, 2))
+        angles = rng.uniform(0, 2 * np.pi, size=count)
+        ends = starts + length * np.stack([np.cos(angles), np.sin(angles)], axis=1)
+        return np.hstack([starts, ends])
+
+    print("Touching segments:", find_intersections([Line(Point(0, 0), Point(2, 2)),
+                                                    Line(Point(2, 2), Point(3, 0)),
+                                                    Line(Point(0, 2), Point(2, 0))]))
+
+    for count in (500, 1_000, 3_000):
+        segments = random_segments(count, 0.05)
+        lines = [Line(Point(x0, y0), Point(x1, y1)) for x0, y0, x1, y1 in segments.tolist()]
+        start = perf_counter()
+        pairs, points = find_intersections(segments)
+        grid_time = perf_counter() - start
+        start = perf_counter()
+        naive_pairs, naive_points = naive_intersections(lines)
+        naive_time = perf_counter() - start
+        matches = np.array_equal(pairs, naive_pairs) and np.allclose(points, naive_points)
+        print(f"{count:>9} segments: grid {grid_time:.3f}s, naive {naive_time:.2f}s, "
+              f"{len(pairs)} intersections, results match: {matches}")
+
+    for count in (100_000, 300_000):
+        segments = random_segments(count, 0.002)
+        start = perf_counter()
+        pairs, _ = find_intersections(segments)
+        print(f"{count:>9} segments: grid {perf_counter() - start:.2f}s, {len(pairs)} intersections "
+              f"(naive would test {count * (count - 1) // 2:,} pairs)")
+
+    # Long segments: most pairs overlap in x, the grid only pairs those that come close
+    segments = random_segments(3_000, 0.5)
+    lines = [Line(Point(x0, y0), Point(x1, y1)) for x0, y0, x1, y1 in segments.tolist()]
+    start = perf_counter()
+    pairs, points = find_intersections(segments)
+    grid_time = perf_counter() - start
+    naive_pairs, naive_points = naive_intersections(lines)
+    print(f"    3,000 long segments: grid {grid_time:.3f}s, {len(pairs):,} intersections, results match: "
+          f"{np.array_equal(pairs, naive_pairs) and np.allclose(points, naive_points)}")
+
+    # Edges of a 100k vertex sawtooth polygon all span the same x range and never cross
+    tooth_count = 50_000
+    teeth = np.empty((2 * tooth_count, 2))
+    teeth[0::2] = np.stack([np.zeros(tooth_count), np.arange(tooth_count)], axis=1)
+    teeth[1::2] = np.stack([np.ones(tooth_count), np.arange(tooth_count) + 0.5], axis=1)
+    edges = np.hstack([teeth[:-1], teeth[1:]])
+    sorted_min_x = np.sort(np.minimum(edges[:, 0], edges[:, 2]))
+    x_overlaps = int((np.searchsorted(sorted_min_x, np.maximum(edges[:, 0], edges[:, 2]), side="right")
+                      - np.arange(1, len(edges) + 1)).sum())
+    start = perf_counter()
+    pairs, _ = find_intersections(edges)
+    grid_time = perf_counter() - start
+    print(f"{len(edges):>9,} sawtooth edges: grid {grid_time:.2f}s, {len(pairs):,} touching pairs, "
+          f"{sum(first.shape[0] for first, _ in grid_candidates(edges)):,} grid candidates vs "
+          f"{x_overlaps:,} x-overlapping pairs for sweep_candidates")
@@ -0,0 +1,249 @@
+from itertools import chain
+
+import numpy as np
+
+from exercise_2 import Point, Rectangle, Triangle, TRIANGLE_CLASSES, TRIANGLE_TOLERANCE
+from transforms import transform_coords
+
+
+class PointArray:
+    """Columnar storage for many points as one contiguous (N, 2) float64 array"""
+
+    def __init__(self, coords):
+        coords = np.ascontiguousarray(coords, dtype=np.float64)
+        if coords.ndim != 2 or coords.shape[1] != 2:
+            raise ValueError("PointArray expects an array of shape (N, 2)")
+        self.coords = coords
+
+    @classmethod
+    def from_points(cls, points: list) -> "PointArray":
+        flat = np.fromiter(chain.from_iterable((point.x, point.y) for point in points),
+                           dtype=np.float64, count=2 * len(points))
+        return cls(flat.reshape(-1, 2))
+
+    @classmethod
+    def from_any(cls, points) -> "PointArray":
+        """Accept a PointArray, an (N, 2) array-like or a list of Points"""
+        if isinstance(points, cls):
+            return points
+        if isinstance(points, np.ndarray) or points and not hasattr(points[0], "x"):
+            return cls(np.asarray(points, dtype=np.float64).reshape(-1, 2))
+        return cls.from_points(points)
+
+    def to_points(self) -> list:
+        return [Point(x_coord, y_coord) for x_coord, y_coord in self.coords.tolist()]
+
+    @property
+    def x(self):
+        return self.coords[:, 0]
+
+    @property
+    def y(self):
+        return self.coords[:, 1]
+
+    def __len__(self):
+        return self.coords.shape[0]
+
+    def apply_transform(self, transform) -> "PointArray":
+        """Move every point in place with a transforms.Affine"""
+        transform_coords(self.coords, transform)
+        return self
+
+    def compute_distance(self, other) -> np.ndarray:
+        """Calculate pairwise distances to another PointArray of the same length"""
+        delta = self.coords - other.coords
+        return np.sqrt(delta[:, 0]**2 + delta[:, 1]**2)
+
+
+class ShapeBatch:
+    """Vertex coordinates for N shapes of the same kind stored as an (N, k, 2) float64 array
+
+    k = 4 follows the Rectangle layout [top_left, top_right, bottom_right, bottom_left],
+    k = 3 follows the Triangle layout used by Triangle.compute_edges.
+    """
+
+    SHAPE_CLASSES = {3: Triangle, 4: Rectangle}
+
+    def __init__(self, coords):
+        coords = np.ascontiguousarray(coords, dtype=np.float64)
+        if coords.ndim != 3 or coords.shape[2] != 2 or coords.shape[1] not in self.SHAPE_CLASSES:
+            raise ValueError("ShapeBatch expects an array of shape (N, 3, 2) or (N, 4, 2)")
+        self.coords = coords
+
+    @classmethod
+    def from_shapes(cls, shapes: list) -> "ShapeBatch":
+        if not shapes:
+            raise ValueError("Cannot build a ShapeBatch from an empty list")
+        vertex_count = len(shapes[0].get_vertices())
+        flat = np.fromiter(chain.from_iterable(chain.from_iterable(shape.get_vertices()) for shape in shapes),
+                           dtype=np.float64, count=2 * vertex_count * len(shapes))
+        return cls(flat.reshape(len(shapes), vertex_count, 2))
+
+    def to_shapes(self, shape_class=None) -> list:
+        shape_class = shape_class or self.SHAPE_CLASSES[self.vertex_count]
+        shapes = []
+        for vertex_coords in self.coords.tolist():
+            shape = shape_class()
+            shape.set_vertices([Point(x_coord, y_coord) for x_coord, y_coord in vertex_coords])
+            shapes.append(shape)
+        return shapes
+
+    @property
+    def vertex_count(self) -> int:
+        return self.coords.shape[1]
+
+    def __len__(self):
+        return self.coords.shape[0]
+
+    def apply_transform(self, transform) -> "ShapeBatch":
+        """Move every vertex in place with a transforms.Affine, see transforms.transform_metrics for metrics"""
+        transform_coords(self.coords, transform)
+        return self
+
+    def classify_triangles(self, tolerance: float = TRIANGLE_TOLERANCE) -> np.ndarray:
+        """int8 label per triangle, an index into exercise_2.TRIANGLE_CLASSES"""
+        if self.vertex_count != 3:
+            raise ValueError("classify_triangles needs a triangle batch")
+        return classify_triangles(self.coords, tolerance)
+
+    def to_triangles(self, tolerance: float = TRIANGLE_TOLERANCE) -> list:
+        """Triangles built with the subclass their labels pick, None for collinear vertices"""
+        shapes = []
+        for label, vertex_coords in zip(self.classify_triangles(tolerance).tolist(), self.coords.tolist()):
+            triangle_class = TRIANGLE_CLASSES[label]
+            if triangle_class is None:
+                shapes.append(None)
+                continue
+            shape = triangle_class()
+            shape.set_vertices([Point(x_coord, y_coord) for x_coord, y_coord in vertex_coords])
+            shapes.append(shape)
+        return shapes
+
+    def compute_edge_lengths(self) -> np.ndarray:
+        """Calculate the length of every edge, shape (N, k)
+
+        Rectangles return [top, right, bottom, left], triangles return [side_a, side_b, side_c].
+        """
+        delta = np.roll(self.coords, -1, axis=1) - self.coords
+        return np.sqrt(delta[..., 0]**2 + delta[..., 1]**2)
+
+    def compute_perimeter(self) -> np.ndarray:
+        lengths = self.compute_edge_lengths()
+        if self.vertex_count == 4:
+            return 2 * (lengths[:, 0] + lengths[:, 1])
+        return lengths[:, 0] + lengths[:, 1] + lengths[:, 2]
+
+    def compute_inner_angles(self) -> np.ndarray:
+        if self.vertex_count == 4:
+            return np.full((len(self), 4), 90.0)
+        first, second, third = self.coords[:, 0], self.coords[:, 1], self.coords[:, 2]
+        # Same atan2 formulation and vertex order as Triangle.compute_inner_angles
+        return np.stack([_angle_between(first - third, second - third),
+                         _angle_between(second - first, third - first),
+                         _angle_between(first - second, third - second)], axis=1)
+
+    def compute_area(self) -> np.ndarray:
+        if self.vertex_count == 4:
+            lengths = self.compute_edge_lengths()
+            return lengths[:, 0] * lengths[:, 1]
+        first, second, third = self.coords[:, 0], self.coords[:, 1], self.coords[:, 2]
+        # Shoelace formula: half the absolute cross product of two sides
+        return np.abs(_cross(second - first, third - first)) / 2
+
+
+def classify_triangles(coords, tolerance: float = TRIANGLE_TOLERANCE, chunk_size: int = 1 << 20) -> np.ndarray:
+    """Vectorized exercise_2.classify_triangle over an (N, 3, 2) array, same labels bit for bit
+
+    Works through chunk_size triangles at a time so the temporaries stay bounded.
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    labels = np.empty(coords.shape[0], dtype=np.int8)
+    for start in range(0, coords.shape[0], chunk_size):
+        block = coords[start:start + chunk_size]
+        x_first, y_first = block[:, 0, 0], block[:, 0, 1]
+        x_second, y_second = block[:, 1, 0], block[:, 1, 1]
+        x_third, y_third = block[:, 2, 0], block[:, 2, 1]
+        side_x, side_y = x_second - x_first, y_second - y_first
+        next_x, next_y = x_third - x_second, y_third - y_second
+        last_x, last_y = x_first - x_third, y_first - y_third
+        square_a = side_x * side_x + side_y * side_y
+        square_b = next_x * next_x + next_y * next_y
+        square_c = last_x * last_x + last_y * last_y
+        longest = np.maximum(np.maximum(square_a, square_b), square_c)
+        shortest = np.minimum(np.minimum(square_a, square_b), square_c)
+        middle = np.maximum(np.minimum(square_a, square_b), np.minimum(np.maximum(square_a, square_b), square_c))
+        slack = tolerance * longest
+        # Assigned from the least to the most specific label so the later ones win
+        label = np.where((middle - shortest <= slack) | (longest - middle <= slack), 3, 4)
+        label[np.abs(shortest + middle - longest) <= slack] = 2
+        label[longest - shortest <= slack] = 1
+        label[np.abs(side_x * (y_third - y_first) - side_y * (x_third - x_first)) <= slack] = 0
+        labels[start:start + block.shape[0]] = label
+    return labels
+
+
+def _cross(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    return first[:, 0] * second[:, 1] - first[:, 1] * second[:, 0]
+
+
+def _angle_between(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """Angle in degrees between two arrays of (x, y) vectors"""
+    dot = first[:, 0] * second[:, 0] + first[:, 1] * second[:, 1]
+    return np.degrees(np.arctan2(np.abs(_cross(first, second)), dot))
+
+
+# Testing and demonstration
+if __name__ == "__main__":
+    from time import perf_counter
+
+    from exercise_2 import classify_triangle
+
+    rng = np.random.default_rng(7)
+    shape_count = 200_000
+
+    origins = rng.uniform(-100, 100, size=(shape_count, 1, 2))
+    sizes = rng.uniform(1, 10, size=(shape_count, 1, 2))
+    unit_square = np.array([[0.0, 1.0], [1.0, 1.0], [1.0, 0.0], [0.0, 0.0]])
+    rectangles = ShapeBatch(origins + sizes * unit_square)
+    triangles = ShapeBatch(rng.uniform(-100, 100, size=(shape_count, 3, 2)))
+
+    for name, batch in (("Rectangle", rectangles), ("Triangle", triangles)):
+        print(f"=== {name} batch ({shape_count} shapes) ===")
+        shapes = batch.to_shapes()
+        start = perf_counter()
+        expected_area = [shape.compute_area() for shape in shapes]
+        expected_perimeter = [shape.compute_perimeter() for shape in shapes]
+        expected_angles = [shape.compute_inner_angles() for shape in shapes]
+        loop_time = perf_counter() - start
+
+        start = perf_counter()
+        area = batch.compute_area()
+        perimeter = batch.compute_perimeter()
+        angles = batch.compute_inner_angles()
+        batch_time = perf_counter() - start
+
+        print("Area matches:", np.allclose(area, expected_area))
+        print("Perimeter matches:", np.allclose(perimeter, expected_perimeter))
+        print("Inner angles match:", np.allclose(angles, expected_angles))
+        print("Round trip matches:", np.array_equal(ShapeBatch.from_shapes(shapes).coords, batch.coords))
+        print(f"Per-object loop: {loop_time:.3f}s, batch: {batch_time:.3f}s, speedup: {loop_time / batch_time:.1f}x")
+        print()
+
+    print("=== Triangle classification ===")
+    # Lattice triangles hit right and isosceles cases, the random batch is all scalene
+    lattice = ShapeBatch(rng.integers(-5, 6, size=(shape_count, 3, 2)))
+    start = perf_counter()
+    expected_labels = [TRIANGLE_CLASSES.index(classify_triangle([Point(*vertex) for vertex in vertices]))
+                       for vertices in lattice.coords.tolist()]
+    loop_time = perf_counter() - start
+    start = perf_counter()
+    labels = lattice.classify_triangles()
+    batch_time = perf_counter() - start
+    print("Labels match classify_triangle:", np.array_equal(labels, expected_labels))
+    print("Counts:", {getattr(cls, "__name__", "collinear"): int(count)
+                      for cls, count in zip(TRIANGLE_CLASSES, np.bincount(labels, minlength=len(TRIANGLE_CLASSES)))})
+    print(f"Per-object loop: {loop_time:.3f}s, batch: {batch_time:.3f}s, speedup: {loop_time / batch_time:.1f}x")
+    many = rng.uniform(-100, 100, size=(10_000_000, 3, 2))
+    start = perf_counter()
+    classify_triangles(many)
+    print(f"10,000,000 triangles labelled in {perf_counter() - start:.2f}s")
@@ -0,0 +1,167 @@
+"""Compact binary file format for shape collections, loaded through a memory map
+
+Layout, little endian, every section starts on an 8 byte boundary:
+
+    header   magic b"RSHP", version uint16, reserved uint16, shape count uint64, vertex count uint64
+    tags     uint8 per shape, see SHAPE_TAGS
+    offsets  uint64 per shape + 1, index of each shape's first vertex
+    coords   float64 (x, y) per vertex
+"""
+import numpy as np
+
+from exercise_2 import Point, Rectangle, Square, Triangle, Equilateral, Isosceles, Scalene, TriRectangle, Polygon
+
+MAGIC = b"RSHP"
+VERSION = 1
+HEADER = np.dtype([("magic", "S4"), ("version", "<u2"), ("reserved", "<u2"),
+                   ("shape_count", "<u8"), ("vertex_count", "<u8")])
+
+SHAPE_TAGS = {Rectangle: 1, Square: 2, Triangle: 3, Equilateral: 4, Isosceles: 5, Scalene: 6, TriRectangle: 7,
+              Polygon: 8}
+SHAPE_CLASSES = {tag: cls for cls, tag in SHAPE_TAGS.items()}
+
+
+def _padded(size: int) -> int:
+    return (size + 7) // 8 * 8
+
+
+def _layout(shape_count: int, vertex_count: int) -> tuple:
+    """Byte offsets of the tags, offsets and coords sections and the total file size"""
+    tags_start = _padded(HEADER.itemsize)
+    offsets_start = tags_start + _padded(shape_count)
+    coords_start = offsets_start + 8 * (shape_count + 1)
+    return tags_start, offsets_start, coords_start, coords_start + 16 * vertex_count
+
+
+def write_arrays(path, tags, offsets, coords):
+    """Write pre-packed arrays: tags (N,), offsets (N + 1,) and coords (V, 2)"""
+    tags = np.ascontiguousarray(tags, dtype="<u1")
+    offsets = np.ascontiguousarray(offsets, dtype="<u8")
+    coords = np.ascontiguousarray(coords, dtype="<f8").reshape(-1, 2)
+    if offsets.shape != (tags.shape[0] + 1,) or offsets[0] != 0 or offsets[-1] != coords.shape[0]:
+        raise ValueError("offsets must start at 0, end at the vertex count and have one entry per shape + 1")
+    tags_start, offsets_start, coords_start, _ = _layout(tags.shape[0], coords.shape[0])
+    header = np.zeros(1, dtype=HEADER)
+    header[0] = (MAGIC, VERSION, 0, tags.shape[0], coords.shape[0])
+    with open(path, "wb") as output:
+        output.write(header.tobytes())
+        output.write(bytes(tags_start - HEADER.itemsize))
+        output.write(tags.tobytes())
+        output.write(bytes(offsets_start - tags_start - tags.shape[0]))
+        output.write(offsets.tobytes())
+        output.write(coords.tobytes())
+
+
+def write_shapes(path, shapes: list):
+    """Write Rectangle/Square/Triangle/Polygon/... instances, each tagged with its exact class"""
+    tags = np.array([SHAPE_TAGS[type(shape)] for shape in shapes], dtype="<u1")
+    vertex_lists = [shape.get_vertices() for shape in shapes]
+    offsets = np.zeros(len(shapes) + 1, dtype="<u8")
+    np.cumsum([len(vertices) for vertices in vertex_lists], out=offsets[1:])
+    coords = np.array([coord for vertices in vertex_lists for coord in vertices], dtype="<f8").reshape(-1, 2)
+    write_arrays(path, tags, offsets, coords)
+
+
+class ShapeFile:
+    """Memory-mapped shape collection, shapes are only built when they are accessed
+
+    tags, offsets and coords are read-only views straight into the mapped file.
+    """
+
+    def __init__(self, path):
+        self._map = np.memmap(path, dtype=np.uint8, mode="r")
+        if self._map.shape[0] < HEADER.itemsize:
+            raise ValueError(f"{path} is too small to be a shape file")
+        header = self._map[:HEADER.itemsize].view(HEADER)[0]
+        if header["magic"] != MAGIC:
+            raise ValueError(f"{path} is not a shape file")
+        if header["version"] != VERSION:
+            raise ValueError(f"Unsupported shape file version {header['version']}")
+        shape_count, vertex_count = int(header["shape_count"]), int(header["vertex_count"])
+        tags_start, offsets_start, coords_start, size = _layout(shape_count, vertex_count)
+        if self._map.shape[0] != size:
+            raise ValueError(f"{path} is truncated or corrupt")
+        self.tags = self._map[tags_start:tags_start + shape_count]
+        self.offsets = self._map[offsets_start:coords_start].view("<u8")
+        self.coords = self._map[coords_start:size].view("<f8").reshape(vertex_count, 2)
+
+    def __len__(self):
+        return self.tags.shape[0]
+
+    def vertices(self, index: int) -> np.ndarray:
+        """(k, 2) view of one shape's vertices, no copy"""
+        return self.coords[self.offsets[index]:self.offsets[index + 1]]
+
+    def shape_class(self, index: int):
+        return SHAPE_CLASSES[int(self.tags[index])]
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("shape index out of range")
+        shape = self.shape_class(index)()
+        shape.set_vertices([Point(x_coord, y_coord) for x_coord, y_coord in self.vertices(index).tolist()])
+        return shape
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def vertex_block(self, vertex_count: int) -> np.ndarray:
+        """(N, k, 2) view of every vertex when all shapes have k vertices, e.g. for ShapeBatch"""
+        if len(self) and not np.all(np.diff(self.offsets) == vertex_count):
+            raise ValueError(f"Not every shape has {vertex_count} vertices")
+        return self.coords.reshape(len(self), vertex_count, 2)
+
+    def close(self):
+        """Drop this object's views, the mapping closes once no array taken from it is alive"""
+        self.tags = self.offsets = self.coords = None
+        self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# Testing and demonstration
+if __name__ == "__main__":
+    import os
+    import sys
+    import tempfile
+    from time import perf_counter
+
+    from shape_batch import ShapeBatch
+
+    shape_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000_000
+    with tempfile.TemporaryDirectory() as folder:
+        small_path = os.path.join(folder, "small.rshp")
+        square = Square()
+        square.set_vertices([Point(2, 5), Point(5, 5), Point(5, 2), Point(2, 2)])
+        scalene = Scalene()
+        scalene.set_vertices([Point(0, 0), Point(6, 0), Point(2, 4)])
+        write_shapes(small_path, [square, scalene])
+        with ShapeFile(small_path) as loaded:
+            print("Loaded:", [(type(shape).__name__, shape.get_vertices()) for shape in loaded])
+
+        big_path = os.path.join(folder, "triangles.rshp")
+        rng = np.random.default_rng(8)
+        coords = rng.uniform(-100, 100, size=(shape_count * 3, 2))
+        offsets = np.arange(0, 3 * shape_count + 1, 3, dtype=np.uint64)
+        write_arrays(big_path, np.full(shape_count, SHAPE_TAGS[Triangle]), offsets, coords)
+        del coords
+
+        start = perf_counter()
+        shape_file = ShapeFile(big_path)
+        open_time = perf_counter() - start
+        print(f"Opened {len(shape_file):,} triangles ({os.path.getsize(big_path) / 2**30:.2f} GiB) "
+              f"in {open_time * 1e3:.2f} ms")
+        start = perf_counter()
+        middle = shape_file[shape_count // 2]
+        print(f"Materialized shape {shape_count // 2:,} in {(perf_counter() - start) * 1e6:.0f} us, "
+              f"area {middle.compute_area():.3f}")
+        batch = ShapeBatch(shape_file.vertex_block(3)[:1000])
+        print("Zero-copy batch shares the mapped file:", np.shares_memory(batch.coords, shape_file.coords))
+        shape_file.close()
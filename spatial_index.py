@@ -0,0 +1,336 @@
+import heapq
+from math import floor, hypot, inf
+
+
+def _vertex_coords(item) -> list:
+    """Return the vertices of a Shape or of a list of Points / (x, y) pairs as (x, y) tuples"""
+    if hasattr(item, "get_vertices"):
+        return item.get_vertices()
+    return [(vertex.x, vertex.y) if hasattr(vertex, "x") else tuple(vertex) for vertex in item]
+
+
+def bounding_box(coords: list) -> tuple:
+    xs = [x_coord for x_coord, _ in coords]
+    ys = [y_coord for _, y_coord in coords]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def contains_point(coords: list, x_coord: float, y_coord: float) -> bool:
+    """Even-odd test, points on the border count as inside"""
+    inside = False
+    previous_x, previous_y = coords[-1]
+    for current_x, current_y in coords:
+        if _on_segment(previous_x, previous_y, current_x, current_y, x_coord, y_coord):
+            return True
+        if (current_y > y_coord) != (previous_y > y_coord):
+            crossing_x = current_x + (y_coord - current_y) * (previous_x - current_x) / (previous_y - current_y)
+            if x_coord < crossing_x:
+                inside = not inside
+        previous_x, previous_y = current_x, current_y
+    return inside
+
+
+def _on_segment(x0, y0, x1, y1, x_coord, y_coord) -> bool:
+    cross = (x1 - x0) * (y_coord - y0) - (y1 - y0) * (x_coord - x0)
+    if cross != 0:
+        return False
+    return min(x0, x1) <= x_coord <= max(x0, x1) and min(y0, y1) <= y_coord <= max(y0, y1)
+
+
+def _segment_distance(x0, y0, x1, y1, x_coord, y_coord) -> float:
+    dx = x1 - x0
+    dy = y1 - y0
+    length_squared = dx * dx + dy * dy
+    if length_squared == 0:
+        return hypot(x_coord - x0, y_coord - y0)
+    t = max(0.0, min(1.0, ((x_coord - x0) * dx + (y_coord - y0) * dy) / length_squared))
+    return hypot(x_coord - (x0 + t * dx), y_coord - (y0 + t * dy))
+
+
+def shape_distance(coords: list, x_coord: float, y_coord: float) -> float:
+    """Distance from a point to a shape outline, 0 when the point is inside"""
+    if contains_point(coords, x_coord, y_coord):
+        return 0.0
+    distance = inf
+    previous_x, previous_y = coords[-1]
+    for current_x, current_y in coords:
+        distance = min(distance, _segment_distance(previous_x, previous_y, current_x, current_y, x_coord, y_coord))
+        previous_x, previous_y = current_x, current_y
+    return distance
+
+
+class SpatialIndex:
+    """Uniform grid over the bounding boxes of Rectangle/Triangle instances or raw vertex lists
+
+    Shapes are re-indexed automatically when set_vertices or set_vertex changes them.
+    cell_size should be close to the typical shape size.
+    """
+
+    def __init__(self, cell_size: float = 1.0):
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self._cells = {}
+        self._items = {}
+        self._coords = {}
+        self._boxes = {}
+        self._handles = {}
+        self._next_handle = 0
+        # Cell range holding every indexed shape, recomputed lazily after a removal touches its edge
+        self._cell_bounds = None
+        self._bounds_stale = False
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item):
+        return id(item) in self._handles
+
+    def _cell_range(self, box: tuple):
+        min_x, min_y, max_x, max_y = box
+        size = self.cell_size
+        return floor(min_x / size), floor(min_y / size), floor(max_x / size), floor(max_y / size)
+
+    def _add(self, handle: int, coords: list):
+        box = bounding_box(coords)
+        self._coords[handle] = coords
+        self._boxes[handle] = box
+        first_i, first_j, last_i, last_j = self._cell_range(box)
+        for i in range(first_i, last_i + 1):
+            for j in range(first_j, last_j + 1):
+                self._cells.setdefault((i, j), set()).add(handle)
+        if self._bounds_stale:
+            return
+        if self._cell_bounds is None:
+            self._cell_bounds = [first_i, first_j, last_i, last_j]
+        else:
+            bounds = self._cell_bounds
+            bounds[0] = min(bounds[0], first_i)
+            bounds[1] = min(bounds[1], first_j)
+            bounds[2] = max(bounds[2], last_i)
+            bounds[3] = max(bounds[3], last_j)
+
+    def _discard(self, handle: int):
+        first_i, first_j, last_i, last_j = self._cell_range(self._boxes.pop(handle))
+        for i in range(first_i, last_i + 1):
+            for j in range(first_j, last_j + 1):
+                cell = self._cells[(i, j)]
+                cell.discard(handle)
+                if not cell:
+                    del self._cells[(i, j)]
+        del self._coords[handle]
+        bounds = self._cell_bounds
+        if bounds is not None and (first_i == bounds[0] or first_j == bounds[1] or last_i == bounds[2]
+                                   or last_j == bounds[3]):
+            self._bounds_stale = True
+
+    def _occupied_bounds(self) -> list:
+        if self._bounds_stale:
+            cells = self._cells
+            self._cell_bounds = [min(i for i, _ in cells), min(j for _, j in cells),
+                                 max(i for i, _ in cells), max(j for _, j in cells)] if cells else None
+            self._bounds_stale = False
+        return self._cell_bounds
+
+    def insert(self, item) -> int:
+        """Index a shape or vertex list and return its handle"""
+        if id(item) in self._handles:
+            raise ValueError("Item is already indexed, use update() after changing it")
+        handle = self._next_handle
+        self._next_handle += 1
+        self._handles[id(item)] = handle
+        self._items[handle] = item
+        self._add(handle, _vertex_coords(item))
+        if hasattr(item, "add_vertex_listener"):
+            item.add_vertex_listener(self.update)
+        return handle
+
+    def remove(self, item):
+        handle = self._handles.pop(id(item))
+        del self._items[handle]
+        self._discard(handle)
+        if hasattr(item, "remove_vertex_listener"):
+            item.remove_vertex_listener(self.update)
+
+    def update(self, item):
+        """Re-index an item whose vertices changed"""
+        handle = self._handles[id(item)]
+        self._discard(handle)
+        self._add(handle, _vertex_coords(item))
+
+    def _candidates(self, box: tuple) -> set:
+        first_i, first_j, last_i, last_j = self._cell_range(box)
+        cells = self._cells
+        found = set()
+        if (last_i - first_i + 1) * (last_j - first_j + 1) > len(cells):
+            for (i, j), handles in cells.items():
+                if first_i <= i <= last_i and first_j <= j <= last_j:
+                    found.update(handles)
+            return found
+        for i in range(first_i, last_i + 1):
+            for j in range(first_j, last_j + 1):
+                handles = cells.get((i, j))
+                if handles:
+                    found.update(handles)
+        return found
+
+    def query_point(self, x_coord: float, y_coord: float) -> list:
+        """Return every indexed item that contains the point"""
+        handles = self._cells.get(self._cell_range((x_coord, y_coord, x_coord, y_coord))[:2], ())
+        found = []
+        for handle in sorted(handles):
+            min_x, min_y, max_x, max_y = self._boxes[handle]
+            if min_x <= x_coord <= max_x and min_y <= y_coord <= max_y \
+                    and contains_point(self._coords[handle], x_coord, y_coord):
+                found.append(self._items[handle])
+        return found
+
+    def query_box(self, min_x: float, min_y: float, max_x: float, max_y: float) -> list:
+        """Return every indexed item whose bounding box overlaps the given box"""
+        found = []
+        for handle in sorted(self._candidates((min_x, min_y, max_x, max_y))):
+            box = self._boxes[handle]
+            if box[0] <= max_x and min_x <= box[2] and box[1] <= max_y and min_y <= box[3]:
+                found.append(self._items[handle])
+        return found
+
+    def nearest(self, x_coord: float, y_coord: float, k: int = 1) -> list:
+        """Return up to k items closest to the point as (distance, item) pairs, nearest first"""
+        if k < 1 or not self._items:
+            return []
+        size = self.cell_size
+        cells = self._cells
+        center_i, center_j = floor(x_coord / size), floor(y_coord / size)
+        min_i, min_j, max_i, max_j = self._occupied_bounds()
+        max_ring = max(abs(center_i - min_i), abs(center_i - max_i), abs(center_j - min_j), abs(center_j - max_j))
+        best = []
+        seen = set()
+
+        def visit(handles):
+            for handle in handles:
+                if handle in seen:
+                    continue
+                seen.add(handle)
+                distance = shape_distance(self._coords[handle], x_coord, y_coord)
+                if len(best) < k:
+                    heapq.heappush(best, (-distance, -handle))
+                elif distance < -best[0][0]:
+                    heapq.heapreplace(best, (-distance, -handle))
+
+        # Rings closer than the occupied bounds are empty, start at the first one reaching them
+        ring = max(min_i - center_i, center_i - max_i, min_j - center_j, center_j - max_j, 0)
+        while ring <= max_ring:
+            if 8 * ring > len(cells):
+                # The ring has more cells than are occupied, finish best-first over the occupied ones
+                ordered = sorted((self._cell_distance(i, j, x_coord, y_coord), i, j) for i, j in cells)
+                for cell_distance, i, j in ordered:
+                    if len(best) == k and cell_distance > -best[0][0]:
+                        break
+                    visit(cells[(i, j)])
+                break
+            for cell in self._ring_cells(center_i, center_j, ring):
+                visit(cells.get(cell, ()))
+            # Anything outside the rings searched so far is at least ring * cell_size away
+            if len(best) == k and -best[0][0] <= ring * size:
+                break
+            ring += 1
+        return [(-distance, self._items[-handle]) for distance, handle in sorted(best, reverse=True)]
+
+    def _cell_distance(self, i: int, j: int, x_coord: float, y_coord: float) -> float:
+        """Distance from the point to cell (i, j), a lower bound for every shape indexed in it"""
+        size = self.cell_size
+        delta_x = max(i * size - x_coord, 0.0, x_coord - (i + 1) * size)
+        delta_y = max(j * size - y_coord, 0.0, y_coord - (j + 1) * size)
+        return hypot(delta_x, delta_y)
+
+    @staticmethod
+    def _ring_cells(center_i: int, center_j: int, ring: int):
+        if ring == 0:
+            yield (center_i, center_j)
+            return
+        for i in range(center_i - ring, center_i + ring + 1):
+            yield (i, center_j - ring)
+            yield (i, center_j + ring)
+        for j in range(center_j - ring + 1, center_j + ring):
+            yield (center_i - ring, j)
+            yield (center_i + ring, j)
+
+
+# Benchmark against a brute-force scan
+if __name__ == "__main__":
+    import random
+    from time import perf_counter
+
+    from exercise_2 import Point, Rectangle, Triangle
+
+    random.seed(5)
+    shapes = []
+    for _ in range(20_000):
+        x_coord, y_coord = random.uniform(0, 1000), random.uniform(0, 1000)
+        width, height = random.uniform(1, 8), random.uniform(1, 8)
+        rectangle = Rectangle()
+        rectangle.set_vertices([Point(x_coord, y_coord + height), Point(x_coord + width, y_coord + height),
+                                Point(x_coord + width, y_coord), Point(x_coord, y_coord)])
+        triangle = Triangle()
+        triangle.set_vertices([Point(x_coord + random.uniform(-5, 5), y_coord + random.uniform(-5, 5))
+                               for _ in range(3)])
+        shapes.extend([rectangle, triangle])
+
+    start = perf_counter()
+    index = SpatialIndex(cell_size=8.0)
+    for shape in shapes:
+        index.insert(shape)
+    print(f"Indexed {len(index)} shapes in {perf_counter() - start:.2f}s")
+
+    all_coords = [shape.get_vertices() for shape in shapes]
+    probes = [(random.uniform(0, 1000), random.uniform(0, 1000)) for _ in range(500)]
+
+    def brute_point(x_coord, y_coord):
+        return [shape for shape, coords in zip(shapes, all_coords) if contains_point(coords, x_coord, y_coord)]
+
+    def brute_box(min_x, min_y, max_x, max_y):
+        found = []
+        for shape, coords in zip(shapes, all_coords):
+            box = bounding_box(coords)
+            if box[0] <= max_x and min_x <= box[2] and box[1] <= max_y and min_y <= box[3]:
+                found.append(shape)
+        return found
+
+    def brute_nearest(x_coord, y_coord, k):
+        distances = sorted(shape_distance(coords, x_coord, y_coord) for coords in all_coords)
+        return distances[:k]
+
+    queries = [
+        ("point", lambda x, y: index.query_point(x, y), brute_point, lambda found: {id(item) for item in found}),
+        ("box", lambda x, y: index.query_box(x, y, x + 20, y + 20), lambda x, y: brute_box(x, y, x + 20, y + 20),
+         lambda found: {id(item) for item in found}),
+        ("5-nearest", lambda x, y: [distance for distance, _ in index.nearest(x, y, 5)],
+         lambda x, y: brute_nearest(x, y, 5), lambda found: found),
+    ]
+    for name, indexed, brute, key in queries:
+        start = perf_counter()
+        indexed_results = [indexed(x, y) for x, y in probes]
+        indexed_time = perf_counter() - start
+        start = perf_counter()
+        brute_results = [brute(x, y) for x, y in probes[:50]]
+        brute_time = (perf_counter() - start) * len(probes) / 50
+        matches = all(key(a) == key(b) for a, b in zip(indexed_results, brute_results))
+        print(f"{name} queries: index {indexed_time * 1e6 / len(probes):.0f} us/query, "
+              f"brute force {brute_time * 1e6 / len(probes):.0f} us/query, results match: {matches}")
+
+    moved = shapes[0]
+    moved.set_vertices([Point(2000, 2010), Point(2010, 2010), Point(2010, 2000), Point(2000, 2000)])
+    print("Moved shape found at its new position:", moved in index.query_point(2005, 2005))
+
+    # Queries far from the data and sparse indexes must not walk every empty ring
+    sparse = SpatialIndex(cell_size=1.0)
+    for shape in shapes[1:101]:
+        sparse.insert(shape)
+    sparse.insert(moved)
+    sparse.remove(moved)
+    start = perf_counter()
+    far = sparse.nearest(50, 3000, 3)
+    far_time = perf_counter() - start
+    brute = sorted(shape_distance(shape.get_vertices(), 50, 3000) for shape in shapes[1:101])[:3]
+    print(f"Far query on a sparse index after a removal: {far_time * 1e3:.2f} ms, "
+          f"results match: {[distance for distance, _ in far] == brute}")
@@ -0,0 +1,59 @@
+"""Cold import budget check, each statement runs in a fresh interpreter under -X importtime
+
+    python startup_benchmark.py              # best of 5 runs, exit status 1 over budget
+    python startup_benchmark.py -r 10 -v     # more runs, list the slowest modules
+"""
+import argparse
+import subprocess
+import sys
+
+# Statement -> cumulative import time budget in microseconds
+BUDGETS_US = {
+    "import reto4": 2_000,
+    "import reto4; reto4.geometry": 10_000,
+    "import reto4; reto4.restaurant": 10_000
+}
+
+
+def import_times(statement: str) -> dict:
+    """Cumulative microseconds of each top-level import made by statement, interpreter start-up excluded"""
+    baseline = _top_level_imports("pass")
+    return {name: cumulative for name, cumulative in _top_level_imports(statement).items() if name not in baseline}
+
+
+def _top_level_imports(statement: str) -> dict:
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented under the module that triggered them
+        if cumulative.strip().isdigit() and not name[1:].startswith(" "):
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="fresh interpreters per statement")
+    parser.add_argument("-v", "--verbose", action="store_true", help="show the slowest imports of each statement")
+    args = parser.parse_args(argv)
+
+    over_budget = 0
+    for statement, budget in BUDGETS_US.items():
+        runs = [import_times(statement) for _ in range(args.repeat)]
+        best = min(runs, key=lambda times: sum(times.values()))
+        total = sum(best.values())
+        status = "ok" if total <= budget else "OVER BUDGET"
+        over_budget += total > budget
+        print(f"{statement:<44} {total / 1000:7.2f} ms  (budget {budget / 1000:.1f} ms)  {status}")
+        if args.verbose:
+            for name, cumulative in sorted(best.items(), key=lambda entry: -entry[1])[:5]:
+                print(f"    {name:<30} {cumulative / 1000:7.2f} ms")
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+from math import cos, radians, sin, sqrt
+
+import numpy as np
+
+from primitives import Point
+
+# Rows transformed per pass over packed coordinates, bounds the scratch buffer
+CHUNK_ROWS = 1 << 16
+
+
+class Affine:
+    """2D affine map x' = a*x + b*y + c, y' = d*x + e*y + f
+
+    Compose with @: (second @ first) applies first, then second.
+    Treat instances as values: determinant and length_scale are worked out once at construction.
+    """
+
+    __slots__ = ("a", "b", "c", "d", "e", "f", "determinant", "length_scale")
+
+    def __init__(self, a: float = 1.0, b: float = 0.0, c: float = 0.0, d: float = 0.0, e: float = 1.0,
+                 f: float = 0.0):
+        self.a, self.b, self.c, self.d, self.e, self.f = a, b, c, d, e, f
+        # Signed area factor, negative when the map mirrors
+        self.determinant = a * e - b * d
+        # Factor applied to every length when the map is a similarity, None otherwise
+        self.length_scale = self._similarity_scale()
+
+    @classmethod
+    def identity(cls) -> "Affine":
+        return cls()
+
+    @classmethod
+    def translation(cls, x_offset: float, y_offset: float) -> "Affine":
+        return cls(c=x_offset, f=y_offset)
+
+    @classmethod
+    def rotation(cls, angle_degrees: float, center: Point = None) -> "Affine":
+        """Counter-clockwise rotation about center, the origin by default"""
+        cosine, sine = cos(radians(angle_degrees)), sin(radians(angle_degrees))
+        return cls._about(cls(cosine, -sine, 0.0, sine, cosine, 0.0), center)
+
+    @classmethod
+    def scaling(cls, x_factor: float, y_factor: float = None, center: Point = None) -> "Affine":
+        y_factor = x_factor if y_factor is None else y_factor
+        return cls._about(cls(x_factor, 0.0, 0.0, 0.0, y_factor, 0.0), center)
+
+    @classmethod
+    def shear(cls, x_factor: float = 0.0, y_factor: float = 0.0) -> "Affine":
+        return cls(1.0, x_factor, 0.0, y_factor, 1.0, 0.0)
+
+    @classmethod
+    def _about(cls, linear: "Affine", center: Point) -> "Affine":
+        if center is None:
+            return linear
+        return cls.translation(center.x, center.y) @ linear @ cls.translation(-center.x, -center.y)
+
+    def __matmul__(self, other: "Affine") -> "Affine":
+        return Affine(self.a * other.a + self.b * other.d, self.a * other.b + self.b * other.e,
+                      self.a * other.c + self.b * other.f + self.c,
+                      self.d * other.a + self.e * other.d, self.d * other.b + self.e * other.e,
+                      self.d * other.c + self.e * other.f + self.f)
+
+    def __eq__(self, other):
+        if not isinstance(other, Affine):
+            return NotImplemented
+        return (self.a, self.b, self.c, self.d, self.e, self.f) == (other.a, other.b, other.c, other.d, other.e,
+                                                                    other.f)
+
+    def __repr__(self):
+        return f"Affine({self.a!r}, {self.b!r}, {self.c!r}, {self.d!r}, {self.e!r}, {self.f!r})"
+
+    def _similarity_scale(self) -> float:
+        """Exactly 1.0 for rotations, reflections and translations so cached perimeters stay bit-identical"""
+        tolerance = 1e-12 * max(1.0, abs(self.a), abs(self.b), abs(self.d), abs(self.e))
+        rotates = abs(self.a - self.e) <= tolerance and abs(self.b + self.d) <= tolerance
+        mirrors = abs(self.a + self.e) <= tolerance and abs(self.b - self.d) <= tolerance
+        if not (rotates or mirrors):
+            return None
+        scale = sqrt(abs(self.determinant))
+        return 1.0 if abs(scale - 1.0) <= tolerance else scale
+
+    def inverse(self) -> "Affine":
+        determinant = self.determinant
+        if determinant == 0:
+            raise ValueError("Singular transform has no inverse")
+        a, b, d, e = self.e / determinant, -self.b / determinant, -self.d / determinant, self.a / determinant
+        return Affine(a, b, -(a * self.c + b * self.f), d, e, -(d * self.c + e * self.f))
+
+    def apply(self, x_coord: float, y_coord: float) -> tuple:
+        return (self.a * x_coord + self.b * y_coord + self.c, self.d * x_coord + self.e * y_coord + self.f)
+
+    def apply_point(self, point: Point) -> Point:
+        return Point(self.a * point.x + self.b * point.y + self.c, self.d * point.x + self.e * point.y + self.f)
+
+    def apply_points(self, points: list) -> list:
+        a, b, c, d, e, f = self.a, self.b, self.c, self.d, self.e, self.f
+        return [Point(a * point.x + b * point.y + c, d * point.x + e * point.y + f) for point in points]
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """3x3 homogeneous matrix"""
+        return np.array([[self.a, self.b, self.c], [self.d, self.e, self.f], [0.0, 0.0, 1.0]])
+
+
+def transform_coords(coords: np.ndarray, transform: Affine) -> np.ndarray:
+    """Apply transform in place to a C-contiguous float64 array of shape (..., 2) and return it"""
+    if coords.dtype != np.float64 or not coords.flags.c_contiguous or not coords.flags.writeable \
+            or coords.shape[-1] != 2:
+        raise ValueError("transform_coords needs a writeable C-contiguous float64 array of shape (..., 2)")
+    flat = coords.reshape(-1, 2)
+    linear = np.array([[transform.a, transform.d], [transform.b, transform.e]])
+    offset = np.array([transform.c, transform.f])
+    scratch = np.empty((min(CHUNK_ROWS, flat.shape[0]), 2))
+    for start in range(0, flat.shape[0], CHUNK_ROWS):
+        block = flat[start:start + CHUNK_ROWS]
+        result = scratch[:block.shape[0]]
+        np.matmul(block, linear, out=result)
+        np.add(result, offset, out=block)
+    return coords
+
+
+def transform_metrics(metrics: dict, transform: Affine, vertex_count: int = None) -> dict:
+    """Rescale precomputed batch metrics ("area", "perimeter", "inner_angles") that survive transform
+
+    Triangle areas (vertex_count 3) survive any affine map, rectangle areas come from side
+    lengths and are only kept for similarities, as when the vertex count is unknown.
+    """
+    kept = {}
+    length_scale = transform.length_scale
+    if "area" in metrics and (vertex_count == 3 or length_scale is not None):
+        kept["area"] = metrics["area"] * abs(transform.determinant)
+    if length_scale is not None:
+        if "perimeter" in metrics:
+            kept["perimeter"] = metrics["perimeter"] * length_scale
+        if "inner_angles" in metrics:
+            kept["inner_angles"] = metrics["inner_angles"]
+    return kept
+
+
+# Testing and benchmark
+if __name__ == "__main__":
+    import sys
+    from time import perf_counter
+
+    from exercise_2 import Rectangle
+    from shape_batch import ShapeBatch
+
+    rectangle = Rectangle()
+    rectangle.set_vertices([Point(1, 3), Point(5, 3), Point(5, 1), Point(1, 1)])
+    print("Area:", rectangle.compute_area(), "Perimeter:", rectangle.compute_perimeter())
+    spin = Affine.rotation(30, center=Point(3, 2)) @ Affine.translation(10, -4)
+    rectangle.apply_transform(spin)
+    print("Rotated vertices:", rectangle.get_vertices())
+    print("Cached after rotation:", rectangle.compute_area(), rectangle.compute_perimeter(),
+          "cache", rectangle.get_cache_stats())
+    rectangle.apply_transform(Affine.scaling(2))
+    cached = (rectangle.compute_area(), rectangle.compute_perimeter())
+    rectangle.invalidate_cache()
+    print("Scaled by 2, cached:", cached, "recomputed:", (rectangle.compute_area(), rectangle.compute_perimeter()))
+    print("Round trip through the inverse:", (spin.inverse() @ spin).apply(7.0, -2.0))
+    rectangle.compute_area()
+    rectangle.apply_transform(Affine.shear(1.0))
+    cached = rectangle.compute_area()
+    rectangle.invalidate_cache()
+    print("Sheared rectangle area, cached:", cached, "recomputed:", rectangle.compute_area())
+
+    shape_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    coords = np.random.default_rng(6).uniform(-100, 100, size=(shape_count, 3, 2))
+    batch = ShapeBatch(coords)
+    metrics = {"area": batch.compute_area(), "perimeter": batch.compute_perimeter(),
+               "inner_angles": batch.compute_inner_angles()}
+    composed = Affine.translation(3, 4) @ Affine.rotation(17) @ Affine.scaling(1.5)
+    start = perf_counter()
+    batch.apply_transform(composed)
+    elapsed = perf_counter() - start
+    print(f"{shape_count:,} triangles transformed in place in {elapsed:.3f}s "
+          f"({shape_count / elapsed / 1e6:.1f} M shapes/s)")
+    rescaled = transform_metrics(metrics, composed, batch.vertex_count)
+    print("Rescaled metrics match recomputed:",
+          np.allclose(rescaled["area"], batch.compute_area()),
+          np.allclose(rescaled["perimeter"], batch.compute_perimeter()),
+          np.allclose(rescaled["inner_angles"], batch.compute_inner_angles()))
+
+    single_count = min(shape_count, 200_000)
+    triangles = ShapeBatch(batch.coords[:single_count]).to_shapes()
+    for triangle in triangles:
+        triangle.compute_area()
+        triangle.compute_perimeter()
+    start = perf_counter()
+    for triangle in triangles:
+        triangle.apply_transform(composed)
+        triangle.compute_area()
+        triangle.compute_perimeter()
+    transform_time = perf_counter() - start
+    start = perf_counter()
+    for triangle in triangles:
+        triangle.set_vertices([Point(*composed.apply(x_coord, y_coord)) for x_coord, y_coord in triangle.get_vertices()])
+        triangle.compute_area()
+        triangle.compute_perimeter()
+    rebuild_time = perf_counter() - start
+    print(f"{single_count:,} Triangle objects: apply_transform {transform_time:.3f}s, "
+          f"set_vertices and recompute {rebuild_time:.3f}s")